@@ -10,6 +10,7 @@ import {
 } from '@nestjs/common';
 import { CommentsService } from './comments.service';
 import { CreateCommentDto } from './dto/create-comment.dto';
+import { BulkCreateCommentsDto } from './dto/bulk-create-comments.dto';
 import { UpdateCommentDto } from './dto/update-comment.dto';
 import { DeleteCommentDto } from './dto/delete-comment.dto';
 
@@ -26,6 +27,13 @@ export class CommentsController {
     return this.commentsService.create(postId, createCommentDto);
   }
 
+  // 여러 글의 댓글을 한 번에 작성 (항목별 결과 반환)
+  @Post('comments/bulk')
+  @HttpCode(HttpStatus.OK)
+  bulkCreate(@Body() bulkCreateCommentsDto: BulkCreateCommentsDto) {
+    return this.commentsService.bulkCreate(bulkCreateCommentsDto);
+  }
+
   @Patch('comments/:id')
   update(
     @Param('id') id: string,
@@ -1,10 +1,21 @@
-import { Injectable, ForbiddenException, NotFoundException } from '@nestjs/common';
+import {
+  Injectable,
+  ForbiddenException,
+  NotFoundException,
+  BadRequestException,
+} from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { In, Repository } from 'typeorm';
 import { Comment } from './comment.entity';
+import { Post } from '../posts/post.entity';
 import { CreateCommentDto } from './dto/create-comment.dto';
+import { BulkCreateCommentsDto } from './dto/bulk-create-comments.dto';
 import { UpdateCommentDto } from './dto/update-comment.dto';
 
+const MAX_BULK_COMMENTS = 100;
+const UUID_PATTERN =
+  /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
 @Injectable()
 export class CommentsService {
   constructor(
@@ -37,6 +48,92 @@ export class CommentsService {
     };
   }
 
+  async bulkCreate(bulkCreateCommentsDto: BulkCreateCommentsDto) {
+    this.verifyAdminPassword(bulkCreateCommentsDto.adminPassword);
+
+    const items = bulkCreateCommentsDto.items;
+    if (!Array.isArray(items) || items.length === 0) {
+      throw new BadRequestException('items가 필요합니다');
+    }
+    if (items.length > MAX_BULK_COMMENTS) {
+      throw new BadRequestException(
+        `한 번에 최대 ${MAX_BULK_COMMENTS}개까지 작성할 수 있습니다`,
+      );
+    }
+    // 이 API는 ValidationPipe가 없으므로 항목 형태를 직접 확인 (null 항목이 500이 되지 않도록)
+    const malformed = items.findIndex(
+      (item) =>
+        item === null ||
+        typeof item !== 'object' ||
+        Array.isArray(item) ||
+        (item.isAiGenerated !== undefined &&
+          typeof item.isAiGenerated !== 'boolean'),
+    );
+    if (malformed !== -1) {
+      throw new BadRequestException(
+        `items[${malformed}]의 형식이 올바르지 않습니다`,
+      );
+    }
+
+    // 존재하는 글만 한 번의 조회로 확인
+    const postIds = [
+      ...new Set(
+        items
+          .map((item) => item.postId)
+          .filter(
+            (postId) => typeof postId === 'string' && UUID_PATTERN.test(postId),
+          ),
+      ),
+    ];
+    const existing = postIds.length
+      ? await this.commentsRepository.manager.find(Post, {
+          select: ['id'],
+          where: { id: In(postIds) },
+        })
+      : [];
+    const existingIds = new Set(existing.map((post) => post.id));
+
+    const results: { index: number; id?: string; error?: string }[] = [];
+    const valid: { index: number; comment: Partial<Comment> }[] = [];
+
+    items.forEach((item, index) => {
+      if (!existingIds.has(item.postId)) {
+        results.push({ index, error: '글을 찾을 수 없습니다' });
+      } else if (typeof item.content !== 'string' || !item.content) {
+        results.push({ index, error: '댓글 내용이 필요합니다' });
+      } else {
+        valid.push({
+          index,
+          comment: {
+            postId: item.postId,
+            content: item.content,
+            isAiGenerated: item.isAiGenerated,
+          },
+        });
+      }
+    });
+
+    // 유효한 댓글은 하나의 INSERT로 저장
+    if (valid.length) {
+      const inserted = await this.commentsRepository.insert(
+        valid.map((entry) => entry.comment),
+      );
+      valid.forEach((entry, i) => {
+        results.push({ index: entry.index, id: inserted.identifiers[i].id });
+      });
+    }
+
+    results.sort((a, b) => a.index - b.index);
+    const created = results.filter((result) => result.id).length;
+
+    return {
+      results,
+      created,
+      failed: results.length - created,
+      message: `댓글 ${created}개가 작성되었습니다`,
+    };
+  }
+
   async update(id: string, updateCommentDto: UpdateCommentDto) {
     this.verifyAdminPassword(updateCommentDto.adminPassword);
 
@@ -0,0 +1,10 @@
+export class BulkCommentItemDto {
+  postId: string;
+  content: string;
+  isAiGenerated: boolean;
+}
+
+export class BulkCreateCommentsDto {
+  adminPassword: string;
+  items: BulkCommentItemDto[];
+}
@@ -1,14 +1,30 @@
+import asyncio
 import os
 import logging
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from dotenv import load_dotenv
-from app.routers import chat, analytics
-
-from panopticon_monitoring import MonitoringSDK
+from app.services.startup import startup_state
+
+# import 단계별 소요 시간 (/ready 의 import_ms, `python -X importtime`으로 모듈 단위 확인 가능)
+_import_started = time.perf_counter()
+from app.routers import chat, analytics  # noqa: E402
+from app.services import prometheus_metrics  # noqa: E402
+from app.services.deadline import DeadlineExceeded  # noqa: E402
+from app.services.http_clients import http_clients  # noqa: E402
+from app.services.log_pipeline import log_pipeline, truncate  # noqa: E402
+from app.services.request_metrics import RequestMetricsMiddleware, request_metrics  # noqa: E402
+from app.services.usage_meter import UsageHeadersMiddleware  # noqa: E402
+startup_state.record_import("app", time.perf_counter() - _import_started)
+
+_import_started = time.perf_counter()
+from panopticon_monitoring import MonitoringSDK  # noqa: E402
+startup_state.record_import("monitoring_sdk", time.perf_counter() - _import_started)
 
 # Load environment variables from project root
 
@@ -22,10 +38,67 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 검증 실패 로그에 남길 요청 본문 최대 길이
+LOG_BODY_MAX_CHARS = int(os.getenv("LOG_BODY_MAX_CHARS", "1024"))
+
+# 시작 후 백그라운드 warm-up (끝나야 /ready 200)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+STARTUP_WARMUP_TIMEOUT = float(os.getenv("STARTUP_WARMUP_TIMEOUT", "10"))
+# 1토큰 Bedrock 호출로 연결 + prompt cache까지 데움 (토큰 과금 발생)
+BEDROCK_WARMUP_INVOKE = os.getenv("BEDROCK_WARMUP_INVOKE", "false").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # lifespan을 지정하면 on_event 핸들러가 자동 실행되지 않으므로 직접 호출 (SDK 등록분 포함)
+    await app.router.startup()
+    # 로그 핸들러(SDK 등록분 포함)를 큐 뒤 listener 스레드로 이동
+    log_pipeline.start()
+    # 서비스 생성 (boto3/파일 I/O 등 blocking 초기화는 스레드에서 병렬로)
+    await asyncio.gather(chat.init_services(), analytics.init_services())
+    chat.ai_answer_cache.start()
+    chat.post_queue.start()
+    analytics.analytics_service.event_ingestor.start()
+    # 이전 답변 캐시 스냅샷은 백그라운드에서 복원 (readiness 지연 없음)
+    snapshot = chat.bedrock_service.cache_snapshot
+    if snapshot:
+        snapshot.start()
+    if STARTUP_WARMUP:
+        startup_state.start_warmup(
+            {
+                "bedrock": lambda: chat.bedrock_service.warm_up(invoke=BEDROCK_WARMUP_INVOKE),
+                "api_backend": chat.api_backend_service.warm_up,
+            },
+            timeout=STARTUP_WARMUP_TIMEOUT,
+        )
+    else:
+        startup_state.mark_ready()
+    yield
+    try:
+        # 한 단계가 실패해도 나머지 자원은 모두 정리
+        await startup_state.run_shutdown(
+            {
+                "readiness": startup_state.stop,
+                "answer_cache_snapshot": snapshot.stop if snapshot else lambda: None,
+                "event_ingestor": analytics.analytics_service.event_ingestor.stop,
+                "post_queue": chat.post_queue.stop,
+                "api_backend": chat.api_backend_service.close,
+                "answer_store": chat.ai_answer_cache.stop,
+                "http_clients": http_clients.aclose,
+                "prometheus": prometheus_metrics.mark_process_dead,
+                "shutdown_handlers": app.router.shutdown,
+            }
+        )
+    finally:
+        # 남은 로그를 모두 쓰고 원래 핸들러로 복원
+        log_pipeline.stop()
+
+
 app = FastAPI(
     title="LLM Backend",
     description="AWS Bedrock Claude 3 Sonnet Q&A API with Auto-posting",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Initialize Panopticon Monitoring SDK
@@ -45,15 +118,30 @@ MonitoringSDK.init(
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Log validation errors for debugging"""
-    body = await request.body()
-    logger.error(f"Validation error for request: {body.decode()}")
-    logger.error(f"Validation errors: {exc.errors()}")
+    # 본문은 다시 읽지 않고 FastAPI가 파싱한 값을 잘라서 기록 (대용량 본문 / 재수신 대기 방지)
+    logger.error(
+        "Validation error for %s %s: body=%s errors=%s",
+        request.method,
+        request.url.path,
+        truncate(exc.body, LOG_BODY_MAX_CHARS),
+        truncate(exc.errors(), LOG_BODY_MAX_CHARS),
+    )
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()},
     )
 
 
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    """Request time budget used up somewhere in the pipeline"""
+    logger.warning("Deadline exceeded for %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "요청 처리 시간이 초과되었습니다. 잠시 후 다시 시도해주세요"},
+    )
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -65,8 +153,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저에서 요청별 토큰 사용량 헤더를 읽을 수 있도록
+    expose_headers=["X-LLM-Input-Tokens", "X-LLM-Output-Tokens", "X-LLM-Cost-USD"],
 )
 
+# 요청별 Bedrock 토큰 사용량 → X-LLM-* 응답 헤더
+app.add_middleware(UsageHeadersMiddleware)
+
+# 라우트별 지연 시간 히스토그램 (가장 바깥 미들웨어 → 전체 처리 시간 측정)
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Include routers
 app.include_router(chat.router, tags=["chat"])
 app.include_router(analytics.router, tags=["analytics"])
@@ -81,6 +177,23 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe - 200 only after services are built and warm-up has finished"""
+    report = startup_state.report()
+    if not startup_state.ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=report)
+    return report
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (모든 worker 합산)"""
+    chat.ai_answer_cache.report_size()
+    body, content_type = prometheus_metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/test-logs")
 async def test_logs():
     """로그 테스트 엔드포인트 - 다양한 레벨의 로그를 생성합니다"""
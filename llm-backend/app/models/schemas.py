@@ -19,6 +19,8 @@ class ChatRequest(BaseModel):
     wantsToPost: bool
     postData: Optional[PostData] = None
     isError: bool = False  # 에러 시나리오 시연용 (기본값: False)
+    bypassCache: bool = False  # True면 답변 캐시를 건너뛰고 새로 생성
+    deferPost: bool = False  # True면 글/댓글 작성을 큐에 넣고 바로 응답 (jobId로 상태 조회)
 
     @model_validator(mode='after')
     def validate_post_data_required(self):
@@ -49,6 +51,8 @@ class ChatResponse(BaseModel):
     commentError: Optional[str] = None
     nextStep: str = "completed"
     meta: Dict[str, List[Dict[str, Any]]]
+    jobId: Optional[str] = None  # deferPost=True일 때 글 작성 작업 ID
+    jobStatus: Optional[str] = None
 
 
 # New schemas for split endpoints
@@ -56,6 +60,7 @@ class AskRequest(BaseModel):
     conversationId: str
     originalQuestion: str = Field(..., min_length=1)
     isError: bool = False  # 에러 시나리오 시연용
+    bypassCache: bool = False  # True면 답변 캐시를 건너뛰고 새로 생성
 
 
 class AskResponse(BaseModel):
@@ -64,10 +69,28 @@ class AskResponse(BaseModel):
     reply: str
 
 
+class AskBatchRequest(BaseModel):
+    items: List[AskRequest] = Field(..., min_length=1, max_length=100)
+
+
+class AskBatchItemResult(BaseModel):
+    conversationId: str
+    aiAnswer: Optional[str] = None
+    reply: Optional[str] = None
+    error: Optional[str] = None  # 실패한 항목만 설정
+
+
+class AskBatchResponse(BaseModel):
+    results: List[AskBatchItemResult]
+    succeeded: int
+    failed: int
+
+
 class PostRequest(BaseModel):
     conversationId: str
     originalQuestion: str
     postData: PostData
+    deferPost: bool = False  # True면 글/댓글 작성을 큐에 넣고 바로 응답 (jobId로 상태 조회)
 
 
 class PostResponse(BaseModel):
@@ -76,3 +99,17 @@ class PostResponse(BaseModel):
     postCreated: Optional[PostCreatedResponse] = None
     commentCreated: bool = False
     commentError: Optional[str] = None
+    jobId: Optional[str] = None  # deferPost=True일 때 글 작성 작업 ID
+    jobStatus: Optional[str] = None
+
+
+class PostJobStatusResponse(BaseModel):
+    jobId: str
+    conversationId: str
+    status: str  # pending | posted | completed | failed
+    attempts: int
+    postCreated: Optional[PostCreatedResponse] = None
+    commentCreated: bool = False
+    lastError: Optional[str] = None
+    createdAt: float
+    updatedAt: float
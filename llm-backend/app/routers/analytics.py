@@ -5,11 +5,18 @@
 import logging
 from fastapi import APIRouter, HTTPException, Query
 from app.services.analytics_service import AnalyticsService
+from app.services.startup import startup_state
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-analytics_service = AnalyticsService()
+# 앱 lifespan에서 init_services()로 생성
+analytics_service: AnalyticsService = None  # type: ignore[assignment]
+
+
+async def init_services():
+    global analytics_service
+    analytics_service = await startup_state.build("analytics", AnalyticsService)
 
 
 @router.post("/llm/analytics/track")
@@ -22,23 +29,32 @@ async def track_user_behavior(
     """
     사용자 행동 추적 엔드포인트
 
-    외부 분석 API를 호출하여 사용자 행동을 기록합니다.
-    - 트레이스 span 생성됨
+    사용자 행동 이벤트를 수집 큐에 넣고 바로 응답합니다.
+    - 외부 분석 API로는 백그라운드에서 배치 전송 (트레이스 span 생성됨)
     - 로그 수집됨
+    - 큐가 가득 차면 503 + Retry-After
     """
-    logger.info(f"사용자 행동 추적 요청: user_id={user_id}, action={action}")
+    logger.info("사용자 행동 추적 요청: user_id=%s, action=%s", user_id, action)
 
     try:
         result = await analytics_service.track_user_behavior(user_id, action)
-        return {
-            "status": "success",
-            "message": "사용자 행동이 성공적으로 추적되었습니다.",
-            "data": result,
-        }
     except Exception as e:
-        logger.error(f"사용자 행동 추적 실패: {e}")
+        logger.error("사용자 행동 추적 실패: %s", e)
         raise HTTPException(status_code=500, detail="행동 추적 중 오류가 발생했습니다.")
 
+    if result is None:
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 행동 추적을 잠시 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    return {
+        "status": "success",
+        "message": "사용자 행동이 성공적으로 추적되었습니다.",
+        "data": result,
+    }
+
 
 @router.get("/llm/analytics/recommendations/{user_id}")
 async def get_recommendations(user_id: str):
@@ -49,11 +65,11 @@ async def get_recommendations(user_id: str):
     - 외부 추천 엔진 API 호출 시뮬레이션
     - 트레이스 span 생성됨
     """
-    logger.info(f"AI 추천 조회 요청: user_id={user_id}")
+    logger.info("AI 추천 조회 요청: user_id=%s", user_id)
 
     try:
         recommendations = await analytics_service.get_recommendations(user_id)
-        logger.info(f"추천 결과 반환: {len(recommendations)}개")
+        logger.info("추천 결과 반환: %s개", len(recommendations))
 
         return {
             "status": "success",
@@ -62,7 +78,7 @@ async def get_recommendations(user_id: str):
             "total": len(recommendations),
         }
     except Exception as e:
-        logger.error(f"AI 추천 조회 실패: {e}")
+        logger.error("AI 추천 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail="추천 조회 중 오류가 발생했습니다.")
 
 
@@ -75,11 +91,11 @@ async def get_service_metrics(service_name: str):
     - 내부 데이터 처리 + 외부 메트릭 저장소 조회 시뮬레이션
     - 복수의 트레이스 span 생성됨
     """
-    logger.info(f"서비스 메트릭 조회 요청: service={service_name}")
+    logger.info("서비스 메트릭 조회 요청: service=%s", service_name)
 
     try:
         metrics = await analytics_service.calculate_metrics(service_name)
-        logger.info(f"메트릭 조회 완료: service={service_name}")
+        logger.info("메트릭 조회 완료: service=%s", service_name)
 
         return {
             "status": "success",
@@ -88,7 +104,13 @@ async def get_service_metrics(service_name: str):
             "timestamp": "2025-01-01T00:00:00Z",
         }
     except Exception as e:
-        logger.error(f"메트릭 조회 실패: {e}")
+        logger.error("메트릭 조회 실패: %s", e)
         raise HTTPException(
             status_code=500, detail="메트릭 조회 중 오류가 발생했습니다."
         )
+
+
+@router.get("/llm/analytics/stats")
+async def get_analytics_stats():
+    """추천/메트릭 캐시, 이벤트 수집 큐 상태"""
+    return analytics_service.get_cache_stats()
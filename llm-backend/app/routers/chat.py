@@ -1,17 +1,95 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import ChatRequest, ChatResponse, FieldMetadata, AskRequest, AskResponse, PostRequest, PostResponse
+import os
+import secrets
+from typing import Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from app.models.schemas import ChatRequest, ChatResponse, FieldMetadata, AskRequest, AskResponse, AskBatchRequest, AskBatchResponse, AskBatchItemResult, PostRequest, PostResponse, PostJobStatusResponse
 from app.services.bedrock_service import BedrockService
 from app.services.api_backend_service import APIBackendService
+from app.services.answer_store import AnswerStore, create_answer_store
+from app.services.http_clients import http_clients
+from app.services.log_pipeline import log_pipeline
+from app.services.post_queue import PostJobQueue
+from app.services import prometheus_metrics
+from app.services.startup import startup_state
+from app.services.usage_meter import bind_conversation, current_usage, usage_meter
+from app.services.deadline import DEADLINE_HEADER, Deadline, DeadlineExceeded
+from app.services.response_cache import normalize_question
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-bedrock_service = BedrockService()
-api_backend_service = APIBackendService()
+# 서비스는 import 시점이 아닌 앱 lifespan에서 init_services()로 생성
+bedrock_service: BedrockService = None  # type: ignore[assignment]
+api_backend_service: APIBackendService = None  # type: ignore[assignment]
 
-# In-memory cache for AI answers (conversationId → AI answer)
-ai_answer_cache = {}
+# AI answers by conversationId (ask → post), shared across uvicorn workers
+ai_answer_cache: AnswerStore = None  # type: ignore[assignment]
+
+# deferPost=True 요청의 글/댓글 작성을 처리하는 write-behind 큐
+post_queue: PostJobQueue = None  # type: ignore[assignment]
+
+# deferPost 접수 시 안내 문구
+POST_QUEUED_MESSAGE = "글 작성 요청이 접수되었습니다. 잠시 후 게시됩니다."
+
+# /llm/chat/ask/batch 에서 동시에 생성할 최대 질문 수
+ASK_BATCH_CONCURRENCY = int(os.getenv("ASK_BATCH_CONCURRENCY", "4"))
+
+# /llm/admin/* 접근용 (api-backend와 같은 관리자 비밀번호, 설정하지 않으면 admin 라우트 비활성화)
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD") or None
+
+
+async def init_services():
+    """Build this router's services (blocking constructors in parallel worker threads)"""
+    global bedrock_service, api_backend_service, ai_answer_cache, post_queue
+    bedrock_service, ai_answer_cache = await asyncio.gather(
+        startup_state.build("bedrock", BedrockService, in_thread=True),
+        startup_state.build("answer_store", create_answer_store, in_thread=True),
+    )
+    api_backend_service = await startup_state.build("api_backend", APIBackendService)
+    post_queue = await startup_state.build(
+        "post_queue", lambda: PostJobQueue.from_env(api_backend_service)
+    )
+
+
+async def remember_answer(conversation_id: str, answer: str):
+    """Store the answer for /llm/chat/post; a store outage only costs a regeneration later"""
+    try:
+        await ai_answer_cache.put(conversation_id, answer)
+    except Exception as e:
+        logger.error("Answer store put failed for conversationId=%s: %s", conversation_id, e)
+
+
+async def recall_answer(conversation_id: str) -> Optional[str]:
+    try:
+        answer = await ai_answer_cache.get(conversation_id)
+    except Exception as e:
+        prometheus_metrics.ANSWER_STORE_LOOKUPS.labels("error").inc()
+        logger.error("Answer store lookup failed for conversationId=%s: %s", conversation_id, e)
+        return None
+    prometheus_metrics.ANSWER_STORE_LOOKUPS.labels("miss" if answer is None else "hit").inc()
+    return answer
+
+
+async def forget_answer(conversation_id: str) -> bool:
+    """Drop the stored answer once it is posted; cleanup is not counted as a lookup"""
+    try:
+        return await ai_answer_cache.pop(conversation_id) is not None
+    except Exception as e:
+        logger.error("Answer store cleanup failed for conversationId=%s: %s", conversation_id, e)
+        return False
+
+
+async def queue_post(conversation_id: str, content: str, ai_answer: str, email: Optional[str]):
+    """Enqueue post+comment creation; None if the spool is unavailable (caller writes directly)"""
+    try:
+        return await post_queue.enqueue(conversation_id, content, ai_answer, email=email)
+    except Exception as e:
+        logger.error("Failed to queue post for conversationId=%s, writing directly: %s", conversation_id, e)
+        return None
 
 
 def get_field_metadata():
@@ -78,30 +156,85 @@ def get_field_metadata():
     }
 
 
+def request_deadline(
+    x_request_timeout_ms: Optional[str] = Header(None, alias=DEADLINE_HEADER)
+) -> Deadline:
+    """Per-request time budget (X-Request-Timeout-Ms or REQUEST_DEADLINE_SECONDS)"""
+    return Deadline.from_header(x_request_timeout_ms)
+
+
+def require_admin(x_admin_password: Optional[str] = Header(None)):
+    if not ADMIN_PASSWORD or not x_admin_password or not secrets.compare_digest(
+        x_admin_password.encode(), ADMIN_PASSWORD.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다")
+
+
 @router.get("/llm")
 def l_ch():
     logger.info("hello")
     return "welcome to LLM backend"
 
 
+@router.get("/llm/stats")
+def stats():
+    """Runtime stats for hot-path dependencies"""
+    return {
+        "bedrock": bedrock_service.get_stats(),
+        "answer_cache": bedrock_service.get_cache_stats(),
+        "single_flight": bedrock_service.get_inflight_stats(),
+        "prompt_cache": bedrock_service.get_prompt_cache_stats(),
+        "answer_store": ai_answer_cache.stats(),
+        "http_clients": http_clients.stats(),
+        "post_queue": post_queue.stats(),
+        "api_backend": api_backend_service.get_stats(),
+        "logging": log_pipeline.stats(),
+    }
+
+
+@router.get("/llm/admin/usage", dependencies=[Depends(require_admin)])
+def usage(
+    top: int = Query(20, ge=1, le=500),
+    sort: str = Query(
+        "cost_usd", pattern="^(cost_usd|input_tokens|output_tokens|calls|truncated)$"
+    ),
+):
+    """Bedrock token usage / estimated cost over the rolling window (this worker)"""
+    return {
+        **usage_meter.report(top=top, sort_by=sort),
+        "max_tokens": bedrock_service.max_tokens,
+    }
+
+
 @router.post("/llm/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    response: Response,
+    deadline: Deadline = Depends(request_deadline),
+):
     """
     Single-shot chat endpoint
     1. Generate AI answer via Bedrock
     2. If wantsToPost=true, create post and auto-comment
+       (deferPost=true면 큐에 넣고 202 + jobId 반환)
     3. Return complete response
     """
 
-    logger.info(f"Chat request: conversationId={request.conversationId if hasattr(request, 'conversationId') else 'N/A'}, wantsToPost={request.wantsToPost}")
+    logger.info("Chat request: conversationId=%s, wantsToPost=%s", request.conversationId if hasattr(request, 'conversationId') else 'N/A', request.wantsToPost)
+    bind_conversation(request.conversationId)
 
     # Step 1: Generate AI answer
     try:
         ai_answer = await bedrock_service.generate_answer(
-            request.originalQuestion, is_error=request.isError
+            request.originalQuestion,
+            is_error=request.isError,
+            use_cache=not request.bypassCache,
+            deadline=deadline,
         )
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Bedrock failed: {e}")
+        logger.error("Bedrock failed: %s", e)
         raise HTTPException(status_code=502, detail=str(e))
 
     response_data = {
@@ -118,10 +251,26 @@ async def chat(request: ChatRequest):
     if not request.wantsToPost or not request.postData:
         return ChatResponse(**response_data)
 
+    if request.deferPost:
+        job = await queue_post(
+            request.conversationId,
+            request.originalQuestion,
+            ai_answer,
+            request.postData.email,
+        )
+        if job:
+            response.status_code = status.HTTP_202_ACCEPTED
+            response_data["reply"] = f"{ai_answer}\n\n{POST_QUEUED_MESSAGE}"
+            response_data["nextStep"] = "pending"
+            response_data["jobId"] = job["jobId"]
+            response_data["jobStatus"] = job["status"]
+            return ChatResponse(**response_data)
+
     # Step 3: Create post
     post_result = await api_backend_service.create_post(
         content=request.originalQuestion,
         email=request.postData.email,
+        deadline=deadline,
     )
 
     if not post_result:
@@ -135,14 +284,17 @@ async def chat(request: ChatRequest):
 
     # Step 4: Auto-create AI comment
     comment_success = await api_backend_service.create_comment(
-        post_id=post_result["id"], content=ai_answer, is_ai_generated=True
+        post_id=post_result["id"],
+        content=ai_answer,
+        is_ai_generated=True,
+        deadline=deadline,
     )
 
     response_data["commentCreated"] = comment_success
 
     if not comment_success:
         response_data["commentError"] = "댓글 작성에 실패했습니다"
-        logger.warning(f"Comment creation failed for post {post_result['id']}")
+        logger.warning("Comment creation failed for post %s", post_result['id'])
 
     # Update reply message
     if post_result:
@@ -157,27 +309,33 @@ async def chat(request: ChatRequest):
 
 
 @router.post("/llm/chat/ask", response_model=AskResponse)
-async def ask(request: AskRequest):
+async def ask(request: AskRequest, deadline: Deadline = Depends(request_deadline)):
     """
     Step 1: Generate AI answer only
     - Generate AI answer via Bedrock
     - Cache the answer with conversationId
     - Return answer for display
     """
-    logger.info(f"Ask request: conversationId={request.conversationId}, question={request.originalQuestion[:50]}...")
+    logger.info("Ask request: conversationId=%s, question=%s...", request.conversationId, request.originalQuestion[:50])
+    bind_conversation(request.conversationId)
 
     # Generate AI answer
     try:
         ai_answer = await bedrock_service.generate_answer(
-            request.originalQuestion, is_error=request.isError
+            request.originalQuestion,
+            is_error=request.isError,
+            use_cache=not request.bypassCache,
+            deadline=deadline,
         )
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Bedrock failed: {e}")
+        logger.error("Bedrock failed: %s", e)
         raise HTTPException(status_code=502, detail=str(e))
 
     # Cache the answer
-    ai_answer_cache[request.conversationId] = ai_answer
-    logger.info(f"Cached AI answer for conversationId={request.conversationId}")
+    await remember_answer(request.conversationId, ai_answer)
+    logger.info("Cached AI answer for conversationId=%s", request.conversationId)
 
     return AskResponse(
         conversationId=request.conversationId,
@@ -186,31 +344,202 @@ async def ask(request: AskRequest):
     )
 
 
+@router.post("/llm/chat/ask/batch", response_model=AskBatchResponse)
+async def ask_batch(
+    request: AskBatchRequest, deadline: Deadline = Depends(request_deadline)
+):
+    """
+    Step 1 (batch): Generate AI answers for many questions at once
+    - 같은 질문(정규화 기준)은 배치 안에서 한 번만 생성
+    - 최대 ASK_BATCH_CONCURRENCY개씩 동시에 생성
+    - 성공한 항목은 conversationId별로 캐시
+    - 실패한 항목은 error에 사유를 담아 부분 결과로 반환
+    """
+    logger.info("Ask batch request: items=%s", len(request.items))
+
+    semaphore = asyncio.Semaphore(ASK_BATCH_CONCURRENCY)
+
+    async def generate(item: AskRequest) -> str:
+        # gather가 항목마다 태스크를 만들므로 사용량이 항목의 conversationId로 집계됨
+        bind_conversation(item.conversationId)
+        async with semaphore:
+            return await bedrock_service.generate_answer(
+                item.originalQuestion,
+                is_error=item.isError,
+                use_cache=not item.bypassCache,
+                deadline=deadline,
+            )
+
+    # 배치 내 중복 질문 제거
+    unique: Dict[Tuple[str, bool, bool], AskRequest] = {}
+    for item in request.items:
+        key = (normalize_question(item.originalQuestion), item.isError, item.bypassCache)
+        unique.setdefault(key, item)
+
+    keys = list(unique)
+    outcomes = await asyncio.gather(
+        *(generate(unique[key]) for key in keys), return_exceptions=True
+    )
+    answers = dict(zip(keys, outcomes))
+
+    results = []
+    for item in request.items:
+        outcome = answers[
+            (normalize_question(item.originalQuestion), item.isError, item.bypassCache)
+        ]
+        if isinstance(outcome, BaseException):
+            if isinstance(outcome, DeadlineExceeded):
+                error = "요청 처리 시간이 초과되었습니다. 잠시 후 다시 시도해주세요"
+            else:
+                error = str(outcome)
+            logger.error("Bedrock failed for conversationId=%s: %s", item.conversationId, outcome)
+            results.append(
+                AskBatchItemResult(conversationId=item.conversationId, error=error)
+            )
+            continue
+
+        # Cache the answer
+        await remember_answer(item.conversationId, outcome)
+        results.append(
+            AskBatchItemResult(
+                conversationId=item.conversationId, aiAnswer=outcome, reply=outcome
+            )
+        )
+
+    failed = sum(1 for result in results if result.error)
+    logger.info(
+        "Ask batch completed: unique=%d, succeeded=%d, failed=%d",
+        len(keys),
+        len(results) - failed,
+        failed,
+    )
+
+    return AskBatchResponse(
+        results=results, succeeded=len(results) - failed, failed=failed
+    )
+
+
+def _usage_summary() -> Optional[dict]:
+    usage = current_usage()
+    if usage is None or not usage.calls:
+        return None
+    return {
+        "inputTokens": usage.input_tokens,
+        "outputTokens": usage.output_tokens,
+        "costUsd": round(usage.cost_usd, 6),
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/llm/chat/ask/stream")
+async def ask_stream(request: AskRequest, deadline: Deadline = Depends(request_deadline)):
+    """
+    Step 1 (streaming): Generate AI answer as Server-Sent Events
+    - delta: 생성되는 답변 조각
+    - done: 최종 답변 (conversationId로 캐시됨)
+    - error: 생성 실패
+    """
+    logger.info("Ask stream request: conversationId=%s, question=%s...", request.conversationId, request.originalQuestion[:50])
+
+    async def event_stream():
+        bind_conversation(request.conversationId)
+        chunks = []
+        try:
+            if request.isError:
+                await bedrock_service.generate_answer(
+                    request.originalQuestion, is_error=True
+                )
+            async for delta in bedrock_service.generate_answer_stream(
+                request.originalQuestion, use_cache=not request.bypassCache, deadline=deadline
+            ):
+                chunks.append(delta)
+                yield _sse("delta", {"text": delta})
+        except Exception as e:
+            logger.error("Bedrock stream failed: %s", e)
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        ai_answer = "".join(chunks)
+
+        # Cache the answer
+        await remember_answer(request.conversationId, ai_answer)
+        logger.info("Cached AI answer for conversationId=%s", request.conversationId)
+
+        yield _sse(
+            "done",
+            {
+                "conversationId": request.conversationId,
+                "aiAnswer": ai_answer,
+                "reply": ai_answer,
+                # 스트리밍은 헤더가 먼저 나가므로 사용량은 여기서 전달
+                "usage": _usage_summary(),
+            },
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/llm/chat/post", response_model=PostResponse)
-async def post(request: PostRequest):
+async def post(
+    request: PostRequest,
+    response: Response,
+    deadline: Deadline = Depends(request_deadline),
+):
     """
     Step 2: Create post with cached AI answer
     - Retrieve cached AI answer (or regenerate if not found)
     - Create post
     - Create AI comment automatically
+    - deferPost=true면 글/댓글 작성을 큐에 넣고 202 + jobId 반환
     """
-    logger.info(f"Post request: conversationId={request.conversationId}")
+    logger.info("Post request: conversationId=%s", request.conversationId)
+    bind_conversation(request.conversationId)
 
     # Retrieve cached AI answer
-    ai_answer = ai_answer_cache.get(request.conversationId)
+    ai_answer = await recall_answer(request.conversationId)
 
     if not ai_answer:
-        logger.warning(f"No cached answer for conversationId={request.conversationId}, regenerating...")
+        logger.warning("No cached answer for conversationId=%s, regenerating...", request.conversationId)
         try:
-            ai_answer = await bedrock_service.generate_answer(request.originalQuestion)
+            ai_answer = await bedrock_service.generate_answer(
+                request.originalQuestion, deadline=deadline
+            )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            logger.error(f"Bedrock failed: {e}")
+            logger.error("Bedrock failed: %s", e)
             raise HTTPException(status_code=502, detail=str(e))
 
+    if request.deferPost:
+        job = await queue_post(
+            request.conversationId,
+            request.originalQuestion,
+            ai_answer,
+            request.postData.email,
+        )
+        if job:
+            await forget_answer(request.conversationId)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return PostResponse(
+                reply=POST_QUEUED_MESSAGE,
+                aiAnswer=ai_answer,
+                jobId=job["jobId"],
+                jobStatus=job["status"],
+            )
+
     # Create post
     post_result = await api_backend_service.create_post(
         content=request.originalQuestion,
         email=request.postData.email,
+        deadline=deadline,
     )
 
     if not post_result:
@@ -222,7 +551,10 @@ async def post(request: PostRequest):
 
     # Auto-create AI comment
     comment_success = await api_backend_service.create_comment(
-        post_id=post_result["id"], content=ai_answer, is_ai_generated=True
+        post_id=post_result["id"],
+        content=ai_answer,
+        is_ai_generated=True,
+        deadline=deadline,
     )
 
     # Build response message
@@ -231,9 +563,8 @@ async def post(request: PostRequest):
         reply_message += "\nAI 답변이 댓글로 등록되었습니다."
 
     # Clean up cache
-    if request.conversationId in ai_answer_cache:
-        del ai_answer_cache[request.conversationId]
-        logger.info(f"Cleaned up cache for conversationId={request.conversationId}")
+    if await forget_answer(request.conversationId):
+        logger.info("Cleaned up cache for conversationId=%s", request.conversationId)
 
     return PostResponse(
         reply=reply_message,
@@ -242,3 +573,12 @@ async def post(request: PostRequest):
         commentCreated=comment_success,
         commentError="댓글 작성에 실패했습니다" if not comment_success else None,
     )
+
+
+@router.get("/llm/chat/post/jobs/{job_id}", response_model=PostJobStatusResponse)
+async def post_job_status(job_id: str):
+    """Status of a deferred post+comment job (deferPost=true)"""
+    job = await post_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return PostJobStatusResponse(**job)
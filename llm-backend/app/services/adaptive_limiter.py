@@ -0,0 +1,121 @@
+"""
+AIMD 기반 적응형 동시성 제한
+- 성공 시 limit을 조금씩 증가 (additive increase)
+- throttling 응답 시 limit을 절반으로 감소 (multiplicative decrease)
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_THROTTLED = "throttled"
+OUTCOME_ERROR = "error"
+
+
+class LimiterRejected(Exception):
+    """Raised when a slot could not be acquired before the timeout"""
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        # 같은 throttling 버스트에 대해 limit을 연속으로 깎지 않도록
+        self.decrease_cooldown = decrease_cooldown
+        self._limit = float(initial_limit if initial_limit is not None else max_limit)
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """Wait for a slot; raises LimiterRejected if none frees up within timeout"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._grant()
+            return
+
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise LimiterRejected(
+                f"no Bedrock slot within {timeout:.2f}s (limit={self.limit})"
+            )
+        except asyncio.CancelledError:
+            # 슬롯을 받은 직후 취소된 경우 슬롯 반환
+            if fut.done() and not fut.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            raise
+        finally:
+            if not fut.done() or fut.cancelled():
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+
+    def release(self, outcome: str = OUTCOME_SUCCESS):
+        self._in_flight -= 1
+        if outcome == OUTCOME_SUCCESS:
+            self._limit = min(
+                float(self.max_limit), self._limit + self.increase / self._limit
+            )
+        elif outcome == OUTCOME_THROTTLED:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease >= self.decrease_cooldown:
+                self._limit = max(
+                    float(self.min_limit), self._limit * self.decrease_factor
+                )
+                self._last_decrease = now
+                self.decreases += 1
+        self._wake()
+
+    def _grant(self):
+        self._in_flight += 1
+        self.acquired += 1
+
+    def _wake(self):
+        while self._waiters and self._in_flight < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._grant()
+                fut.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "decreases": self.decreases,
+        }
@@ -4,9 +4,18 @@ httpx를 사용하여 트레이스 span 생성
 """
 import logging
 import asyncio
+import os
 import random
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 import httpx
 
+from app.services.deadline import Deadline, DeadlineExceeded
+from app.services.event_ingestor import EventIngestor
+from app.services.http_clients import http_clients
+from app.services.request_metrics import request_metrics
+from app.services.swr_cache import StaleWhileRevalidateCache
+
 logger = logging.getLogger(__name__)
 
 # 더미 API 엔드포인트들 (실제로는 호출 실패하지만 span은 생성됨)
@@ -14,27 +23,84 @@ ANALYTICS_API_BASE = "https://analytics-api-mock.example.com"
 RECOMMENDATION_API_BASE = "https://recommendation-engine-mock.example.com"
 METRICS_API_BASE = "https://metrics-storage-mock.example.com"
 
+# 공유 HTTP 클라이언트 이름 → base URL
+UPSTREAMS = {
+    "analytics-api": ANALYTICS_API_BASE,
+    "recommendation-api": RECOMMENDATION_API_BASE,
+    "metrics-api": METRICS_API_BASE,
+}
+
+# calculate_metrics 전체 예산 / 조회별 상한 (초)
+METRICS_DEADLINE_SECONDS = float(os.getenv("ANALYTICS_METRICS_DEADLINE", "0.5"))
+METRICS_LOOKUP_TIMEOUT = 0.4
+
 
 class AnalyticsService:
     """사용자 행동 분석 서비스"""
 
+    def __init__(
+        self,
+        analytics_client: Optional[httpx.AsyncClient] = None,
+        recommendation_client: Optional[httpx.AsyncClient] = None,
+        metrics_client: Optional[httpx.AsyncClient] = None,
+    ):
+        # 업스트림별 공유 클라이언트 (주입되지 않으면 공유 레지스트리에서 가져옴)
+        self._clients = {
+            "analytics-api": analytics_client,
+            "recommendation-api": recommendation_client,
+            "metrics-api": metrics_client,
+        }
+
+        # 추천/메트릭은 천천히 바뀌고 키 공간이 작으므로 stale-while-revalidate 캐시
+        # (로더 예외는 negative TTL 동안만 캐시)
+        negative_ttl = float(os.getenv("ANALYTICS_CACHE_NEGATIVE_TTL", "5"))
+        stale_ttl = float(os.getenv("ANALYTICS_CACHE_STALE_TTL", "300"))
+        # 더미 업스트림은 span 생성용이라 항상 실패하고 응답 데이터도 업스트림과 무관하므로
+        # 기본값은 업스트림 실패를 negative로 보지 않음 (실제 업스트림을 붙이면 true)
+        failures_negative = (
+            os.getenv("ANALYTICS_CACHE_UPSTREAM_FAILURE_NEGATIVE", "false").lower() == "true"
+        )
+        self.recommendation_cache: StaleWhileRevalidateCache[Tuple[List[Dict[str, Any]], bool]] = (
+            StaleWhileRevalidateCache(
+                ttl=float(os.getenv("ANALYTICS_RECOMMENDATIONS_TTL", "60")),
+                stale_ttl=stale_ttl,
+                negative_ttl=negative_ttl,
+                is_failure=(lambda result: not result[1]) if failures_negative else None,
+            )
+        )
+        self.metrics_cache: StaleWhileRevalidateCache[Dict[str, Any]] = StaleWhileRevalidateCache(
+            ttl=float(os.getenv("ANALYTICS_METRICS_TTL", "30")),
+            stale_ttl=stale_ttl,
+            negative_ttl=negative_ttl,
+            is_failure=(lambda metrics: metrics["partial"]) if failures_negative else None,
+        )
+
+        # 행동 추적 이벤트는 큐에 넣고 바로 반환, 백그라운드에서 배치 전송
+        self.event_ingestor = EventIngestor(
+            self._send_events,
+            max_queue=int(os.getenv("ANALYTICS_EVENT_QUEUE_SIZE", "10000")),
+            batch_size=int(os.getenv("ANALYTICS_EVENT_BATCH_SIZE", "100")),
+            flush_interval=float(os.getenv("ANALYTICS_EVENT_FLUSH_INTERVAL", "1.0")),
+            stop_timeout=float(os.getenv("ANALYTICS_EVENT_STOP_TIMEOUT", "5.0")),
+        )
+
+    def _client(self, name: str) -> httpx.AsyncClient:
+        return self._clients[name] or http_clients.get(name, UPSTREAMS[name])
+
     async def track_user_behavior(self, user_id: str, action: str):
         """
-        사용자 행동 추적 - 외부 분석 API 호출 시뮬레이션
-        httpx로 더미 요청하여 트레이스 span 생성
+        사용자 행동 추적 - 이벤트를 수집 큐에 넣고 바로 반환
+        외부 분석 API 호출은 백그라운드 배치 전송(_send_events)에서 수행
+        Returns: None if the event queue is full (backpressure)
         """
-        logger.info(f"사용자 행동 추적 시작: user_id={user_id}, action={action}")
+        logger.info("사용자 행동 추적 시작: user_id=%s, action=%s", user_id, action)
 
-        # httpx로 외부 API 호출 시뮬레이션 (SDK가 자동으로 span 생성)
-        try:
-            async with httpx.AsyncClient(timeout=0.3) as client:
-                await client.post(
-                    f"{ANALYTICS_API_BASE}/track",
-                    json={"user_id": user_id, "action": action}
-                )
-        except Exception:
-            # 실패는 예상된 동작 (span만 필요)
-            pass
+        accepted = self.event_ingestor.offer(
+            {"user_id": user_id, "action": action, "timestamp": time.time()}
+        )
+        if not accepted:
+            logger.warning("이벤트 큐가 가득 차 추적 이벤트를 버렸습니다: user_id=%s", user_id)
+            return None
 
         # 더미 데이터 반환
         analytics_data = {
@@ -45,26 +111,49 @@ class AnalyticsService:
             "page_views": random.randint(1, 20),
         }
 
-        logger.info(f"사용자 행동 추적 완료: {analytics_data}")
+        # 응답 dict 전체 대신 식별자만 기록
+        logger.info("사용자 행동 추적 완료: user_id=%s, action=%s", user_id, action)
         return analytics_data
 
+    async def _send_events(self, events: List[Dict[str, Any]]):
+        """
+        이벤트 배치 전송 - 외부 분석 API 호출 시뮬레이션
+        httpx로 더미 요청하여 트레이스 span 생성 (배치당 1회)
+        """
+        response = await self._client("analytics-api").post(
+            f"{ANALYTICS_API_BASE}/track/batch",
+            json={"events": events},
+            timeout=0.3,
+        )
+        response.raise_for_status()
+
     async def get_recommendations(self, user_id: str):
         """
-        AI 추천 엔진 - 외부 추천 API 호출 시뮬레이션
+        AI 추천 엔진 - 외부 추천 API 호출 시뮬레이션 (캐시 경유)
+        """
+        recommendations, _ = await self.recommendation_cache.get(
+            user_id, lambda: self._load_recommendations(user_id)
+        )
+        return recommendations
+
+    async def _load_recommendations(self, user_id: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
         httpx로 더미 요청하여 트레이스 span 생성
+        Returns: (추천 목록, 업스트림 호출 성공 여부)
         """
-        logger.info(f"AI 추천 조회 시작: user_id={user_id}")
+        logger.info("AI 추천 조회 시작: user_id=%s", user_id)
 
         # httpx로 외부 추천 엔진 API 호출 시뮬레이션
+        upstream_ok = True
         try:
-            async with httpx.AsyncClient(timeout=0.5) as client:
-                await client.get(
-                    f"{RECOMMENDATION_API_BASE}/recommendations/{user_id}",
-                    params={"limit": 3}
-                )
+            await self._client("recommendation-api").get(
+                f"{RECOMMENDATION_API_BASE}/recommendations/{user_id}",
+                params={"limit": 3},
+                timeout=0.5,
+            )
         except Exception:
             # 실패는 예상된 동작 (span만 필요)
-            pass
+            upstream_ok = False
 
         recommendations = [
             {"id": 1, "title": "로그 수집 시스템 구축 가이드", "score": 0.95},
@@ -72,63 +161,107 @@ class AnalyticsService:
             {"id": 3, "title": "모니터링 베스트 프랙티스", "score": 0.82},
         ]
 
-        logger.info(f"AI 추천 조회 완료: {len(recommendations)}개 항목")
-        return recommendations
+        logger.info("AI 추천 조회 완료: %s개 항목", len(recommendations))
+        return recommendations, upstream_ok
 
     async def calculate_metrics(self, service_name: str):
+        """서비스 메트릭 계산 (캐시 경유)"""
+        return await self.metrics_cache.get(
+            service_name, lambda: self._calculate_metrics(service_name)
+        )
+
+    async def _calculate_metrics(self, service_name: str) -> Dict[str, Any]:
         """
         서비스 메트릭 계산 - 내부 데이터 처리 + 외부 메트릭 저장소 호출 시뮬레이션
         복수의 httpx 호출로 여러 트레이스 span 생성
+        수치(요청 수, 에러율, p50/p95/p99, CPU, RSS)는 request_metrics 미들웨어 집계값 (worker 프로세스 기준)
+
+        서로 독립적인 단계들을 하나의 deadline 아래 동시에 실행하므로
+        전체 지연은 단계별 지연의 합이 아닌 최댓값이 됨.
+        일부 조회가 실패/시간 초과해도 나머지 결과로 응답 (lookups에 단계별 상태/소요 시간)
         """
-        logger.info(f"메트릭 계산 시작: service={service_name}")
+        logger.info("메트릭 계산 시작: service=%s", service_name)
+        deadline = Deadline(METRICS_DEADLINE_SECONDS)
 
-        # 1단계: 내부 데이터 처리 (간단한 계산)
-        await asyncio.sleep(random.uniform(0.02, 0.05))
-        logger.info("내부 데이터 처리 완료")
+        results = await asyncio.gather(
+            # 1단계: 내부 데이터 처리 (간단한 계산)
+            self._timed_step("internal", self._process_internal(), deadline),
+            # 2~4단계: 외부 메트릭 저장소 조회 (span 1~3)
+            self._timed_step(
+                "requests",
+                self._metrics_lookup(service_name, "requests", {"period": "1h"}, deadline),
+                deadline,
+            ),
+            self._timed_step(
+                "errors",
+                self._metrics_lookup(service_name, "errors", {"period": "1h"}, deadline),
+                deadline,
+            ),
+            self._timed_step(
+                "resources",
+                self._metrics_lookup(
+                    service_name, "resources", {"metrics": "cpu,memory"}, deadline
+                ),
+                deadline,
+            ),
+        )
+        lookups = {name: outcome for name, outcome in results}
+        partial = any(outcome["status"] != "ok" for outcome in lookups.values())
+        # 단계별 상태는 응답의 lookups에도 있으므로 debug에서만 문자열 생성
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "메트릭 조회 단계 완료: %s",
+                ", ".join(
+                    f"{name}={outcome['status']}({outcome['duration_ms']}ms)"
+                    for name, outcome in lookups.items()
+                ),
+            )
 
-        # 2단계: 외부 메트릭 저장소에서 요청 카운트 조회 (span 1)
-        try:
-            async with httpx.AsyncClient(timeout=0.4) as client:
-                await client.get(
-                    f"{METRICS_API_BASE}/metrics/{service_name}/requests",
-                    params={"period": "1h"}
-                )
-        except Exception:
-            pass
-        logger.info("요청 카운트 조회 완료")
+        # 미들웨어가 수집한 이 프로세스의 실제 지연 시간 히스토그램 / CPU / RSS
+        summary = request_metrics.summary()
+        metrics = {
+            "service_name": service_name,
+            **summary,
+            "partial": partial,
+            "lookups": lookups,
+        }
 
-        # 3단계: 외부 메트릭 저장소에서 에러율 조회 (span 2)
-        try:
-            async with httpx.AsyncClient(timeout=0.4) as client:
-                await client.get(
-                    f"{METRICS_API_BASE}/metrics/{service_name}/errors",
-                    params={"period": "1h"}
-                )
-        except Exception:
-            pass
-        logger.info("에러율 조회 완료")
+        logger.info("메트릭 계산 완료: error_rate=%s", metrics['error_rate'])
+        return metrics
+
+    async def _process_internal(self):
+        await asyncio.sleep(random.uniform(0.02, 0.05))
 
-        # 4단계: 외부 메트릭 저장소에서 리소스 사용량 조회 (span 3)
+    async def _metrics_lookup(
+        self, service_name: str, metric: str, params: dict, deadline: Deadline
+    ):
+        await self._client("metrics-api").get(
+            f"{METRICS_API_BASE}/metrics/{service_name}/{metric}",
+            params=params,
+            timeout=deadline.timeout(METRICS_LOOKUP_TIMEOUT, stage=metric),
+        )
+
+    async def _timed_step(
+        self, name: str, step: Awaitable[Any], deadline: Deadline
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Run one step under the shared deadline; never raises, reports status and timing"""
+        started = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=0.4) as client:
-                await client.get(
-                    f"{METRICS_API_BASE}/metrics/{service_name}/resources",
-                    params={"metrics": "cpu,memory"}
-                )
+            await asyncio.wait_for(step, deadline.remaining())
+            status = "ok"
+        except (asyncio.TimeoutError, DeadlineExceeded, httpx.TimeoutException):
+            status = "timeout"
         except Exception:
-            pass
-        logger.info("리소스 사용량 조회 완료")
-
-        # 더미 메트릭 데이터 생성
-        metrics = {
-            "service_name": service_name,
-            "request_count": random.randint(1000, 10000),
-            "error_rate": round(random.uniform(0.01, 0.05), 4),
-            "avg_response_time_ms": random.randint(50, 500),
-            "p95_response_time_ms": random.randint(100, 800),
-            "cpu_usage": round(random.uniform(20, 80), 2),
-            "memory_usage_mb": random.randint(200, 1500),
+            # 더미 엔드포인트라 실패는 예상된 동작 (span만 필요)
+            status = "error"
+        return name, {
+            "status": status,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
         }
 
-        logger.info(f"메트릭 계산 완료: error_rate={metrics['error_rate']}")
-        return metrics
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "recommendations": self.recommendation_cache.stats(),
+            "metrics": self.metrics_cache.stats(),
+            "events": self.event_ingestor.stats(),
+        }
@@ -0,0 +1,483 @@
+"""
+대화별 AI 답변 저장소 (conversationId → AI 답변)
+/llm/chat/ask 에서 저장하고 /llm/chat/post 에서 꺼내 씀
+
+백엔드 (ANSWER_STORE_BACKEND)
+- memory: 프로세스 내 OrderedDict (TTL + LRU + 항목/바이트 제한)
+- sqlite: 같은 호스트의 uvicorn worker들이 공유하는 SQLite(WAL) 파일
+- redis: Redis 프로토콜 서버 (여러 호스트 간 공유)
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.services import prometheus_metrics
+from app.services.redis_client import RedisClient, RedisError, RedisReplyError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _entry_size(conversation_id: str, answer: str) -> int:
+    return len(conversation_id.encode("utf-8")) + len(answer.encode("utf-8"))
+
+
+class AnswerStore:
+    """Answer store interface with shared TTL/limits, counters and sweep task"""
+
+    backend = "base"
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl_seconds: float = 900.0,
+        sweep_interval: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional["asyncio.Task[None]"] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+
+    async def put(self, conversation_id: str, answer: str):
+        raise NotImplementedError
+
+    async def get(self, conversation_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def pop(self, conversation_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Drop expired entries and enforce limits; returns how many were removed"""
+        return 0
+
+    async def close(self):
+        pass
+
+    def start(self):
+        """Start the periodic expiry task (call from the app lifespan)"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.ensure_future(self._sweep_loop())
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        await self.close()
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await self.sweep()
+            except Exception as e:
+                self.errors += 1
+                logger.error("Answer store sweep failed: %s", e)
+                continue
+            if removed:
+                logger.info("Answer store sweep removed %s entries", removed)
+            self.report_size()
+
+    def report_size(self):
+        """Publish the entry count to the Prometheus gauge (no-op if the backend can't tell)"""
+        prometheus_metrics.set_answer_store_entries(self.backend, self.stats().get("size"))
+
+    def _too_large(self, conversation_id: str, size: int) -> bool:
+        if size > self.max_bytes:
+            logger.warning(
+                "Answer for conversationId=%s exceeds store limit (%s bytes), not cached",
+                conversation_id,
+                size,
+            )
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors,
+        }
+
+
+class MemoryAnswerStore(AnswerStore):
+    """Per-process store: bounded OrderedDict with LRU eviction"""
+
+    backend = "memory"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # conversationId → (만료 시각, 답변, 바이트 크기)
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._bytes = 0
+
+    async def put(self, conversation_id: str, answer: str):
+        self._discard(conversation_id)
+        size = _entry_size(conversation_id, answer)
+        if self._too_large(conversation_id, size):
+            return
+
+        self._entries[conversation_id] = (
+            time.monotonic() + self.ttl_seconds,
+            answer,
+            size,
+        )
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    async def get(self, conversation_id: str) -> Optional[str]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, answer, _ = entry
+        if expires_at <= time.monotonic():
+            self._discard(conversation_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(conversation_id)
+        self.hits += 1
+        return answer
+
+    async def pop(self, conversation_id: str) -> Optional[str]:
+        answer = await self.get(conversation_id)
+        if answer is not None:
+            self._discard(conversation_id)
+        return answer
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[0] <= now]
+        for key in expired:
+            self._discard(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def _discard(self, conversation_id: str):
+        entry = self._entries.pop(conversation_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "size": len(self._entries), "bytes": self._bytes}
+
+
+class SQLiteAnswerStore(AnswerStore):
+    """
+    Cross-process store on a SQLite file in WAL mode
+
+    같은 호스트의 worker들이 하나의 파일을 공유합니다.
+    쿼리는 전용 스레드 하나에서 실행되어 이벤트 루프를 막지 않습니다.
+    항목/바이트 한도는 쓰기마다, 만료 정리는 조회 시(lazy)와 sweep 시 수행합니다.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size = 0
+        self._bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS answers (
+                    conversation_id TEXT PRIMARY KEY,
+                    answer TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS answers_accessed_at ON answers (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, lambda: fn(self._connection())
+            )
+        except sqlite3.Error:
+            self.errors += 1
+            raise
+
+    async def put(self, conversation_id: str, answer: str):
+        size = _entry_size(conversation_id, answer)
+        if self._too_large(conversation_id, size):
+            return
+
+        def query(conn: sqlite3.Connection) -> Tuple[int, int, int]:
+            # 시스템 시계 기준 (프로세스 간 공유되므로 monotonic 사용 불가)
+            now = time.time()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                    (conversation_id, answer, size, now + self.ttl_seconds, now),
+                )
+                # 한도는 쓰기마다 적용 (sweep 주기 사이에 파일이 한도를 넘어 커지지 않도록)
+                return self._evict_over_limit(conn)
+
+        evicted, self._size, self._bytes = await self._run(query)
+        self.evictions += evicted
+
+    async def get(self, conversation_id: str) -> Optional[str]:
+        def query(conn: sqlite3.Connection) -> Tuple[Optional[str], bool]:
+            now = time.time()
+            row = conn.execute(
+                "SELECT answer, expires_at FROM answers WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()
+            if row is None:
+                return None, False
+            if row[1] <= now:
+                conn.execute(
+                    "DELETE FROM answers WHERE conversation_id = ?", (conversation_id,)
+                )
+                return None, True
+            conn.execute(
+                "UPDATE answers SET accessed_at = ? WHERE conversation_id = ?",
+                (now, conversation_id),
+            )
+            return row[0], False
+
+        answer, expired = await self._run(query)
+        self._count(answer, expired)
+        return answer
+
+    async def pop(self, conversation_id: str) -> Optional[str]:
+        def query(conn: sqlite3.Connection) -> Tuple[Optional[str], bool]:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT answer, expires_at FROM answers WHERE conversation_id = ?",
+                    (conversation_id,),
+                ).fetchone()
+                if row is None:
+                    return None, False
+                conn.execute(
+                    "DELETE FROM answers WHERE conversation_id = ?", (conversation_id,)
+                )
+            if row[1] <= time.time():
+                return None, True
+            return row[0], False
+
+        answer, expired = await self._run(query)
+        self._count(answer, expired)
+        return answer
+
+    def _count(self, answer: Optional[str], expired: bool):
+        if answer is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if expired:
+            self.expirations += 1
+
+    def _evict_over_limit(self, conn: sqlite3.Connection) -> Tuple[int, int, int]:
+        """Drop least recently read entries until within limits; returns (evicted, size, bytes)"""
+        size, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers"
+        ).fetchone()
+        if size <= self.max_entries and total <= self.max_bytes:
+            return 0, size, total
+
+        # 한도를 넘으면 가장 오래 조회되지 않은 항목부터 제거
+        rows = conn.execute(
+            "SELECT conversation_id, size FROM answers ORDER BY accessed_at"
+        )
+        victims = []
+        for conversation_id, entry_size in rows:
+            if size <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((conversation_id,))
+            size -= 1
+            total -= entry_size
+        conn.executemany("DELETE FROM answers WHERE conversation_id = ?", victims)
+        return len(victims), size, total
+
+    async def sweep(self) -> int:
+        def query(conn: sqlite3.Connection) -> Tuple[int, int, int, int]:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                expired = conn.execute(
+                    "DELETE FROM answers WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+                evicted, size, total = self._evict_over_limit(conn)
+            return expired, evicted, size, total
+
+        expired, evicted, self._size, self._bytes = await self._run(query)
+        self.expirations += expired
+        self.evictions += evicted
+        return expired + evicted
+
+    async def close(self):
+        def shutdown(conn: sqlite3.Connection):
+            conn.close()
+
+        if self._conn is not None:
+            await self._run(shutdown)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        # size/bytes는 이 worker의 마지막 쓰기 / sweep 시점 값 (다른 worker의 쓰기는 그때 반영)
+        return {
+            **super().stats(),
+            "path": self.path,
+            "size": self._size,
+            "bytes": self._bytes,
+        }
+
+
+class RedisAnswerStore(AnswerStore):
+    """
+    Store on a Redis-protocol server
+
+    TTL은 SET PX로 서버가 관리하고, 항목/메모리 한도는 서버의 maxmemory 정책을 따릅니다.
+    pop은 GETDEL(Redis 6.2+)을 쓰고, 지원하지 않는 서버에서는 MULTI/EXEC 안의 GET + DEL로 대신합니다.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "llm:answer:", **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.key_prefix = key_prefix
+        self._client = RedisClient(url)
+        self._getdel = True
+
+    def _key(self, conversation_id: str) -> str:
+        return f"{self.key_prefix}{conversation_id}"
+
+    async def put(self, conversation_id: str, answer: str):
+        size = _entry_size(conversation_id, answer)
+        if self._too_large(conversation_id, size):
+            return
+        await self._execute(
+            "SET",
+            self._key(conversation_id),
+            answer,
+            "PX",
+            int(self.ttl_seconds * 1000),
+        )
+
+    async def get(self, conversation_id: str) -> Optional[str]:
+        return self._decode(await self._execute("GET", self._key(conversation_id)))
+
+    async def pop(self, conversation_id: str) -> Optional[str]:
+        key = self._key(conversation_id)
+        if self._getdel:
+            try:
+                return self._decode(await self._client.execute("GETDEL", key))
+            except RedisReplyError as e:
+                if "unknown command" not in str(e).lower():
+                    self.errors += 1
+                    raise
+                logger.warning("Redis server has no GETDEL (needs 6.2+), using GET + DEL in MULTI/EXEC")
+                self._getdel = False
+            except RedisError:
+                self.errors += 1
+                raise
+        value, _ = await self._transaction(("GET", key), ("DEL", key))
+        return self._decode(value)
+
+    async def _execute(self, *args: Any) -> Any:
+        try:
+            return await self._client.execute(*args)
+        except RedisError:
+            self.errors += 1
+            raise
+
+    async def _transaction(self, *commands: Any) -> List[Any]:
+        try:
+            replies = await self._client.transaction(*commands)
+        except RedisError:
+            self.errors += 1
+            raise
+        for reply in replies:
+            if isinstance(reply, RedisReplyError):
+                self.errors += 1
+                raise reply
+        return replies
+
+    def _decode(self, value: Optional[bytes]) -> Optional[str]:
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode("utf-8")
+
+    async def close(self):
+        await self._client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "url": self.url}
+
+
+def create_answer_store() -> AnswerStore:
+    """Build the answer store selected by ANSWER_STORE_BACKEND"""
+    backend = os.getenv("ANSWER_STORE_BACKEND", "sqlite").lower()
+    limits = dict(
+        max_entries=int(os.getenv("ANSWER_STORE_MAX_ENTRIES", "10000")),
+        max_bytes=int(os.getenv("ANSWER_STORE_MAX_BYTES", str(32 * 1024 * 1024))),
+        ttl_seconds=float(os.getenv("ANSWER_STORE_TTL_SECONDS", "900")),
+        sweep_interval=float(os.getenv("ANSWER_STORE_SWEEP_INTERVAL", "60")),
+    )
+
+    if backend == "sqlite":
+        path = os.getenv("ANSWER_STORE_PATH", "/tmp/llm-backend-answers.db")
+        logger.info("Answer store: sqlite (%s)", path)
+        return SQLiteAnswerStore(path, **limits)
+    if backend == "redis":
+        url = os.getenv("ANSWER_STORE_REDIS_URL", "redis://localhost:6379/0")
+        logger.info("Answer store: redis (%s)", url)
+        return RedisAnswerStore(url, **limits)
+
+    logger.info("Answer store: memory (per worker)")
+    return MemoryAnswerStore(**limits)
@@ -1,82 +1,344 @@
+import asyncio
 import os
 import logging
+import random
+import time
 import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpen, RetryBudget
+from app.services.deadline import Deadline, DeadlineExceeded
+from app.services.http_clients import http_clients
+from app.services.micro_batcher import MicroBatcher
+from app.services import prometheus_metrics
 logger = logging.getLogger(__name__)
 
+# 서버가 요청을 처리하지 않았음이 확실한 실패 - POST도 안전하게 재시도 가능
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+RETRYABLE_STATUS_CODES = (429, 503)
+
 
 class APIBackendService:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.base_url = os.getenv("API_BACKEND_URL", "http://localhost:3001")
-        self.admin_password = os.getenv("ADMIN_PASSWORD", "panopticon")
-        self.timeout = 30.0
+        # AI 댓글 작성용 관리자 비밀번호 (설정하지 않으면 댓글 작성 비활성화)
+        self.admin_password = os.getenv("ADMIN_PASSWORD") or None
+        self.timeout = float(os.getenv("API_BACKEND_TIMEOUT", "30"))
+        # 주입된 클라이언트가 없으면 공유 레지스트리의 api-backend 클라이언트 사용
+        self._client = client
+
+        # 엔드포인트별 서킷 브레이커 (장애 시 30초 대기 대신 즉시 실패)
+        self.breakers = {
+            name: CircuitBreaker(
+                name,
+                window_seconds=float(os.getenv("API_BACKEND_BREAKER_WINDOW", "30")),
+                min_calls=int(os.getenv("API_BACKEND_BREAKER_MIN_CALLS", "10")),
+                error_rate_threshold=float(os.getenv("API_BACKEND_BREAKER_ERROR_RATE", "0.5")),
+                slow_call_seconds=float(os.getenv("API_BACKEND_BREAKER_SLOW_CALL_SECONDS", "5")),
+                slow_rate_threshold=float(os.getenv("API_BACKEND_BREAKER_SLOW_RATE", "0.5")),
+                open_seconds=float(os.getenv("API_BACKEND_BREAKER_OPEN_SECONDS", "15")),
+            )
+            for name in ("create_post", "create_comment")
+        }
+        # 모든 엔드포인트가 공유하는 재시도 예산
+        self.retry_budget = RetryBudget(
+            ratio=float(os.getenv("API_BACKEND_RETRY_BUDGET_RATIO", "0.2")),
+        )
+        self.max_retries = int(os.getenv("API_BACKEND_MAX_RETRIES", "2"))
+        self.retry_base_delay = float(os.getenv("API_BACKEND_RETRY_BASE_DELAY", "0.1"))
+        self.retries = 0
+
+        # AI 댓글은 짧은 창 동안 모아 /comments/bulk 로 한 번에 전송
+        # (bulk 엔드포인트가 없는 api-backend면 자동으로 개별 전송으로 전환)
+        self.comment_batching = (
+            os.getenv("API_BACKEND_COMMENT_BATCHING", "true").lower() == "true"
+        )
+        self.comment_batcher: MicroBatcher[Tuple[str, str, bool], bool] = MicroBatcher(
+            self._create_comments_bulk,
+            max_size=int(os.getenv("API_BACKEND_COMMENT_BATCH_SIZE", "20")),
+            window=float(os.getenv("API_BACKEND_COMMENT_BATCH_WINDOW_MS", "20")) / 1000,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        return http_clients.get("api-backend", self.base_url, self.timeout)
+
+    def _timeout(self, deadline: Optional[Deadline], stage: str) -> float:
+        """Per-call timeout shrunk to the remaining request budget"""
+        if deadline is None:
+            return self.timeout
+        return deadline.timeout(self.timeout, stage=stage)
+
+    async def _post(
+        self,
+        endpoint: str,
+        url: str,
+        payload: Dict[str, Any],
+        deadline: Optional[Deadline],
+    ) -> httpx.Response:
+        """
+        POST through the endpoint's circuit breaker
+
+        - 서버가 받지 않은 것이 확실한 실패(연결 실패, 429/503)만 jitter 백오프로 재시도
+        - 재시도는 전체 재시도 예산 안에서만
+        Raises: CircuitOpen, DeadlineExceeded, httpx errors
+        """
+        breaker = self.breakers[endpoint]
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            timeout = self._timeout(deadline, endpoint)
+            # 요청 예산 때문에 줄어든 timeout - 이때의 시간 초과는 업스트림 장애가 아님
+            shortened = timeout < self.timeout
+            breaker.allow()
+
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(url, json=payload, timeout=timeout)
+            except httpx.TimeoutException as e:
+                elapsed = time.perf_counter() - started
+                prometheus_metrics.observe_api_backend(endpoint, type(e).__name__, elapsed)
+                if shortened and deadline is not None:
+                    # 호출자의 짧은 예산이 공유 브레이커를 열지 않도록 집계하지 않음
+                    breaker.release()
+                    raise DeadlineExceeded(
+                        f"request deadline of {deadline.budget:.2f}s exceeded during {endpoint}"
+                    ) from e
+                breaker.record(False, elapsed)
+                if not isinstance(e, RETRYABLE_ERRORS) or not self._should_retry(
+                    attempt, deadline
+                ):
+                    raise
+            except RETRYABLE_ERRORS as e:
+                elapsed = time.perf_counter() - started
+                breaker.record(False, elapsed)
+                prometheus_metrics.observe_api_backend(endpoint, type(e).__name__, elapsed)
+                if not self._should_retry(attempt, deadline):
+                    raise
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                breaker.record(False, elapsed)
+                prometheus_metrics.observe_api_backend(endpoint, type(e).__name__, elapsed)
+                raise
+            else:
+                elapsed = time.perf_counter() - started
+                # 4xx는 업스트림이 정상 응답한 것이므로 성공으로 집계
+                breaker.record(response.status_code < 500, elapsed)
+                prometheus_metrics.observe_api_backend(
+                    endpoint, str(response.status_code), elapsed
+                )
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+                if not retryable or not self._should_retry(attempt, deadline):
+                    return response
+
+            attempt += 1
+            self.retries += 1
+            delay = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+            logger.warning("Retrying %s (attempt %s) in %.2fs", endpoint, attempt + 1, delay)
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _raise_if_expired(deadline: Optional[Deadline], stage: str, error: BaseException):
+        """The budget ran out inside the call - report a deadline, not an upstream failure"""
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(
+                f"request deadline of {deadline.budget:.2f}s exceeded during {stage}"
+            ) from error
+
+    def _should_retry(self, attempt: int, deadline: Optional[Deadline]) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        if deadline is not None and deadline.remaining() < self.retry_base_delay * (2 ** (attempt + 1)):
+            return False
+        return self.retry_budget.try_acquire()
 
     async def create_post(
         self,
         content: str,
         email: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Create a post in API Backend
         Returns: {"id": "post-uuid", "message": "..."}
+        Raises: DeadlineExceeded if the request budget is already used up
         """
+        if deadline is not None:
+            deadline.check("create_post")
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "content": content,
-                }
+            payload = {
+                "content": content,
+            }
 
-                if email:
-                    payload["email"] = email
+            if email:
+                payload["email"] = email
 
-                response = await client.post(f"{self.base_url}/posts", json=payload)
+            response = await self._post(
+                "create_post", f"{self.base_url}/posts", payload, deadline
+            )
 
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    # API returns { id (UUID), postId (number), message }
-                    return {
-                        "id": data.get("id"),  # UUID for comment creation
-                        "postId": data.get("postId"),  # Display number for user
-                        "message": data.get("message", "글이 작성되었습니다"),
-                    }
-                else:
-                    logger.error(
-                        f"Failed to create post: {response.status_code} - {response.text}"
-                    )
-                    return None
+            if response.status_code in [200, 201]:
+                data = response.json()
+                # API returns { id (UUID), postId (number), message }
+                return {
+                    "id": data.get("id"),  # UUID for comment creation
+                    "postId": data.get("postId"),  # Display number for user
+                    "message": data.get("message", "글이 작성되었습니다"),
+                }
+            else:
+                logger.error(
+                    "Failed to create post: %s - %s", response.status_code, response.text
+                )
+                return None
 
+        except DeadlineExceeded:
+            raise
+        except CircuitOpen as e:
+            logger.warning("Skipping create_post: %s", e)
+            return None
         except Exception as e:
-            logger.error(f"Error creating post: {e}", exc_info=True)
+            self._raise_if_expired(deadline, "create_post", e)
+            logger.error("Error creating post: %s", e, exc_info=True)
             return None
 
     async def create_comment(
-        self, post_id: str, content: str, is_ai_generated: bool = True
+        self,
+        post_id: str,
+        content: str,
+        is_ai_generated: bool = True,
+        deadline: Optional[Deadline] = None,
     ) -> bool:
         """
         Create a comment on a post
         Returns: True if successful, False otherwise
+        Raises: DeadlineExceeded if the request budget is already used up
         """
+        if deadline is not None:
+            deadline.check("create_comment")
+        if not self.admin_password:
+            logger.error("ADMIN_PASSWORD is not set, cannot create comment on post %s", post_id)
+            return False
+        if not self.comment_batching:
+            return await self._create_comment_single(
+                post_id, content, is_ai_generated, deadline
+            )
+
+        future = self.comment_batcher.submit((post_id, content, is_ai_generated))
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "content": content,
-                    "adminPassword": self.admin_password,
-                    "isAiGenerated": is_ai_generated,
-                }
+            # 시간 초과 시 future가 취소되어 아직 전송 전이면 배치에서 빠짐
+            return await asyncio.wait_for(
+                future, deadline.timeout(self.timeout) if deadline else self.timeout
+            )
+        except asyncio.TimeoutError as e:
+            self._raise_if_expired(deadline, "create_comment", e)
+            logger.error("Timed out waiting for batched comment on post %s", post_id)
+            return False
+        except CircuitOpen as e:
+            logger.warning("Skipping create_comment: %s", e)
+            return False
+        except Exception as e:
+            self._raise_if_expired(deadline, "create_comment", e)
+            logger.error("Error creating comment: %s", e, exc_info=True)
+            return False
+
+    async def _create_comment_single(
+        self,
+        post_id: str,
+        content: str,
+        is_ai_generated: bool,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        try:
+            payload = {
+                "content": content,
+                "adminPassword": self.admin_password,
+                "isAiGenerated": is_ai_generated,
+            }
+
+            response = await self._post(
+                "create_comment",
+                f"{self.base_url}/posts/{post_id}/comments",
+                payload,
+                deadline,
+            )
 
-                response = await client.post(
-                    f"{self.base_url}/posts/{post_id}/comments", json=payload
+            if response.status_code in [200, 201]:
+                return True
+            else:
+                logger.error(
+                    "Failed to create comment: %s - %s", response.status_code, response.text
                 )
+                return False
 
-                if response.status_code in [200, 201]:
-                    return True
-                else:
+        except DeadlineExceeded:
+            raise
+        except CircuitOpen as e:
+            logger.warning("Skipping create_comment: %s", e)
+            return False
+        except Exception as e:
+            self._raise_if_expired(deadline, "create_comment", e)
+            logger.error("Error creating comment: %s", e, exc_info=True)
+            return False
+
+    async def _create_comments_bulk(self, items: List[Tuple[str, str, bool]]) -> List[bool]:
+        """Flush a comment batch through POST /comments/bulk; results in item order"""
+        payload = {
+            "adminPassword": self.admin_password,
+            "items": [
+                {"postId": post_id, "content": content, "isAiGenerated": is_ai_generated}
+                for post_id, content, is_ai_generated in items
+            ],
+        }
+        response = await self._post(
+            "create_comment", f"{self.base_url}/comments/bulk", payload, None
+        )
+
+        if response.status_code == 404:
+            # bulk 엔드포인트가 없는 이전 버전 api-backend
+            logger.warning("api-backend has no /comments/bulk, disabling comment batching")
+            self.comment_batching = False
+            return list(
+                await asyncio.gather(
+                    *(self._create_comment_single(*item) for item in items)
+                )
+            )
+
+        if response.status_code not in [200, 201]:
+            logger.error(
+                "Failed to create comments in bulk: %s - %s", response.status_code, response.text
+            )
+            return [False] * len(items)
+
+        results = [False] * len(items)
+        for result in response.json().get("results", []):
+            index = result.get("index")
+            if isinstance(index, int) and 0 <= index < len(items):
+                results[index] = bool(result.get("id"))
+                if not result.get("id"):
                     logger.error(
-                        f"Failed to create comment: {response.status_code} - {response.text}"
+                        "Failed to create comment on post %s: %s",
+                        items[index][0],
+                        result.get("error"),
                     )
-                    return False
+        return results
 
-        except Exception as e:
-            logger.error(f"Error creating comment: {e}", exc_info=True)
-            return False
+    async def warm_up(self):
+        """Open a pooled keep-alive connection to api-backend before the first real call"""
+        # 응답 코드와 무관하게 연결만 맺어 두면 됨
+        await self.client.get(f"{self.base_url}/", timeout=self.timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Circuit breaker, retry budget and comment batching state"""
+        return {
+            "breakers": {name: breaker.stats() for name, breaker in self.breakers.items()},
+            "retry_budget": self.retry_budget.stats(),
+            "retries": self.retries,
+            "comment_batching": self.comment_batching,
+            "comment_batcher": self.comment_batcher.stats(),
+        }
+
+    async def close(self):
+        """Flush pending comment batches (call on app shutdown)"""
+        await self.comment_batcher.close()
@@ -0,0 +1,294 @@
+"""
+Bedrock runtime 백엔드
+- BotoBedrockBackend: 실제 AWS Bedrock (boto3 bedrock-runtime)
+- LocalBedrockBackend: AWS 없이 용량 테스트를 위한 로컬 대역
+  (지연 분포, 토큰 속도 스트리밍, throttling, 답변 길이 편차 재현)
+
+모든 메서드는 동기(blocking)이며 BedrockService의 executor 스레드에서 호출됩니다.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from botocore.exceptions import ClientError
+
+
+class BedrockBackend:
+    """Synchronous Bedrock runtime interface"""
+
+    name = "base"
+
+    def invoke_model(self, model_id: str, body: str) -> Dict[str, Any]:
+        """Return the decoded response body of InvokeModel"""
+        raise NotImplementedError
+
+    def invoke_model_stream(self, model_id: str, body: str) -> Iterator[Dict[str, Any]]:
+        """Yield decoded chunk payloads of InvokeModelWithResponseStream"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Do expensive one-time setup ahead of the first call"""
+
+
+class BotoBedrockBackend(BedrockBackend):
+    name = "bedrock"
+
+    def __init__(self, client_factory: Callable[[], Any]):
+        # boto3 client 생성(서비스 모델 로딩, 자격 증명 확인)은 첫 호출 또는 warm-up 때
+        self._client_factory = client_factory
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def warm_up(self):
+        self.client
+
+    def invoke_model(self, model_id: str, body: str) -> Dict[str, Any]:
+        response = self.client.invoke_model(modelId=model_id, body=body)
+        return json.loads(response["body"].read())
+
+    def invoke_model_stream(self, model_id: str, body: str) -> Iterator[Dict[str, Any]]:
+        response = self.client.invoke_model_with_response_stream(
+            modelId=model_id, body=body
+        )
+        stream = response["body"]
+        try:
+            for event in stream:
+                chunk = event.get("chunk")
+                if chunk:
+                    yield json.loads(chunk["bytes"])
+        finally:
+            stream.close()
+
+
+# 로컬 대역 답변 생성용 문장 (토큰 ≈ 어절)
+_FILLER = (
+    "로그 수집은 애플리케이션과 인프라에서 발생하는 이벤트를 중앙에 모아 "
+    "검색과 분석이 가능하도록 만드는 과정입니다. 분산 추적은 요청이 여러 "
+    "서비스를 거치는 경로를 span 단위로 기록하여 병목 구간을 찾도록 돕습니다. "
+    "메트릭은 지연 시간과 에러율, 처리량을 시계열로 집계하여 이상 징후를 "
+    "빠르게 감지할 수 있게 합니다."
+).split()
+
+# Anthropic prompt cache TTL (ephemeral = 5분)
+_PROMPT_CACHE_TTL = 300.0
+
+
+def _throttle(operation: str) -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": "ThrottlingException", "Message": "Too many requests"},
+            "ResponseMetadata": {"HTTPStatusCode": 429},
+        },
+        operation,
+    )
+
+
+class LocalBedrockBackend(BedrockBackend):
+    """
+    In-process Bedrock stand-in
+
+    - 첫 토큰 지연: log-normal 분포 (중앙값 first_token_ms, 편차 latency_sigma)
+    - 출력: min~max_output_tokens 사이 길이, tokens_per_second 속도로 생성
+    - throttling: throttle_rate 확률 또는 max_concurrency 초과 시 ThrottlingException
+    - usage: input/output 토큰과 prompt caching 필드를 실제 응답과 같은 형식으로 반환
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        first_token_ms: float = 400.0,
+        latency_sigma: float = 0.4,
+        tokens_per_second: float = 80.0,
+        min_output_tokens: int = 120,
+        max_output_tokens: int = 480,
+        throttle_rate: float = 0.0,
+        max_concurrency: int = 0,
+        stream_chunk_tokens: int = 4,
+        seed: Optional[int] = None,
+    ):
+        self.first_token_ms = first_token_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.min_output_tokens = min_output_tokens
+        self.max_output_tokens = max_output_tokens
+        self.throttle_rate = throttle_rate
+        self.max_concurrency = max_concurrency
+        self.stream_chunk_tokens = max(1, stream_chunk_tokens)
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._prompt_cache: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "LocalBedrockBackend":
+        seed = os.getenv("LOCAL_BEDROCK_SEED")
+        return cls(
+            first_token_ms=float(os.getenv("LOCAL_BEDROCK_FIRST_TOKEN_MS", "400")),
+            latency_sigma=float(os.getenv("LOCAL_BEDROCK_LATENCY_SIGMA", "0.4")),
+            tokens_per_second=float(os.getenv("LOCAL_BEDROCK_TOKENS_PER_SEC", "80")),
+            min_output_tokens=int(os.getenv("LOCAL_BEDROCK_MIN_OUTPUT_TOKENS", "120")),
+            max_output_tokens=int(os.getenv("LOCAL_BEDROCK_MAX_OUTPUT_TOKENS", "480")),
+            throttle_rate=float(os.getenv("LOCAL_BEDROCK_THROTTLE_RATE", "0")),
+            max_concurrency=int(os.getenv("LOCAL_BEDROCK_MAX_CONCURRENCY", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+    def invoke_model(self, model_id: str, body: str) -> Dict[str, Any]:
+        request = self._admit(model_id, body, "InvokeModel")
+        try:
+            output_tokens, usage = self._plan(request)
+            time.sleep(self._first_token_delay() + output_tokens / self.tokens_per_second)
+            return {
+                "id": f"msg_local_{uuid.uuid4().hex[:12]}",
+                "type": "message",
+                "role": "assistant",
+                "model": model_id,
+                "content": [{"type": "text", "text": self._text(output_tokens)}],
+                "stop_reason": "end_turn",
+                "usage": {**usage, "output_tokens": output_tokens},
+            }
+        finally:
+            self._leave()
+
+    def invoke_model_stream(self, model_id: str, body: str) -> Iterator[Dict[str, Any]]:
+        request = self._admit(model_id, body, "InvokeModelWithResponseStream")
+        try:
+            output_tokens, usage = self._plan(request)
+            time.sleep(self._first_token_delay())
+            yield {
+                "type": "message_start",
+                "message": {
+                    "id": f"msg_local_{uuid.uuid4().hex[:12]}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": model_id,
+                    "content": [],
+                    "usage": {**usage, "output_tokens": 1},
+                },
+            }
+            yield {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""},
+            }
+
+            words = self._text(output_tokens).split(" ")
+            step = self.stream_chunk_tokens
+            for i in range(0, len(words), step):
+                time.sleep(step / self.tokens_per_second)
+                text = " ".join(words[i : i + step])
+                if i + step < len(words):
+                    text += " "
+                yield {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": text},
+                }
+
+            yield {"type": "content_block_stop", "index": 0}
+            yield {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"output_tokens": output_tokens},
+            }
+            yield {"type": "message_stop"}
+        finally:
+            self._leave()
+
+    def _admit(self, model_id: str, body: str, operation: str) -> Dict[str, Any]:
+        if not model_id.startswith("anthropic."):
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": "ValidationException",
+                        "Message": f"The provided model identifier is invalid: {model_id}",
+                    },
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                operation,
+            )
+
+        with self._lock:
+            if self.max_concurrency and self._active >= self.max_concurrency:
+                raise _throttle(operation)
+            if self.throttle_rate and self._rng.random() < self.throttle_rate:
+                raise _throttle(operation)
+            self._active += 1
+        return json.loads(body)
+
+    def _leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def _first_token_delay(self) -> float:
+        with self._lock:
+            factor = self._rng.lognormvariate(0.0, self.latency_sigma)
+        return self.first_token_ms * factor / 1000
+
+    def _plan(self, request: Dict[str, Any]):
+        """Pick an output length and build the usage block for a request"""
+        system = request.get("system") or ""
+        cacheable = isinstance(system, list) and any(
+            block.get("cache_control") for block in system
+        )
+        system_text = (
+            "".join(block.get("text", "") for block in system)
+            if isinstance(system, list)
+            else system
+        )
+        message_text = "".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in request.get("messages", [])
+        )
+
+        system_tokens = _estimate_tokens(system_text)
+        usage = {
+            "input_tokens": _estimate_tokens(message_text),
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
+        if cacheable:
+            key = hashlib.sha256(system_text.encode("utf-8")).hexdigest()
+            now = time.monotonic()
+            with self._lock:
+                seen = self._prompt_cache.get(key)
+                self._prompt_cache[key] = now
+            if seen is not None and now - seen < _PROMPT_CACHE_TTL:
+                usage["cache_read_input_tokens"] = system_tokens
+            else:
+                usage["cache_creation_input_tokens"] = system_tokens
+        else:
+            usage["input_tokens"] += system_tokens
+
+        max_tokens = int(request.get("max_tokens") or self.max_output_tokens)
+        with self._lock:
+            output_tokens = self._rng.randint(
+                min(self.min_output_tokens, max_tokens),
+                min(self.max_output_tokens, max_tokens),
+            )
+        return output_tokens, usage
+
+    @staticmethod
+    def _text(tokens: int) -> str:
+        return " ".join(_FILLER[i % len(_FILLER)] for i in range(tokens))
+
+
+def _estimate_tokens(text: str) -> int:
+    # 한글 위주 텍스트 기준 대략 2.5자 = 1토큰
+    return max(1, math.ceil(len(text) / 2.5))
@@ -0,0 +1,237 @@
+"""
+Bedrock 멀티 리전 / 멀티 모델 라우팅
+- 엔드포인트별 최근 지연 시간 분위수 추적
+- 첫 요청이 지연 임계값을 넘으면 다른 엔드포인트로 hedged 요청 (먼저 끝난 쪽 채택, 나머지 취소)
+- 에러가 난 엔드포인트는 다음 엔드포인트로 failover, 연속 실패 시 잠시 제외
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from app.services.adaptive_limiter import AdaptiveLimiter
+from app.services.bedrock_backends import BedrockBackend
+from app.services.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StreamInterrupted(Exception):
+    """A streamed call failed after part of its output was already delivered"""
+
+
+class BedrockEndpoint:
+    """One region/model target with its own backend, limiter and latency window"""
+
+    def __init__(
+        self,
+        region: str,
+        model_id: str,
+        backend: BedrockBackend,
+        limiter: AdaptiveLimiter,
+        window: int = 200,
+    ):
+        self.region = region
+        self.model_id = model_id
+        self.backend = backend
+        self.limiter = limiter
+        self.name = f"{region}/{model_id}"
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self.successes += 1
+        self.consecutive_failures = 0
+
+    def record_failure(self, max_failures: int, cooldown: float):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            self.unhealthy_until = time.monotonic() + cooldown
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "name": self.name,
+            "region": self.region,
+            "model_id": self.model_id,
+            "healthy": self.healthy,
+            "successes": self.successes,
+            "failures": self.failures,
+            "samples": self.samples,
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "limiter": self.limiter.stats(),
+        }
+
+
+class BedrockRouter:
+    """Pick endpoints by recent latency, hedge slow calls and fail over on errors"""
+
+    def __init__(
+        self,
+        endpoints: List[BedrockEndpoint],
+        hedge_after: Optional[float] = None,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        max_failures: int = 3,
+        failure_cooldown: float = 30.0,
+    ):
+        if not endpoints:
+            raise ValueError("BedrockRouter needs at least one endpoint")
+        self.endpoints = endpoints
+        # 고정 hedge 지연 (초). None이면 primary의 hedge_percentile 지연 사용
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_failures = max_failures
+        self.failure_cooldown = failure_cooldown
+
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    @property
+    def primary(self) -> BedrockEndpoint:
+        return self.ordered()[0]
+
+    def ordered(self) -> List[BedrockEndpoint]:
+        """Healthy endpoints first, fastest p50 first (config order for unmeasured ones)"""
+
+        def rank(item):
+            index, endpoint = item
+            p50 = (
+                endpoint.percentile(50)
+                if endpoint.samples >= self.hedge_min_samples
+                else None
+            )
+            return (not endpoint.healthy, p50 is None, p50 or 0.0, index)
+
+        return [endpoint for _, endpoint in sorted(enumerate(self.endpoints), key=rank)]
+
+    def _hedge_delay(self, endpoint: BedrockEndpoint) -> Optional[float]:
+        if len(self.endpoints) < 2:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if endpoint.samples < self.hedge_min_samples:
+            return None
+        return endpoint.percentile(self.hedge_percentile)
+
+    async def invoke(
+        self, call: Callable[[BedrockEndpoint], Awaitable[T]], hedge: bool = True
+    ) -> T:
+        """
+        Run call(endpoint) on the best endpoint
+
+        - primary가 hedge 지연을 넘기면 다음 엔드포인트로 한 번 더 요청 (hedge=False면 생략)
+        - 실패하면 남은 엔드포인트로 failover (StreamInterrupted는 제외)
+        - 먼저 성공한 결과를 반환하고 나머지는 취소
+        """
+        candidates = self.ordered()
+        primary = candidates[0]
+        pending = candidates[1:]
+        hedge_delay = self._hedge_delay(primary) if hedge else None
+
+        tasks: Dict["asyncio.Task[Any]", BedrockEndpoint] = {}
+
+        def start(endpoint: BedrockEndpoint):
+            tasks[asyncio.ensure_future(self._timed(endpoint, call))] = endpoint
+
+        start(primary)
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                timeout = hedge_delay if (not hedged and pending) else None
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedged = True
+                    self.hedges += 1
+                    endpoint = pending.pop(0)
+                    logger.info(
+                        "Hedging Bedrock request to %s after %.2fs", endpoint.name, timeout
+                    )
+                    start(endpoint)
+                    continue
+
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if endpoint is not primary:
+                            self.hedge_wins += hedged
+                        return task.result()
+
+                    last_error = error
+                    if isinstance(error, DeadlineExceeded):
+                        # 예산 소진은 다른 엔드포인트로 넘겨도 소용없음
+                        continue
+                    endpoint.record_failure(self.max_failures, self.failure_cooldown)
+                    if isinstance(error, StreamInterrupted):
+                        # 이미 전달한 출력이 있어 다른 엔드포인트에서 다시 시작하면 중복됨
+                        continue
+                    if pending and not tasks:
+                        self.failovers += 1
+                        next_endpoint = pending.pop(0)
+                        logger.warning(
+                            "Bedrock endpoint %s failed (%s), failing over to %s",
+                            endpoint.name,
+                            error,
+                            next_endpoint.name,
+                        )
+                        start(next_endpoint)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        assert last_error is not None
+        raise last_error
+
+    async def _timed(
+        self, endpoint: BedrockEndpoint, call: Callable[[BedrockEndpoint], Awaitable[T]]
+    ) -> T:
+        started = time.perf_counter()
+        result = await call(endpoint)
+        endpoint.record_success(time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_after_ms": round(self.hedge_after * 1000, 1)
+            if self.hedge_after is not None
+            else None,
+            "hedge_percentile": self.hedge_percentile,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "endpoints": [endpoint.stats() for endpoint in self.ordered()],
+        }
@@ -1,19 +1,61 @@
 import json
 import os
 import logging
+import time
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-import boto3
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 import asyncio
 import random
 import httpx
 
+from app.services.adaptive_limiter import (
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_THROTTLED,
+    AdaptiveLimiter,
+    LimiterRejected,
+)
+from app.services.bedrock_backends import (
+    BedrockBackend,
+    BotoBedrockBackend,
+    LocalBedrockBackend,
+)
+from app.services.deadline import DEFAULT_DEADLINE_SECONDS, Deadline, DeadlineExceeded
+from app.services import prometheus_metrics
+from app.services.usage_meter import (
+    CACHE_READ_PRICE_RATIO,
+    CACHE_WRITE_PRICE_RATIO,
+    usage_meter,
+)
+from app.services.bedrock_router import BedrockEndpoint, BedrockRouter, StreamInterrupted
+from app.services.cache_snapshot import CacheSnapshot
+from app.services.response_cache import ResponseCache, prompt_hash
+from app.services.single_flight import SingleFlight
+
 # Load .env as early as possible
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# MOCK 모드 스트리밍 청크 크기 / 간격
+MOCK_STREAM_CHUNK_SIZE = 16
+MOCK_STREAM_CHUNK_DELAY = 0.02
+
+_STREAM_END = object()
+
+# 동시성 축소 + 재시도 대상 Bedrock 에러 코드
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
 
 class BedrockService:
     def __init__(self):
@@ -22,38 +64,202 @@ class BedrockService:
             "AWS_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0"
         )
         self.use_mock = os.getenv("USE_MOCK_AI", "false").lower() == "true"
+        # bedrock: 실제 AWS Bedrock / local: 로컬 대역 (지연·throttling 재현)
+        self.backend_name = os.getenv("BEDROCK_BACKEND", "bedrock").lower()
+        # 로컬 stub 등 다른 Bedrock 엔드포인트로 보낼 때 사용
+        self.endpoint_url = os.getenv("BEDROCK_ENDPOINT_URL") or None
+        # system_prompt.txt를 캐시 가능한 prefix로 표시 (Bedrock prompt caching)
+        self.prompt_caching = (
+            os.getenv("BEDROCK_PROMPT_CACHING", "true").lower() == "true"
+        )
+        # 응답 길이 상한 (/llm/admin/usage의 truncated, avg_output_tokens를 보고 조정)
+        self.max_tokens = int(os.getenv("BEDROCK_MAX_TOKENS", "1024"))
 
-        if not self.use_mock:
-            aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-            aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+        # boto3는 동기 클라이언트이므로 전용 executor에서 호출 (이벤트 루프 블로킹 방지)
+        self.max_workers = int(os.getenv("BEDROCK_MAX_WORKERS", "16"))
+        self.max_concurrency = int(
+            os.getenv("BEDROCK_MAX_CONCURRENCY", str(self.max_workers))
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="bedrock"
+        )
+        self.min_concurrency = int(os.getenv("BEDROCK_MIN_CONCURRENCY", "1"))
+        # throttling 재시도 (요청 deadline 내에서 jitter backoff)
+        # 공유 생성 예산 - 기본값은 요청 예산 기본값 (공유 생성이 그 요청보다 오래 살지 않도록)
+        self.request_deadline = float(
+            os.getenv("BEDROCK_REQUEST_DEADLINE", str(DEFAULT_DEADLINE_SECONDS))
+        )
+        self.max_retries = int(os.getenv("BEDROCK_MAX_RETRIES", "4"))
+        self.retry_base_delay = float(os.getenv("BEDROCK_RETRY_BASE_DELAY", "0.2"))
+        self.retry_max_delay = float(os.getenv("BEDROCK_RETRY_MAX_DELAY", "4"))
+        self._stats: Dict[str, Any] = {
+            "calls": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "waiting": 0,
+            "queue_wait_total_ms": 0.0,
+            "queue_wait_max_ms": 0.0,
+            "retries": 0,
+        }
+        self._usage: Dict[str, int] = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+        }
 
-            if not aws_access_key or not aws_secret_key:
-                error_msg = (
-                    "AWS credentials not found! Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY "
-                    "in .env file, or set USE_MOCK_AI=true for testing."
-                )
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+        if self.use_mock:
+            self.router: Optional[BedrockRouter] = None
+            logger.info("Running in MOCK mode - no AWS credentials needed")
+        else:
+            # 리전/모델별 엔드포인트 (BEDROCK_ENDPOINTS 미설정 시 AWS_REGION/AWS_MODEL_ID 하나)
+            hedge_after_ms = os.getenv("BEDROCK_HEDGE_AFTER_MS")
+            self.router = BedrockRouter(
+                [
+                    self._create_endpoint(region, model_id)
+                    for region, model_id in self._endpoint_specs()
+                ],
+                hedge_after=float(hedge_after_ms) / 1000 if hedge_after_ms else None,
+                hedge_percentile=float(os.getenv("BEDROCK_HEDGE_PERCENTILE", "95")),
+            )
 
-            try:
-                self.client = boto3.client(
-                    "bedrock-runtime",
-                    region_name=self.region,
-                    aws_access_key_id=aws_access_key,
-                    aws_secret_access_key=aws_secret_key,
-                )
-                logger.info(
-                    f"베드락 client initialized with credentials from environment variables (region: {self.region})"
+        self.system_prompt = self._load_system_prompt()
+        self.system_prompt_hash = prompt_hash(self.system_prompt)
+
+        # 정규화된 질문 기준 답변 캐시 (ANSWER_CACHE_ENABLED=false로 비활성화)
+        self.cache_enabled = (
+            os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+        )
+        self.response_cache = ResponseCache(
+            max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+        )
+        # 재시작 후 warm start용 디스크 스냅샷 (ANSWER_CACHE_SNAPSHOT_DIR 비우면 비활성화)
+        snapshot_dir = os.getenv("ANSWER_CACHE_SNAPSHOT_DIR", "/tmp/llm-backend-cache")
+        self.cache_snapshot: Optional[CacheSnapshot] = None
+        if self.cache_enabled and snapshot_dir:
+            self.cache_snapshot = CacheSnapshot(
+                self.response_cache,
+                snapshot_dir,
+                self.model_id,
+                self.system_prompt_hash,
+                interval=float(os.getenv("ANSWER_CACHE_SNAPSHOT_INTERVAL", "60")),
+            )
+        # 동일 질문 동시 요청은 하나의 Bedrock 호출을 공유
+        self._inflight = SingleFlight()
+
+    @property
+    def client(self) -> Any:
+        """boto3 client of the primary endpoint (created on first access)"""
+        if self.router is None:
+            return None
+        return getattr(self.router.primary.backend, "client", None)
+
+    async def warm_up(self, invoke: bool = False):
+        """
+        Prepare endpoints before taking traffic
+
+        boto3 client를 미리 만들고, invoke=True면 엔드포인트마다 1토큰 요청을 보내
+        TLS 연결과 system prompt 캐시(prompt caching)를 미리 데워 둡니다 (토큰 과금 발생).
+        """
+        if self.router is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, endpoint.backend.warm_up)
+                for endpoint in self.router.endpoints
+            )
+        )
+        if not invoke:
+            return
+
+        body = self._build_request_body("ping", max_tokens=1)
+        responses = await asyncio.gather(
+            *(
+                self._call_bedrock(
+                    endpoint, endpoint.backend.invoke_model, endpoint.model_id, body
                 )
-            except Exception as e:
-                error_msg = f"Failed to initialize Bedrock client: {e}"
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
+                for endpoint in self.router.endpoints
+            )
+        )
+        for endpoint, response_body in zip(self.router.endpoints, responses):
+            self._record_usage(endpoint.model_id, response_body.get("usage"))
+
+    def _endpoint_specs(self) -> List[Tuple[str, str]]:
+        """Parse BEDROCK_ENDPOINTS ("region=model_id,region=model_id")"""
+        raw = os.getenv("BEDROCK_ENDPOINTS", "").strip()
+        if not raw:
+            return [(self.region, self.model_id)]
+
+        specs = []
+        for item in raw.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            region, _, model_id = item.partition("=")
+            specs.append((region.strip(), model_id.strip() or self.model_id))
+        return specs
+
+    def _create_endpoint(self, region: str, model_id: str) -> BedrockEndpoint:
+        if self.backend_name == "local":
+            backend: BedrockBackend = LocalBedrockBackend.from_env()
+            logger.info(
+                "Running with local Bedrock stand-in for %s/%s - no AWS credentials needed",
+                region,
+                model_id,
+            )
         else:
-            self.client = None
-            logger.info("Running in MOCK mode - no AWS credentials needed")
+            self._check_credentials()
+            backend = BotoBedrockBackend(lambda: self._create_boto_client(region))
 
-        self.system_prompt = self._load_system_prompt()
+        # throttling에 따라 허용 동시성을 조절 (AIMD, 리전별 quota)
+        limiter = AdaptiveLimiter(
+            max_limit=self.max_concurrency, min_limit=self.min_concurrency
+        )
+        return BedrockEndpoint(region, model_id, backend, limiter)
+
+    def _check_credentials(self):
+        """Fail fast at startup when AWS credentials are missing (the client itself is lazy)"""
+        if not os.getenv("AWS_ACCESS_KEY_ID") or not os.getenv("AWS_SECRET_ACCESS_KEY"):
+            error_msg = (
+                "AWS credentials not found! Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY "
+                "in .env file, or set USE_MOCK_AI=true for testing."
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+    def _create_boto_client(self, region: str) -> Any:
+        aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
+        aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+
+        # boto3 import와 client 생성은 첫 사용 시점까지 지연 (import/시작 시간 단축)
+        import boto3
+        from botocore.config import Config
+
+        try:
+            client = boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                endpoint_url=self.endpoint_url,
+                aws_access_key_id=aws_access_key,
+                aws_secret_access_key=aws_secret_key,
+                config=Config(
+                    max_pool_connections=self.max_workers,
+                    # throttling 재시도는 limiter가 직접 처리
+                    retries={"max_attempts": 1, "mode": "standard"},
+                ),
+            )
+            logger.info(
+                "베드락 client initialized with credentials from environment variables (region: %s)",
+                region,
+            )
+            return client
+        except Exception as e:
+            error_msg = f"Failed to initialize Bedrock client: {e}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
 
     def _load_system_prompt(self) -> str:
         """Load system prompt from system_prompt.txt"""
@@ -62,9 +268,269 @@ class BedrockService:
             with open(prompt_path, "r", encoding="utf-8") as f:
                 return f.read()
         except Exception as e:
-            logger.error(f"Failed to load system_prompt.txt: {e}")
+            logger.error("Failed to load system_prompt.txt: %s", e)
             return "당신은 로그 수집 서비스 전문가입니다."
 
+    async def _call_bedrock(
+        self,
+        endpoint: BedrockEndpoint,
+        fn: Callable[..., Any],
+        *args,
+        deadline: Optional[Deadline] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run a blocking boto3 call on the Bedrock executor
+
+        동시 호출 수는 엔드포인트별 AdaptiveLimiter로 제한되며 (최대 BEDROCK_MAX_CONCURRENCY),
+        limiter + executor 대기 시간을 queue wait로 기록합니다.
+        deadline이 주어지면 슬롯 대기와 호출 모두 남은 예산 안에서만 기다립니다
+        (슬롯을 얻지 못하면 LimiterRejected, 호출이 늦으면 DeadlineExceeded).
+        """
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.perf_counter()
+
+        self._stats["waiting"] += 1
+        prometheus_metrics.BEDROCK_WAITING.inc()
+        try:
+            await endpoint.limiter.acquire(
+                deadline.timeout(stage="Bedrock slot") if deadline else None
+            )
+        finally:
+            self._stats["waiting"] -= 1
+            prometheus_metrics.BEDROCK_WAITING.dec()
+
+        # executor 스레드에서 실제 호출이 시작된 시각 (호출 지연 = 이후 경과 시간)
+        call_started: List[float] = []
+
+        def run():
+            call_started.append(time.perf_counter())
+            # _stats는 이벤트 루프에서만 갱신 (executor 스레드끼리 경쟁하지 않도록)
+            try:
+                loop.call_soon_threadsafe(
+                    self._record_queue_wait, endpoint, call_started[0] - enqueued_at
+                )
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 (종료 중)
+                pass
+            return fn(*args, **kwargs)
+
+        # 트레이스 컨텍스트가 executor 스레드로 전달되도록 contextvars 복사
+        ctx = contextvars.copy_context()
+
+        self._stats["in_flight"] += 1
+        self._stats["calls"] += 1
+        prometheus_metrics.BEDROCK_IN_FLIGHT.inc()
+        try:
+            call = self._executor.submit(ctx.run, run)
+        except BaseException:
+            self._finish_call(endpoint, None, call_started)
+            raise
+
+        # 슬롯 반환 / 결과 기록은 요청이 포기한 시점이 아니라 스레드의 호출이 실제로 끝난 시점에
+        # (deadline 초과 후에도 boto 호출은 계속 실행되므로 먼저 반환하면 실제 동시 호출이 limit을 넘음)
+        def on_done(done_call: "Future[Any]"):
+            try:
+                loop.call_soon_threadsafe(self._finish_call, endpoint, done_call, call_started)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 (종료 중)
+                pass
+
+        call.add_done_callback(on_done)
+        # 취소 시 아직 시작 전인 호출만 실제로 취소됨 (실행 중이면 끝날 때 on_done)
+        future = asyncio.wrap_future(call, loop=loop)
+        if deadline is None:
+            return await future
+        try:
+            # 시간 초과 시 스레드는 끝까지 실행되지만 요청은 즉시 반환
+            return await asyncio.wait_for(future, deadline.timeout(stage="Bedrock call"))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                f"request deadline of {deadline.budget:.2f}s exceeded during Bedrock call"
+            )
+
+    def _finish_call(
+        self,
+        endpoint: BedrockEndpoint,
+        call: Optional["Future[Any]"],
+        call_started: List[float],
+    ):
+        """Release the limiter slot and record the outcome of a finished executor call"""
+        if call is None or call.cancelled():
+            # 실행 전에 취소 / 제출 실패 - Bedrock 호출 없음
+            outcome = OUTCOME_ERROR
+        else:
+            error = call.exception()
+            if error is None:
+                outcome = OUTCOME_SUCCESS
+            else:
+                self._stats["errors"] += 1
+                outcome = (
+                    OUTCOME_THROTTLED
+                    if isinstance(error, ClientError) and _is_throttling(error)
+                    else OUTCOME_ERROR
+                )
+        self._stats["in_flight"] -= 1
+        prometheus_metrics.BEDROCK_IN_FLIGHT.dec()
+        endpoint.limiter.release(outcome)
+        if call_started:
+            prometheus_metrics.BEDROCK_CALL_SECONDS.labels(endpoint.name, outcome).observe(
+                time.perf_counter() - call_started[0]
+            )
+
+    async def _call_bedrock_with_retry(
+        self, endpoint: BedrockEndpoint, fn: Callable[..., Any], *args, deadline: Deadline
+    ) -> Any:
+        """
+        _call_bedrock + throttling 재시도
+
+        full-jitter exponential backoff으로 재시도하며,
+        deadline을 넘길 것 같으면 마지막 에러를 그대로 올립니다.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._call_bedrock(endpoint, fn, *args, deadline=deadline)
+            except LimiterRejected as e:
+                raise DeadlineExceeded(str(e))
+            except ClientError as e:
+                if not _is_throttling(e) or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                backoff = random.uniform(
+                    0, min(self.retry_max_delay, self.retry_base_delay * 2**attempt)
+                )
+                if backoff >= deadline.remaining():
+                    raise
+                self._stats["retries"] += 1
+                logger.warning(
+                    "Bedrock throttled on %s (%s), retry %s/%s in %.2fs",
+                    endpoint.name,
+                    e.response["Error"]["Code"],
+                    attempt,
+                    self.max_retries,
+                    backoff,
+                )
+                await asyncio.sleep(backoff)
+
+    def _record_queue_wait(self, endpoint: BedrockEndpoint, seconds: float):
+        prometheus_metrics.BEDROCK_QUEUE_WAIT_SECONDS.labels(endpoint.name).observe(seconds)
+        wait_ms = seconds * 1000
+        self._stats["queue_wait_total_ms"] += wait_ms
+        if wait_ms > self._stats["queue_wait_max_ms"]:
+            self._stats["queue_wait_max_ms"] = wait_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bedrock executor / concurrency stats"""
+        calls = self._stats["calls"]
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "calls": calls,
+            "errors": self._stats["errors"],
+            "retries": self._stats["retries"],
+            "in_flight": self._stats["in_flight"],
+            "waiting": self._stats["waiting"],
+            "queue_wait_avg_ms": round(
+                self._stats["queue_wait_total_ms"] / calls, 3
+            )
+            if calls
+            else 0.0,
+            "queue_wait_max_ms": round(self._stats["queue_wait_max_ms"], 3),
+            "routing": self.router.stats() if self.router else None,
+        }
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Answer cache stats"""
+        return {
+            "enabled": self.cache_enabled,
+            **self.response_cache.stats(),
+            "snapshot": self.cache_snapshot.stats() if self.cache_snapshot else None,
+        }
+
+    def get_inflight_stats(self) -> Dict[str, Any]:
+        """Single-flight coalescing stats"""
+        return self._inflight.stats()
+
+    def _build_request_body(self, question: str, max_tokens: Optional[int] = None) -> str:
+        system: Any = self.system_prompt
+        if self.prompt_caching:
+            # 매 요청 동일한 system prompt를 cache checkpoint로 지정
+            system = [
+                {
+                    "type": "text",
+                    "text": self.system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return json.dumps(
+            {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens or self.max_tokens,
+                "temperature": 0.2,
+                "system": system,
+                "messages": [{"role": "user", "content": question}],
+            }
+        )
+
+    def _record_usage(
+        self, model_id: str, usage: Optional[Dict[str, Any]], truncated: bool = False
+    ):
+        """Accumulate token counts from a response usage block of the model that served it"""
+        if not usage:
+            return
+        usage_meter.record(model_id, usage, truncated=truncated)
+        self._usage["requests"] += 1
+        for field in (
+            "input_tokens",
+            "output_tokens",
+            "cache_read_input_tokens",
+            "cache_creation_input_tokens",
+        ):
+            self._usage[field] += int(usage.get(field) or 0)
+        prometheus_metrics.observe_bedrock_tokens(model_id, usage)
+
+    def _add_output_tokens(self, model_id: str, tokens: int, truncated: bool = False):
+        self._usage["output_tokens"] += int(tokens)
+        usage_meter.record(model_id, {"output_tokens": tokens}, call=False, truncated=truncated)
+        prometheus_metrics.observe_bedrock_tokens(model_id, {"output_tokens": tokens})
+
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """Prompt caching token counts and estimated input-token savings"""
+        read = self._usage["cache_read_input_tokens"]
+        write = self._usage["cache_creation_input_tokens"]
+        uncached = self._usage["input_tokens"]
+        total_input = read + write + uncached
+        # 캐시가 없었다면 전부 기본 단가로 처리됐을 입력 토큰 대비 절감량
+        saved = read * (1 - CACHE_READ_PRICE_RATIO) - write * (
+            CACHE_WRITE_PRICE_RATIO - 1
+        )
+        return {
+            "enabled": self.prompt_caching,
+            **self._usage,
+            "cache_read_ratio": round(read / total_input, 4) if total_input else 0.0,
+            "saved_input_token_equivalents": round(saved, 1),
+            "saved_input_ratio": round(saved / total_input, 4)
+            if total_input
+            else 0.0,
+        }
+
+    def _mock_answer(self, question: str) -> str:
+        return f"""안녕하세요! 로그 수집 서비스에 대한 질문에 답변드리겠습니다.
+
+                    질문: {question}
+
+                    로그 수집은 시스템의 다양한 이벤트와 정보를 기록하고 중앙화하는 프로세스입니다. 주요 이점은 다음과 같습니다:
+
+                    1. **문제 진단**: 시스템 오류 발생 시 로그를 분석하여 원인을 파악할 수 있습니다.
+                    2. **성능 모니터링**: 애플리케이션의 성능 지표를 추적하고 최적화할 수 있습니다.
+                    3. **보안 감사**: 보안 이벤트를 기록하고 분석하여 위협을 탐지할 수 있습니다.
+                    4. **규정 준수**: 법적 요구사항을 충족하기 위한 감사 로그를 유지할 수 있습니다.
+
+                    추가 질문이 있으시면 언제든지 문의해주세요!
+
+                    (참고: 현재 MOCK 모드로 실행 중입니다)"""
+
     async def _simulate_bedrock_call(self) -> str:
         """
         시연용: Bedrock 호출 시뮬레이션 (트레이스 span 생성)
@@ -75,15 +541,18 @@ class BedrockService:
 
         # bedrock 3번 호출 (각각 span 생성)
         for i in range(1, 4):
-            if self.client:
+            if self.router:
+                endpoint = self.router.primary
                 try:
-                    self.client.invoke_model(
-                        modelId="invalid-model",
-                        body=json.dumps({"test": f"attempt_call_{i}"}),
+                    await self._call_bedrock(
+                        endpoint,
+                        endpoint.backend.invoke_model,
+                        "invalid-model",
+                        json.dumps({"test": f"attempt_call_{i}"}),
                     )
-                    logger.info(f"[시도 {i}] Bedrock 호출")
+                    logger.info("[시도 %s] Bedrock 호출", i)
                     logger.error(
-                        f"1000자 초과했습니다. 응답 길이: {len(RANDOM_LENGTH)}자."
+                        "1000자 초과했습니다. 응답 길이: %s자.", len(RANDOM_LENGTH)
                     )
 
                 except:
@@ -92,13 +561,38 @@ class BedrockService:
         # 무조건 에러발생
         raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
 
-    async def generate_answer(self, question: str, is_error: bool = False) -> str:
+    def _cache_key(self, question: str) -> str:
+        return self.response_cache.make_key(
+            question, self.model_id, self.system_prompt_hash
+        )
+
+    def _cached_answer(self, question: str, use_cache: bool) -> Optional[str]:
+        if not (self.cache_enabled and use_cache):
+            return None
+        return self.response_cache.get(self._cache_key(question))
+
+    def _store_answer(self, question: str, answer: str):
+        if self.cache_enabled and answer:
+            self.response_cache.set(self._cache_key(question), answer)
+
+    async def generate_answer(
+        self,
+        question: str,
+        is_error: bool = False,
+        use_cache: bool = True,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
         """
         Call AWS Bedrock Claude 3 Sonnet to generate answer
 
         Args:
             question: 사용자 질문
             is_error: True면 에러 시나리오 시연 (1000자 초과 -> 5번 재시도 -> 실패)
+            use_cache: False면 답변 캐시 조회를 건너뛰고 새로 생성 (결과는 캐시에 갱신)
+            deadline: 요청 시간 예산 (없으면 BEDROCK_REQUEST_DEADLINE)
+
+        Raises:
+            DeadlineExceeded: 예산 안에 답변을 받지 못한 경우
         """
 
         # 에러 시나리오 시연
@@ -112,46 +606,197 @@ class BedrockService:
             # 성공 (에러 시나리오에서는 절대 도달 안함)
             return answer
 
-        # Mock mode for local testing (정상 시나리오)
-        if self.use_mock:
-            logger.info(f"MOCK AI - Question: {question}")
-            return f"""안녕하세요! 로그 수집 서비스에 대한 질문에 답변드리겠습니다.
+        cached = self._cached_answer(question, use_cache)
+        if cached is not None:
+            logger.info("Answer cache hit")
+            return cached
 
-                    질문: {question}
+        if deadline is None:
+            deadline = Deadline(self.request_deadline)
 
-                    로그 수집은 시스템의 다양한 이벤트와 정보를 기록하고 중앙화하는 프로세스입니다. 주요 이점은 다음과 같습니다:
-
-                    1. **문제 진단**: 시스템 오류 발생 시 로그를 분석하여 원인을 파악할 수 있습니다.
-                    2. **성능 모니터링**: 애플리케이션의 성능 지표를 추적하고 최적화할 수 있습니다.
-                    3. **보안 감사**: 보안 이벤트를 기록하고 분석하여 위협을 탐지할 수 있습니다.
-                    4. **규정 준수**: 법적 요구사항을 충족하기 위한 감사 로그를 유지할 수 있습니다.
+        # 공유 생성은 서비스 예산(BEDROCK_REQUEST_DEADLINE)으로 실행하고, 각 대기자는 자신의 예산만큼만 기다림
+        # (첫 요청의 짧은 예산이 합쳐진 다른 요청까지 실패시키지 않도록)
+        shared = self._inflight.do(
+            self._cache_key(question),
+            lambda: self._generate_and_store(question, Deadline(self.request_deadline)),
+        )
+        try:
+            return await asyncio.wait_for(
+                shared, deadline.timeout(stage="Bedrock generation")
+            )
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                f"request deadline of {deadline.budget:.2f}s exceeded waiting for Bedrock"
+            )
 
-                    추가 질문이 있으시면 언제든지 문의해주세요!
+    async def _generate_and_store(self, question: str, deadline: Deadline) -> str:
+        answer = await self._generate(question, deadline)
+        self._store_answer(question, answer)
+        return answer
 
-                    (참고: 현재 MOCK 모드로 실행 중입니다)"""
+    async def _generate(self, question: str, deadline: Deadline) -> str:
+        """Generate an answer without consulting the answer cache"""
+        # Mock mode for local testing (정상 시나리오)
+        if self.use_mock:
+            logger.info("MOCK AI - Question: %s", question)
+            return self._mock_answer(question)
 
         # 실제 Bedrock 호출 (정상 시나리오)
         try:
-            body = json.dumps(
-                {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1024,
-                    "temperature": 0.2,
-                    "system": self.system_prompt,
-                    "messages": [{"role": "user", "content": question}],
-                }
-            )
+            body = self._build_request_body(question)
 
-            response = self.client.invoke_model(modelId=self.model_id, body=body)
+            async def call(endpoint: BedrockEndpoint) -> Tuple[str, Dict[str, Any]]:
+                response = await self._call_bedrock_with_retry(
+                    endpoint,
+                    endpoint.backend.invoke_model,
+                    endpoint.model_id,
+                    body,
+                    deadline=deadline,
+                )
+                # 사용량/비용은 실제로 응답한 엔드포인트의 모델 기준으로 기록
+                return endpoint.model_id, response
 
-            response_body = json.loads(response["body"].read())
+            # 지연이 길어지면 다른 리전/모델로 hedge, 실패하면 failover
+            model_id, response_body = await self.router.invoke(call)
+            self._record_usage(
+                model_id,
+                response_body.get("usage"),
+                truncated=response_body.get("stop_reason") == "max_tokens",
+            )
             answer = response_body["content"][0]["text"]
 
             return answer
 
+        except DeadlineExceeded:
+            logger.warning("Bedrock deadline exceeded (%.2fs budget)", deadline.budget)
+            raise
+        except ClientError as e:
+            logger.error("Bedrock ClientError: %s", e, exc_info=True)
+            raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
+        except Exception as e:
+            logger.error("Bedrock error: %s", e, exc_info=True)
+            raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
+
+    async def generate_answer_stream(
+        self, question: str, use_cache: bool = True, deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream answer text deltas as Bedrock produces them
+
+        invoke_model_with_response_stream의 content_block_delta를 그대로 전달합니다.
+        MOCK 모드에서는 mock 답변을 청크 단위로 나눠서 전달합니다.
+        캐시 적중 시 전체 답변을 한 번에 전달합니다.
+
+        Raises:
+            DeadlineExceeded: 예산 안에 스트림이 끝나지 않은 경우
+        """
+        cached = self._cached_answer(question, use_cache)
+        if cached is not None:
+            logger.info("Answer cache hit (stream)")
+            yield cached
+            return
+
+        chunks = []
+        async for delta in self._stream(question, deadline or Deadline(self.request_deadline)):
+            chunks.append(delta)
+            yield delta
+        self._store_answer(question, "".join(chunks))
+
+    async def _stream(self, question: str, deadline: Deadline) -> AsyncIterator[str]:
+        if self.use_mock:
+            logger.info("MOCK AI (stream) - Question: %s", question)
+            answer = self._mock_answer(question)
+            for i in range(0, len(answer), MOCK_STREAM_CHUNK_SIZE):
+                yield answer[i : i + MOCK_STREAM_CHUNK_SIZE]
+                await asyncio.sleep(MOCK_STREAM_CHUNK_DELAY)
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        # 첫 텍스트를 전달한 뒤에는 재시도 / failover 하지 않음 (답변이 중복되므로)
+        emitted = threading.Event()
+        body = self._build_request_body(question)
+
+        def pump(endpoint: BedrockEndpoint):
+            # executor 스레드에서 이벤트 스트림을 읽어 이벤트 루프 큐로 전달
+            if stop.is_set():
+                return
+            events = endpoint.backend.invoke_model_stream(endpoint.model_id, body)
+            try:
+                for payload in events:
+                    if stop.is_set():
+                        break
+                    event_type = payload.get("type")
+                    if event_type == "message_start":
+                        # 입력/캐시 토큰은 message_start, 출력 토큰은 message_delta에 포함
+                        usage = payload.get("message", {}).get("usage") or {}
+                        loop.call_soon_threadsafe(
+                            self._record_usage, endpoint.model_id, {**usage, "output_tokens": 0}
+                        )
+                        continue
+                    if event_type == "message_delta":
+                        output_tokens = payload.get("usage", {}).get("output_tokens")
+                        truncated = (
+                            payload.get("delta", {}).get("stop_reason") == "max_tokens"
+                        )
+                        if output_tokens or truncated:
+                            loop.call_soon_threadsafe(
+                                self._add_output_tokens,
+                                endpoint.model_id,
+                                output_tokens or 0,
+                                truncated,
+                            )
+                        continue
+                    if event_type != "content_block_delta":
+                        continue
+                    text = payload.get("delta", {}).get("text")
+                    if text:
+                        emitted.set()
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+            except Exception as e:
+                if emitted.is_set():
+                    raise StreamInterrupted(f"Bedrock stream from {endpoint.name} broke off: {e}") from e
+                raise
+            finally:
+                events.close()
+
+        async def call(endpoint: BedrockEndpoint):
+            # 일반 호출과 같은 엔드포인트 선택 / 슬롯 / throttling 재시도 / deadline 적용
+            return await self._call_bedrock_with_retry(
+                endpoint, pump, endpoint, deadline=deadline
+            )
+
+        # hedge된 두 스트림이 같은 큐에 섞이지 않도록 failover만 사용
+        stream_task = asyncio.ensure_future(self.router.invoke(call, hedge=False))
+        # 텍스트 콜백은 스레드가 끝나기 전에 예약되므로 종료 표시는 항상 마지막
+        stream_task.add_done_callback(lambda _: queue.put_nowait(_STREAM_END))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                yield item
+            await stream_task
+        except DeadlineExceeded:
+            logger.warning("Bedrock stream deadline exceeded (%.2fs budget)", deadline.budget)
+            raise
         except ClientError as e:
-            logger.error(f"Bedrock ClientError: {e}", exc_info=True)
+            logger.error("Bedrock stream ClientError: %s", e, exc_info=True)
             raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
         except Exception as e:
-            logger.error(f"Bedrock error: {e}", exc_info=True)
+            logger.error("Bedrock stream error: %s", e, exc_info=True)
             raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
+        finally:
+            # 클라이언트가 중간에 끊으면 스트림 읽기를 중단
+            stop.set()
+            if not stream_task.done():
+                # 슬롯 대기 중이면 취소, 실행 중이면 다음 이벤트에서 중단
+                stream_task.cancel()
+                stream_task.add_done_callback(
+                    lambda t: t.cancelled() or t.exception()
+                )
+
+
+def _is_throttling(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
@@ -0,0 +1,176 @@
+"""
+답변 캐시 스냅샷 - 재시작 후에도 캐시를 따뜻하게 유지 (warm start)
+- 주기적으로 ResponseCache를 gzip JSON Lines 파일로 저장 (임시 파일 → 원자적 교체)
+- 파일 이름에 model id + 시스템 프롬프트 해시가 들어가므로 모델/프롬프트가 바뀌면 이전 스냅샷은 무시됨
+- 시작 시 백그라운드에서 읽어 캐시에 병합하므로 readiness를 늦추지 않음
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class CacheSnapshot:
+    def __init__(
+        self,
+        cache: ResponseCache,
+        directory: str,
+        model_id: str,
+        system_prompt_hash: str,
+        interval: float = 60.0,
+    ):
+        self.cache = cache
+        self.model_id = model_id
+        self.system_prompt_hash = system_prompt_hash
+        self.interval = interval
+        name = _UNSAFE_RE.sub("_", model_id)
+        self.path = os.path.join(
+            directory, f"answer-cache-{name}-{system_prompt_hash}.jsonl.gz"
+        )
+
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._saved_version = -1
+        # 이전 스냅샷을 읽기 전에 저장하면 덜 찬 캐시로 덮어쓰게 되므로 load 이후에만 저장
+        self._loaded = False
+
+        self.loaded = 0
+        self.saves = 0
+        self.errors = 0
+        self.last_saved_entries = 0
+        self.last_save_ms: Optional[float] = None
+        self.last_saved_at: Optional[float] = None
+
+    def start(self):
+        """Load the previous snapshot and start periodic saves (call from the app lifespan)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stop periodic saves and write a final snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+    async def _run(self):
+        await self.load()
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save()
+
+    async def load(self) -> int:
+        loop = asyncio.get_running_loop()
+        try:
+            entries = await loop.run_in_executor(None, self._read)
+        except FileNotFoundError:
+            self._loaded = True
+            return 0
+        except (EOFError, ValueError) as e:
+            # 저장 도중 프로세스가 죽어 잘린 / 깨진 스냅샷 - 버리고 다음 저장에서 새로 씀
+            self.errors += 1
+            self._loaded = True
+            logger.warning("Ignoring truncated answer cache snapshot %s: %s", self.path, e)
+            return 0
+        except Exception as e:
+            self.errors += 1
+            self._loaded = True
+            logger.error("Failed to read answer cache snapshot %s: %s", self.path, e)
+            return 0
+
+        self.loaded = self.cache.restore(entries)
+        # 불러온 직후 내용은 파일과 같으므로 변경이 없으면 다시 쓰지 않음
+        self._saved_version = self.cache.version
+        self._loaded = True
+        logger.info("Answer cache warm start: restored %s entries from %s", self.loaded, self.path)
+        return self.loaded
+
+    async def save(self) -> bool:
+        if not self._loaded or self.cache.version == self._saved_version:
+            return False
+
+        version = self.cache.version
+        entries = self.cache.export()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            await loop.run_in_executor(None, self._write, entries)
+        except Exception as e:
+            self.errors += 1
+            logger.error("Failed to write answer cache snapshot %s: %s", self.path, e)
+            return False
+
+        self._saved_version = version
+        self.saves += 1
+        self.last_saved_entries = len(entries)
+        self.last_save_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.last_saved_at = time.time()
+        return True
+
+    def _read(self) -> List[Tuple[str, float, str]]:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if (
+                header.get("version") != SNAPSHOT_FORMAT_VERSION
+                or header.get("model_id") != self.model_id
+                or header.get("system_prompt_hash") != self.system_prompt_hash
+            ):
+                logger.warning("Ignoring incompatible answer cache snapshot %s", self.path)
+                return []
+            return [tuple(json.loads(line)) for line in f if line.strip()]
+
+    def _write(self, entries: List[Tuple[str, float, str]]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # 다른 worker가 저장한 항목도 유지 (우리 항목 우선, 만료/초과분 제외)
+        try:
+            previous = self._read()
+        except (OSError, ValueError, EOFError):
+            # 잘린 gzip은 EOFError
+            previous = []
+        own = {entry[0] for entry in entries}
+        now = time.time()
+        merged = [
+            entry for entry in previous if entry[0] not in own and entry[1] > now
+        ] + list(entries)
+        entries = merged[-self.cache.max_entries:]
+
+        # worker마다 다른 임시 파일에 쓰고 교체
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        header = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "model_id": self.model_id,
+            "system_prompt_hash": self.system_prompt_hash,
+            "saved_at": time.time(),
+        }
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(json.dumps(header) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "interval_seconds": self.interval,
+            "loaded": self.loaded,
+            "saves": self.saves,
+            "errors": self.errors,
+            "last_saved_entries": self.last_saved_entries,
+            "last_save_ms": self.last_save_ms,
+            "last_saved_at": self.last_saved_at,
+        }
@@ -0,0 +1,174 @@
+"""
+업스트림 보호용 서킷 브레이커 + 재시도 예산
+- CircuitBreaker: 최근 window_seconds 동안의 에러율 / 느린 호출 비율이 임계값을 넘으면 open
+  open 동안은 즉시 실패, open_seconds 후 half-open에서 소수의 시험 호출로 회복 여부 확인
+- RetryBudget: 전체 요청 대비 재시도 비율을 제한해 장애 시 재시도 폭주를 막음
+"""
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 30.0,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_rate_threshold: float = 0.5,
+        open_seconds: float = 15.0,
+        half_open_calls: int = 2,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self.state = STATE_CLOSED
+        self.opened_at = 0.0
+        self.half_opened_at = 0.0
+        # (완료 시각, 성공 여부, 지연 시간)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+        self._trial_calls = 0
+        self._trial_successes = 0
+
+        self.rejected = 0
+        self.opens = 0
+
+    def allow(self):
+        """Raise CircuitOpen unless a call may go through now"""
+        if self.state == STATE_OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                raise CircuitOpen(f"circuit '{self.name}' is open")
+            self._half_open()
+
+        if self.state == STATE_HALF_OPEN:
+            # 시험 호출이 결과를 남기지 못하고 사라진 경우(취소 등) 다시 시험 허용
+            if time.monotonic() - self.half_opened_at >= self.open_seconds:
+                self._half_open()
+            if self._trial_calls >= self.half_open_calls:
+                self.rejected += 1
+                raise CircuitOpen(f"circuit '{self.name}' is half-open, trial calls in flight")
+            self._trial_calls += 1
+
+    def release(self):
+        """Return a trial slot for a call whose outcome says nothing about the upstream"""
+        if self.state == STATE_HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def record(self, success: bool, latency: float):
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+
+        if self.state == STATE_HALF_OPEN:
+            if not success or slow:
+                self._open(now)
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_calls:
+                self.state = STATE_CLOSED
+                self._calls.clear()
+            return
+
+        self._calls.append((now, success, latency))
+        self._trim(now)
+        if self.state == STATE_CLOSED and len(self._calls) >= self.min_calls:
+            error_rate, slow_rate = self._rates()
+            if (
+                error_rate >= self.error_rate_threshold
+                or slow_rate >= self.slow_rate_threshold
+            ):
+                self._open(now)
+
+    def _half_open(self):
+        self.state = STATE_HALF_OPEN
+        self.half_opened_at = time.monotonic()
+        self._trial_calls = 0
+        self._trial_successes = 0
+
+    def _open(self, now: float):
+        self.state = STATE_OPEN
+        self.opened_at = now
+        self.opens += 1
+        self._calls.clear()
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._calls:
+            return 0.0, 0.0
+        total = len(self._calls)
+        errors = sum(1 for _, success, _ in self._calls if not success)
+        slow = sum(1 for _, _, latency in self._calls if latency >= self.slow_call_seconds)
+        return errors / total, slow / total
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        error_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls_in_window": len(self._calls),
+            "error_rate": round(error_rate, 4),
+            "slow_call_rate": round(slow_rate, 4),
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "open_remaining_seconds": round(
+                max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 2
+            )
+            if self.state == STATE_OPEN
+            else 0.0,
+        }
+
+
+class RetryBudget:
+    """Allow retries up to ratio * requests (plus a small floor) within a rolling window"""
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def record_request(self):
+        self._requests.append(time.monotonic())
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window_seconds:
+                events.popleft()
+
+        allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+        if len(self._retries) >= allowed:
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "window_seconds": self.window_seconds,
+            "requests_in_window": len(self._requests),
+            "retries_in_window": len(self._retries),
+            "exhausted": self.exhausted,
+        }
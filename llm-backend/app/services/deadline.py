@@ -0,0 +1,55 @@
+"""
+요청 단위 deadline (시간 예산)
+라우터에서 생성해 Bedrock / api-backend 호출까지 전달하며,
+각 하위 호출의 timeout을 남은 예산으로 줄이고 소진 시 즉시 실패시킴
+"""
+import os
+import time
+from typing import Optional
+
+# 클라이언트가 지정하는 요청 시간 예산 (밀리초)
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "25"))
+MAX_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_MAX_SECONDS", "60"))
+# 헤더로 받을 수 있는 최소 예산 (이보다 짧으면 어떤 하위 호출도 끝낼 수 없음)
+MIN_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_MIN_SECONDS", "1"))
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request time budget is used up"""
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "Deadline":
+        """Build from the X-Request-Timeout-Ms header, falling back to the default"""
+        seconds = DEFAULT_DEADLINE_SECONDS
+        if value:
+            try:
+                seconds = int(value) / 1000
+            except ValueError:
+                pass
+        return cls(min(max(seconds, MIN_DEADLINE_SECONDS), MAX_DEADLINE_SECONDS))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str = ""):
+        if self.expired:
+            where = f" before {stage}" if stage else ""
+            raise DeadlineExceeded(f"request deadline of {self.budget:.2f}s exceeded{where}")
+
+    def timeout(self, cap: Optional[float] = None, stage: str = "") -> float:
+        """Remaining budget, capped by a per-call timeout; raises once exhausted"""
+        self.check(stage)
+        remaining = self.remaining()
+        return min(cap, remaining) if cap is not None else remaining
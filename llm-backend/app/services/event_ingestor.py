@@ -0,0 +1,159 @@
+"""
+이벤트 비동기 배치 수집
+- 요청 경로에서는 bounded 큐에 넣고 바로 반환 (큐가 가득 차면 거절 + drop 카운트)
+- 백그라운드 flusher가 batch_size개가 모이거나 flush_interval이 지나면 한 번에 전송
+- 종료 시 진행 중인 전송과 남은 이벤트를 stop_timeout 안에서 마저 보내고, 못 보낸 수는 discarded로 집계
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventIngestor:
+    def __init__(
+        self,
+        send: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        stop_timeout: float = 5.0,
+    ):
+        self._send = send
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stop_timeout = stop_timeout
+
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self._flusher: Optional["asyncio.Task[None]"] = None
+        # flusher가 모으는 중인 배치 (종료 시 유실되지 않도록 인스턴스에 보관)
+        self._batch: List[Dict[str, Any]] = []
+        # 진행 중인 전송 (flusher가 취소되어도 끝까지 실행되도록 별도 task)
+        self._sending: Optional["asyncio.Task[None]"] = None
+
+        self.accepted = 0
+        self.dropped = 0
+        self.batches = 0
+        self.sent = 0
+        self.failed_batches = 0
+        self.failed_events = 0
+        self.discarded = 0
+        self.last_flush_ms: Optional[float] = None
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """Queue an event without waiting; False (and counted as dropped) when full"""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def start(self):
+        """Start the background flusher (call from the app lifespan)"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self):
+        """Stop the flusher and send whatever is still queued (within stop_timeout)"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        deadline = time.monotonic() + self.stop_timeout
+        # flusher 취소 시점에 보내던 배치를 먼저 마저 보냄
+        sent_all = await self._wait_sending(deadline)
+        while sent_all and not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+            if len(self._batch) >= self.batch_size:
+                self._start_sending()
+                sent_all = await self._wait_sending(deadline)
+        if sent_all and self._batch:
+            self._start_sending()
+            await self._wait_sending(deadline)
+
+        leftover = len(self._batch) + self._queue.qsize()
+        if leftover:
+            self.discarded += leftover
+            logger.warning("Event ingestor stop timed out, discarding %s unsent events", leftover)
+            self._batch = []
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    async def _flush_loop(self):
+        while True:
+            # 첫 이벤트가 올 때까지 대기한 뒤 크기/시간 조건까지 모음
+            self._batch.append(await self._queue.get())
+            flush_at = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush_batch()
+
+    async def _flush_batch(self):
+        self._start_sending()
+        assert self._sending is not None
+        # flusher가 취소되어도 전송은 계속 (stop()이 이어서 기다림)
+        await asyncio.shield(self._sending)
+
+    def _start_sending(self):
+        batch, self._batch = self._batch, []
+        self._sending = asyncio.ensure_future(self._send_batch(batch))
+
+    async def _wait_sending(self, deadline: float) -> bool:
+        """Wait for the in-flight send until deadline; False if it had to be abandoned"""
+        sending = self._sending
+        if sending is None or sending.done():
+            return True
+        try:
+            # 시간 초과 시 wait_for가 전송을 취소 → _send_batch에서 discarded로 집계
+            await asyncio.wait_for(sending, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _send_batch(self, batch: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        try:
+            await self._send(batch)
+        except asyncio.CancelledError:
+            self.discarded += len(batch)
+            logger.warning("Abandoned sending %s events", len(batch))
+            raise
+        except Exception as e:
+            self.failed_batches += 1
+            self.failed_events += len(batch)
+            logger.warning("Failed to send %s events: %s", len(batch), e)
+        else:
+            self.batches += 1
+            self.sent += len(batch)
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "sent": self.sent,
+            "failed_batches": self.failed_batches,
+            "failed_events": self.failed_events,
+            "discarded": self.discarded,
+            "last_flush_ms": self.last_flush_ms,
+        }
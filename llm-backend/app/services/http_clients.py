@@ -0,0 +1,122 @@
+"""
+업스트림별 공유 httpx 클라이언트
+- 호출마다 AsyncClient를 만들지 않고 업스트림(base URL)당 하나를 재사용 (keep-alive, 커넥션 풀)
+- 앱 lifespan 종료 시 한 번에 닫음
+- 풀 사용률 통계 (in-flight, 커넥션 수, idle 커넥션)
+"""
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CountingTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport that tracks in-flight requests and pool usage"""
+
+    def __init__(self, max_connections: Optional[int], **kwargs):
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            # 응답 헤더 수신까지를 in-flight로 집계 (본문 읽기 중인 커넥션은 풀 통계에 반영)
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "max_connections": self.max_connections,
+            "utilization": round((len(connections) - idle) / self.max_connections, 4)
+            if self.max_connections
+            else None,
+        }
+
+
+class HTTPClientRegistry:
+    """One long-lived AsyncClient per upstream, closed on app shutdown"""
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+        self.max_keepalive = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.http2 = os.getenv("HTTP_CLIENT_HTTP2", "false").lower() == "true"
+        if self.http2 and not _http2_available():
+            logger.warning("HTTP_CLIENT_HTTP2=true but 'h2' is not installed, using HTTP/1.1")
+            self.http2 = False
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, CountingTransport] = {}
+
+    def get(self, name: str, base_url: str = "", timeout: float = 30.0) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            transport = CountingTransport(
+                max_connections=self.max_connections,
+                limits=limits,
+                http2=self.http2,
+            )
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=timeout,
+                transport=transport,
+            )
+            self._clients[name] = client
+            self._transports[name] = transport
+            logger.info("HTTP client created: %s (%s)", name, base_url or "absolute URLs")
+        return client
+
+    async def aclose(self):
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error("Failed to close HTTP client %s: %s", name, e)
+        self._clients.clear()
+        self._transports.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "clients": {
+                name: transport.stats() for name, transport in self._transports.items()
+            },
+        }
+
+
+# 앱 전체에서 공유 (main.py lifespan에서 닫음)
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,213 @@
+"""
+비동기 로깅 파이프라인
+- 대상 로거(root, uvicorn.access 등)의 기존 핸들러를 떼어 백그라운드 listener 스레드로 옮기고
+  로거에는 bounded 큐에 넣기만 하는 QueueHandler를 붙임 → 이벤트 루프에서 I/O/포맷팅 없음
+- 메시지 포맷팅(% 인자 병합, traceback)은 listener 스레드에서 수행
+  (레코드마다 contextvars를 복사해 두므로 트레이스 연동 핸들러도 같은 컨텍스트에서 실행)
+- WARNING 미만 레코드는 로거별 token bucket으로 제한, 초과분은 버리고 다음 레코드에 개수 표시
+- 큐가 가득 차면 기다리지 않고 버림 (dropped 카운트)
+- 종료 시 listener가 남은 레코드를 처리하도록 최대 stop_timeout 동안 기다림 (큐가 가득 차 있어도 실패하지 않음)
+"""
+import contextvars
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger token bucket for records below WARNING"""
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        # logger name -> [tokens, last refill, suppressed since last pass]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1
+            skipped = int(bucket[2])
+            bucket[2] = 0
+
+        if skipped:
+            record.args = (_LazyMessage(record), skipped)
+            record.msg = "%s (+%d similar records suppressed)"
+        return True
+
+
+class _LazyMessage:
+    """Defers getMessage() of the original msg/args until the listener formats the record"""
+
+    __slots__ = ("msg", "args")
+
+    def __init__(self, record: logging.LogRecord):
+        self.msg = record.msg
+        self.args = record.args
+
+    def __str__(self) -> str:
+        msg = str(self.msg)
+        return msg % self.args if self.args else msg
+
+
+class _QueueingHandler(logging.handlers.QueueHandler):
+    def __init__(self, pipeline: "LogPipeline", targets: Sequence[logging.Handler]):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.targets = list(targets)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 QueueHandler.prepare는 여기서 메시지를 포맷하므로 대신 복사만 함
+        record = copy.copy(record)
+        record.log_targets = self.targets  # type: ignore[attr-defined]
+        record.log_context = contextvars.copy_context()  # type: ignore[attr-defined]
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    def __init__(self, records: "queue.Queue[logging.LogRecord]", stop_timeout: float):
+        super().__init__(records)
+        self.stop_timeout = stop_timeout
+
+    def stop(self) -> bool:
+        """Let the thread finish the queued records; False if it did not within stop_timeout"""
+        deadline = time.monotonic() + self.stop_timeout
+        thread, self._thread = self._thread, None
+        try:
+            # 기본 구현은 put_nowait라 큐가 가득 차 있으면 queue.Full로 종료 실패
+            self.queue.put(self._sentinel, timeout=self.stop_timeout)
+        except queue.Full:
+            return False
+        thread.join(max(0.0, deadline - time.monotonic()))
+        return not thread.is_alive()
+
+    def handle(self, record: logging.LogRecord):
+        record.log_context.run(self._dispatch, record)  # type: ignore[attr-defined]
+
+    def _dispatch(self, record: logging.LogRecord):
+        for handler in record.log_targets:  # type: ignore[attr-defined]
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class LogPipeline:
+    def __init__(
+        self,
+        logger_names: Sequence[str] = ("", "uvicorn", "uvicorn.access"),
+        queue_size: int = 10000,
+        info_rate: float = 50.0,
+        info_burst: int = 200,
+        stop_timeout: float = 5.0,
+    ):
+        self.logger_names = list(logger_names)
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self.rate_limit = RateLimitFilter(info_rate, info_burst)
+        self.dropped = 0
+        self.stop_timeout = stop_timeout
+        self._listener: Optional[_Listener] = None
+        self._installed: List[Tuple[logging.Logger, List[logging.Handler]]] = []
+
+    @classmethod
+    def from_env(cls) -> "LogPipeline":
+        return cls(
+            logger_names=[
+                name.strip()
+                for name in os.getenv("LOG_QUEUE_LOGGERS", "root,uvicorn,uvicorn.access").split(",")
+                if name.strip()
+            ],
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            info_rate=float(os.getenv("LOG_INFO_RATE_PER_SECOND", "50")),
+            info_burst=int(os.getenv("LOG_INFO_BURST", "200")),
+            stop_timeout=float(os.getenv("LOG_QUEUE_STOP_TIMEOUT_SECONDS", "5")),
+        )
+
+    def start(self):
+        """Move the target loggers' handlers behind the queue (call from the app lifespan)"""
+        if self._listener is not None:
+            return
+        for name in self.logger_names:
+            target = logging.getLogger(None if name == "root" else name)
+            handlers = list(target.handlers)
+            if not handlers:
+                continue
+            queueing = _QueueingHandler(self, handlers)
+            queueing.addFilter(self.rate_limit)
+            for handler in handlers:
+                target.removeHandler(handler)
+            target.addHandler(queueing)
+            self._installed.append((target, handlers))
+
+        self._listener = _Listener(self.queue, self.stop_timeout)
+        self._listener.start()
+
+    def stop(self):
+        """Drain the queue and give the original handlers back to their loggers"""
+        if self._listener is None:
+            return
+        for target, handlers in self._installed:
+            for handler in list(target.handlers):
+                if isinstance(handler, _QueueingHandler):
+                    target.removeHandler(handler)
+            for handler in handlers:
+                target.addHandler(handler)
+        self._installed = []
+        # 핸들러를 되돌렸으므로 새 레코드는 들어오지 않음 → listener가 남은 레코드를 처리하고 종료
+        if not self._listener.stop():
+            # 핸들러가 멈춰 큐가 비워지지 않음 - listener는 daemon 스레드라 프로세스 종료를 막지 않음
+            logger.warning(
+                "Log listener did not drain within %ss; %s queued records abandoned",
+                self.stop_timeout,
+                self.queue.qsize(),
+            )
+        self._listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._listener is not None,
+            "loggers": [target.name for target, _ in self._installed],
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "dropped": self.dropped,
+            "suppressed": self.rate_limit.suppressed,
+            "info_rate_per_second": self.rate_limit.rate,
+            "info_burst": self.rate_limit.burst,
+        }
+
+
+def truncate(value: Any, limit: int) -> str:
+    """str(value) cut to limit characters (for logging request bodies and payloads)"""
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} more chars)"
+
+
+log_pipeline = LogPipeline.from_env()
@@ -0,0 +1,97 @@
+"""
+마이크로 배칭 - 짧은 시간 창(window) 또는 최대 크기까지 모은 요청을 한 번에 처리
+각 호출자는 자기 항목의 결과를 future로 받음
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+class MicroBatcher(Generic[ItemT, ResultT]):
+    def __init__(
+        self,
+        flush: Callable[[List[ItemT]], Awaitable[List[ResultT]]],
+        max_size: int = 20,
+        window: float = 0.02,
+    ):
+        # flush(items)는 items와 같은 순서/길이의 결과 리스트를 반환해야 함
+        self._flush = flush
+        self.max_size = max_size
+        self.window = window
+
+        self._pending: List[Tuple[ItemT, "asyncio.Future[ResultT]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.errors = 0
+
+    def submit(self, item: ItemT) -> "asyncio.Future[ResultT]":
+        """Queue an item; the returned future resolves when its batch is flushed"""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[ResultT]" = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # 전송 전에 떠난 호출자(취소된 future)의 항목은 제외
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        # 실행 중인 배치가 GC되지 않도록 참조 유지
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[ItemT, "asyncio.Future[ResultT]"]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        try:
+            results = await self._flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch flush returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            self.errors += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        """Flush whatever is pending and wait for in-flight batches"""
+        self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_size": self.max_size,
+            "window_ms": round(self.window * 1000, 1),
+            "pending": len(self._pending),
+            "in_flight_batches": len(self._tasks),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "errors": self.errors,
+        }
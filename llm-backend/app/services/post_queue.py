@@ -0,0 +1,432 @@
+"""
+글 + AI 댓글 작성 write-behind 큐
+- 작업을 로컬 SQLite(WAL) 스풀에 저장하고 바로 응답 (api-backend 쓰기를 사용자 지연에서 제외)
+- 백그라운드 worker가 create_post → create_comment 순서로 처리, 실패 시 지수 백오프로 재시도
+- 같은 conversationId의 작업은 접수 순서대로 처리
+- 글이 이미 작성된 작업은 재시도 시 댓글만 다시 시도 (중복 글 방지)
+- 여러 uvicorn worker가 같은 스풀 파일을 공유하며, 작업은 lease로 한 곳에서만 처리
+- worker는 폴링하지 않고 enqueue 신호 또는 가장 이른 재시도/lease 만료 시각까지 대기
+"""
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.services.api_backend_service import APIBackendService
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STATUS_PENDING = "pending"
+STATUS_POSTED = "posted"  # 글 작성 완료, 댓글 대기
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+_FINISHED = (STATUS_COMPLETED, STATUS_FAILED)
+
+_COLUMNS = (
+    "job_id, conversation_id, content, email, ai_answer, status, attempts, "
+    "post_id, post_number, post_message, comment_created, last_error, "
+    "next_attempt_at, lease_until, created_at, updated_at"
+)
+
+
+class PostJobQueue:
+    def __init__(
+        self,
+        api_backend: APIBackendService,
+        path: str = "/tmp/llm-backend-post-queue.db",
+        workers: int = 2,
+        max_attempts: int = 8,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        lease_seconds: float = 120.0,
+        idle_poll_interval: float = 60.0,
+        retention_seconds: float = 86400.0,
+    ):
+        self.api_backend = api_backend
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.lease_seconds = lease_seconds
+        # 다른 프로세스가 접수만 하고 죽은 작업을 찾기 위한 유휴 시 확인 간격
+        self.idle_poll_interval = idle_poll_interval
+        self.retention_seconds = retention_seconds
+
+        # 프로세스마다 고유한 lease 소유자 ID
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="post-queue")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls, api_backend: APIBackendService) -> "PostJobQueue":
+        return cls(
+            api_backend,
+            path=os.getenv("POST_QUEUE_PATH", "/tmp/llm-backend-post-queue.db"),
+            workers=int(os.getenv("POST_QUEUE_WORKERS", "2")),
+            max_attempts=int(os.getenv("POST_QUEUE_MAX_ATTEMPTS", "8")),
+            retry_base_delay=float(os.getenv("POST_QUEUE_RETRY_BASE_DELAY", "1.0")),
+            retry_max_delay=float(os.getenv("POST_QUEUE_RETRY_MAX_DELAY", "60")),
+            lease_seconds=float(os.getenv("POST_QUEUE_LEASE_SECONDS", "120")),
+            idle_poll_interval=float(os.getenv("POST_QUEUE_IDLE_POLL_SECONDS", "60")),
+            retention_seconds=float(os.getenv("POST_QUEUE_RETENTION_SECONDS", "86400")),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # 접수된 작업은 유실되면 안 되므로 FULL
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS post_jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL UNIQUE,
+                    conversation_id TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    email TEXT,
+                    ai_answer TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    post_id TEXT,
+                    post_number INTEGER,
+                    post_message TEXT,
+                    comment_created INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    next_attempt_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_until REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS post_jobs_status ON post_jobs (status, next_attempt_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS post_jobs_conversation ON post_jobs (conversation_id, seq)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, lambda: fn(self._connection())
+            )
+        except sqlite3.Error:
+            self.errors += 1
+            raise
+
+    async def enqueue(
+        self,
+        conversation_id: str,
+        content: str,
+        ai_answer: str,
+        email: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Persist a post+comment job and return its status (durable once this returns)"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        def insert(conn: sqlite3.Connection) -> Dict[str, Any]:
+            conn.execute(
+                """
+                INSERT INTO post_jobs (
+                    job_id, conversation_id, content, email, ai_answer, status,
+                    next_attempt_at, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, conversation_id, content, email, ai_answer, STATUS_PENDING, now, now, now),
+            )
+            return self._load(conn, job_id)
+
+        job = await self._run(insert)
+        self.enqueued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info("Queued post job %s for conversationId=%s", job_id, conversation_id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(lambda conn: self._load(conn, job_id))
+
+    def _load(self, conn: sqlite3.Connection, job_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            f"SELECT {_COLUMNS} FROM post_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return _job_status(row) if row else None
+
+    def start(self):
+        """Start background workers (call from the app lifespan)"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._worker(index)) for index in range(self.workers)
+        ]
+        self._tasks.append(asyncio.ensure_future(self._cleanup_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        def shutdown(conn: sqlite3.Connection):
+            # 처리 중이던 작업은 다른 프로세스가 바로 가져갈 수 있도록 lease 해제
+            conn.execute(
+                "UPDATE post_jobs SET lease_owner = NULL, lease_until = NULL WHERE lease_owner = ?",
+                (self.owner,),
+            )
+            conn.close()
+
+        if self._conn is not None:
+            await self._run(shutdown)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    async def _worker(self, index: int):
+        assert self._wakeup is not None
+        while True:
+            # 조회 전에 clear - 조회 중에 들어온 enqueue 신호를 놓치지 않도록
+            self._wakeup.clear()
+            try:
+                job, next_due = await self._run(self._claim)
+            except Exception as e:
+                logger.error("Post queue worker %s failed to claim a job: %s", index, e)
+                job, next_due = None, time.time() + self.retry_base_delay
+
+            if job is None:
+                timeout = self.idle_poll_interval
+                if next_due is not None:
+                    timeout = min(timeout, max(0.0, next_due - time.time()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Post job %s crashed: %s", job["job_id"], e, exc_info=True)
+                try:
+                    await self._retry(job, str(e))
+                except Exception as retry_error:
+                    # lease가 만료되면 다시 처리됨
+                    logger.error("Failed to reschedule post job %s: %s", job["job_id"], retry_error)
+
+    def _claim(
+        self, conn: sqlite3.Connection
+    ) -> Tuple[Optional[sqlite3.Row], Optional[float]]:
+        """
+        Lease the oldest runnable job whose earlier jobs for the same conversation are done
+
+        처리할 작업이 없으면 (None, 다음에 처리 가능해지는 가장 이른 시각)을 반환
+        """
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"""
+                SELECT {_COLUMNS} FROM post_jobs AS j
+                WHERE j.status IN (?, ?)
+                  AND j.next_attempt_at <= ?
+                  AND (j.lease_until IS NULL OR j.lease_until <= ?)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM post_jobs AS p
+                      WHERE p.conversation_id = j.conversation_id
+                        AND p.seq < j.seq
+                        AND p.status NOT IN (?, ?)
+                  )
+                ORDER BY j.seq
+                LIMIT 1
+                """,
+                (STATUS_PENDING, STATUS_POSTED, now, now, *_FINISHED),
+            ).fetchone()
+            if row is None:
+                next_due = conn.execute(
+                    """
+                    SELECT MIN(MAX(next_attempt_at, COALESCE(lease_until, 0)))
+                    FROM post_jobs WHERE status IN (?, ?)
+                    """,
+                    (STATUS_PENDING, STATUS_POSTED),
+                ).fetchone()[0]
+                return None, next_due
+            conn.execute(
+                "UPDATE post_jobs SET lease_owner = ?, lease_until = ?, attempts = attempts + 1 WHERE job_id = ?",
+                (self.owner, now + self.lease_seconds, row["job_id"]),
+            )
+        return row, None
+
+    async def _process(self, job: sqlite3.Row):
+        job_id = job["job_id"]
+
+        if job["status"] == STATUS_PENDING:
+            post_result = await self.api_backend.create_post(
+                content=job["content"], email=job["email"]
+            )
+            if not post_result:
+                await self._retry(job, "create_post failed")
+                return
+            # 댓글 단계 전에 글 id를 확실히 기록 (worker가 취소돼도 끝까지 기록)
+            await asyncio.shield(self._record_post(job_id, post_result))
+            post_id = post_result["id"]
+        else:
+            post_id = job["post_id"]
+
+        comment_success = await self.api_backend.create_comment(
+            post_id=post_id, content=job["ai_answer"], is_ai_generated=True
+        )
+        if not comment_success:
+            await self._retry(job, "create_comment failed")
+            return
+
+        await self._update(
+            job_id,
+            status=STATUS_COMPLETED,
+            comment_created=1,
+            last_error=None,
+            lease_owner=None,
+            lease_until=None,
+        )
+        self.completed += 1
+        logger.info("Post job %s completed (post %s)", job_id, post_id)
+
+    async def _record_post(self, job_id: str, post_result: Dict[str, Any], attempts: int = 3):
+        """
+        Mark the job as posted
+
+        이 기록이 빠지면 재시도 시 글이 한 번 더 작성되므로 SQLite 오류(잠금 등)는 제자리에서 다시 시도
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                await self._update(
+                    job_id,
+                    status=STATUS_POSTED,
+                    post_id=post_result["id"],
+                    post_number=post_result["postId"],
+                    post_message=post_result["message"],
+                )
+                return
+            except sqlite3.Error as e:
+                if attempt >= attempts:
+                    raise
+                logger.warning("Failed to record post for job %s (%s), retrying", job_id, e)
+                await asyncio.sleep(self.retry_base_delay * attempt)
+
+    async def _retry(self, job: sqlite3.Row, error: str):
+        attempts = job["attempts"] + 1
+        if attempts >= self.max_attempts:
+            await self._update(
+                job["job_id"],
+                status=STATUS_FAILED,
+                last_error=error,
+                lease_owner=None,
+                lease_until=None,
+            )
+            self.failed += 1
+            logger.error("Post job %s failed after %s attempts: %s", job["job_id"], attempts, error)
+            return
+
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+        delay = random.uniform(delay / 2, delay)
+        await self._update(
+            job["job_id"],
+            last_error=error,
+            next_attempt_at=time.time() + delay,
+            lease_owner=None,
+            lease_until=None,
+        )
+        self.retries += 1
+        logger.warning(
+            "Post job %s attempt %s failed (%s), retrying in %.1fs",
+            job["job_id"],
+            attempts,
+            error,
+            delay,
+        )
+
+    async def _update(self, job_id: str, **fields: Any):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        await self._run(
+            lambda conn: conn.execute(
+                f"UPDATE post_jobs SET {assignments} WHERE job_id = ?",
+                (*fields.values(), job_id),
+            )
+        )
+
+    async def _cleanup_loop(self):
+        """Drop finished jobs past the retention window"""
+        while True:
+            await asyncio.sleep(max(60.0, self.retention_seconds / 24))
+            try:
+                removed = await self._run(
+                    lambda conn: conn.execute(
+                        "DELETE FROM post_jobs WHERE status IN (?, ?) AND updated_at <= ?",
+                        (*_FINISHED, time.time() - self.retention_seconds),
+                    ).rowcount
+                )
+            except Exception as e:
+                logger.error("Post queue cleanup failed: %s", e)
+                continue
+            if removed:
+                logger.info("Post queue cleanup removed %s finished jobs", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "workers": self.workers if self._tasks else 0,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "errors": self.errors,
+        }
+
+
+def _job_status(row: sqlite3.Row) -> Dict[str, Any]:
+    post_created = None
+    if row["post_id"]:
+        post_created = {
+            "id": row["post_id"],
+            "postId": row["post_number"],
+            "message": row["post_message"] or "글이 작성되었습니다",
+        }
+    return {
+        "jobId": row["job_id"],
+        "conversationId": row["conversation_id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "postCreated": post_created,
+        "commentCreated": bool(row["comment_created"]),
+        "lastError": row["last_error"],
+        "createdAt": row["created_at"],
+        "updatedAt": row["updated_at"],
+    }
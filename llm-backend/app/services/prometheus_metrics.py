@@ -0,0 +1,142 @@
+"""
+Prometheus 메트릭 (/metrics)
+- PROMETHEUS_MULTIPROC_DIR가 설정되면 prometheus_client multiprocess 모드로 동작:
+  각 uvicorn worker가 값을 mmap 파일에 쓰고, 스크랩을 받은 worker가 디렉터리 전체를 합산
+  (디렉터리는 서버 시작 전에 비워야 함 - Dockerfile CMD 참고)
+- 미설정 시 프로세스 기본 레지스트리 사용 (단일 worker 개발 환경)
+라벨은 카디널리티가 제한된 값(라우트 템플릿, 엔드포인트 이름, 상태 코드)만 사용합니다.
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    # 값 파일은 메트릭 생성 시점에 만들어지므로 import 전에 디렉터리 준비
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# 수 ms ~ 수십 초 (Bedrock 생성은 초 단위, 캐시/내부 호출은 ms 단위)
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "llm_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+BEDROCK_CALL_SECONDS = Histogram(
+    "llm_bedrock_call_duration_seconds",
+    "Bedrock call latency (excluding queue wait)",
+    ["endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+BEDROCK_QUEUE_WAIT_SECONDS = Histogram(
+    "llm_bedrock_queue_wait_seconds",
+    "Time spent waiting for a Bedrock concurrency slot and executor thread",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+BEDROCK_TOKENS = Counter(
+    "llm_bedrock_tokens",
+    "Bedrock tokens by type (input, output, cache_read_input, cache_creation_input)",
+    ["model", "type"],
+)
+BEDROCK_IN_FLIGHT = Gauge(
+    "llm_bedrock_in_flight",
+    "Bedrock calls currently running",
+    multiprocess_mode="livesum",
+)
+BEDROCK_WAITING = Gauge(
+    "llm_bedrock_waiting",
+    "Bedrock calls waiting for a concurrency slot",
+    multiprocess_mode="livesum",
+)
+
+ANSWER_STORE_LOOKUPS = Counter(
+    "llm_answer_store_lookups",
+    "ai_answer_cache lookups by result (hit, miss, error)",
+    ["result"],
+)
+
+API_BACKEND_REQUEST_SECONDS = Histogram(
+    "llm_api_backend_request_duration_seconds",
+    "api-backend call latency per attempt",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# usage 필드 → tokens 라벨
+_TOKEN_TYPES = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_read_input_tokens": "cache_read_input",
+    "cache_creation_input_tokens": "cache_creation_input",
+}
+
+# 저장소 크기 gauge - 백엔드에 따라 worker 간 합산 방식이 다름 (처음 보고될 때 생성)
+_answer_store_entries: Optional[Gauge] = None
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float):
+    # 상태는 클래스 단위(2xx/4xx/5xx)로 묶어 시계열 수 제한
+    HTTP_REQUEST_SECONDS.labels(method, route, f"{status_code // 100}xx").observe(seconds)
+
+
+def observe_bedrock_tokens(model: str, usage: Dict[str, int]):
+    for field, token_type in _TOKEN_TYPES.items():
+        count = int(usage.get(field) or 0)
+        if count:
+            BEDROCK_TOKENS.labels(model, token_type).inc(count)
+
+
+def observe_api_backend(endpoint: str, status: str, seconds: float):
+    API_BACKEND_REQUEST_SECONDS.labels(endpoint, status).observe(seconds)
+
+
+def set_answer_store_entries(backend: str, size: Optional[int]):
+    """
+    Report the ai_answer_cache entry count
+
+    memory 저장소는 worker마다 따로 있으므로 합산(livesum),
+    sqlite/redis는 모든 worker가 같은 저장소를 보므로 가장 최근 값(livemostrecent)
+    """
+    global _answer_store_entries
+    if size is None:
+        return
+    if _answer_store_entries is None:
+        _answer_store_entries = Gauge(
+            "llm_answer_store_entries",
+            "Entries in the ai_answer_cache",
+            ["backend"],
+            multiprocess_mode="livesum" if backend == "memory" else "livemostrecent",
+        )
+    _answer_store_entries.labels(backend).set(size)
+
+
+def render() -> Tuple[bytes, str]:
+    """Exposition text for /metrics and its content type"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared directory (call on shutdown)"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,158 @@
+"""
+최소 Redis(RESP2) 클라이언트 - asyncio 스트림 기반
+답변 저장소에서 쓰는 몇 개 명령(GET/SET/GETDEL/DEL/PING, MULTI/EXEC)만 필요해서 직접 구현
+redis-server 외에 RESP를 말하는 로컬 대역(stand-in)으로도 테스트 가능
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+from urllib.parse import urlparse
+
+
+class RedisError(Exception):
+    """Error reply from the server or a protocol failure"""
+
+
+class RedisReplyError(RedisError):
+    """Error reply (-ERR ...) from the server; the connection stays usable"""
+
+
+class RedisClient:
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # 단일 연결에서 요청/응답 순서를 보장
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args: Any) -> Any:
+        return await self._call(lambda: self._roundtrip(args))
+
+    async def transaction(self, *commands: Any) -> List[Any]:
+        """
+        Run commands atomically with MULTI/EXEC and return their replies
+
+        큐잉 단계의 에러(알 수 없는 명령 등)는 RedisReplyError로 올리고,
+        실행 단계의 명령별 에러는 결과 목록에 RedisReplyError 객체로 담깁니다.
+        """
+        return await self._call(lambda: self._multi_exec(commands))
+
+    async def _call(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await asyncio.wait_for(request(), self.timeout)
+            except RedisReplyError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                # 연결 상태를 알 수 없으므로 끊고 다음 호출에서 재연결
+                self._drop()
+                raise RedisError(f"redis connection error: {e!r}") from e
+            except BaseException:
+                # 취소 등으로 응답을 끝까지 읽지 못하면 그 응답이 연결에 남아
+                # 다음 명령이 이전 명령의 응답을 받게 되므로 연결을 버림
+                self._drop()
+                raise
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        try:
+            # 응답 없는 서버에서 연결이 멈추지 않도록 명령과 같은 timeout 적용
+            if self.password:
+                await asyncio.wait_for(self._roundtrip(("AUTH", self.password)), self.timeout)
+            if self.db:
+                await asyncio.wait_for(self._roundtrip(("SELECT", self.db)), self.timeout)
+        except BaseException:
+            # 인증/DB 선택이 안 된 연결을 재사용하지 않도록
+            self._drop()
+            raise
+
+    async def _roundtrip(self, args) -> Any:
+        assert self._writer is not None
+        self._writer.write(_encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _multi_exec(self, commands) -> Any:
+        assert self._writer is not None
+        self._writer.write(
+            b"".join(_encode(args) for args in (("MULTI",), *commands, ("EXEC",)))
+        )
+        await self._writer.drain()
+        # MULTI의 +OK와 명령별 +QUEUED - 에러가 있어도 남은 응답을 모두 읽어 연결을 맞춰 둠
+        error: Optional[RedisReplyError] = None
+        for _ in range(len(commands) + 1):
+            try:
+                await self._read_reply()
+            except RedisReplyError as e:
+                error = error or e
+        try:
+            result = await self._read_reply()
+        except RedisReplyError:
+            # EXECABORT보다 원인인 큐잉 에러를 올림
+            if error is not None:
+                raise error
+            raise
+        return result
+
+    async def _read_reply(self) -> Any:
+        assert self._reader is not None
+        line = await self._reader.readuntil(b"\r\n")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RedisReplyError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            items: List[Any] = []
+            for _ in range(count):
+                # EXEC 결과의 명령별 에러는 예외 객체로 담고 나머지 요소를 계속 읽음
+                try:
+                    items.append(await self._read_reply())
+                except RedisReplyError as e:
+                    items.append(e)
+            return items
+        raise RedisError(f"unexpected reply prefix: {line!r}")
+
+    def _drop(self):
+        """Abandon the current connection without waiting (safe while being cancelled)"""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    async def close(self):
+        writer = self._writer
+        self._drop()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+def _encode(args) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
@@ -0,0 +1,233 @@
+"""
+프로세스 내 요청 지연 시간 히스토그램
+- ASGI 미들웨어가 라우트(경로 템플릿)별로 지연 시간 / 상태 코드를 기록
+- 고정 버킷(기하급수 간격) 히스토그램을 시간 슬롯 링으로 관리 → 최근 window_seconds 구간 집계
+- 이벤트 루프 단일 스레드에서만 갱신하므로 락 없음 (요청당 bisect 1회 + 정수 증가)
+- 프로세스 CPU / RSS 샘플링
+수치는 이 worker 프로세스 기준입니다.
+"""
+import bisect
+import os
+import resource
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services import prometheus_metrics
+
+# 0.25ms ~ 약 120s, 버킷 간 20% 간격 (상대 오차 ≤ 20%, 보간으로 더 작아짐)
+_BUCKET_BOUNDS_MS: List[float] = []
+_bound = 0.25
+while _bound < 120_000:
+    _BUCKET_BOUNDS_MS.append(round(_bound, 4))
+    _bound *= 1.2
+
+
+class _Slot:
+    __slots__ = ("epoch", "counts", "count", "errors", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.epoch = -1
+        self.counts: List[int] = []
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def reset(self, epoch: int):
+        self.epoch = epoch
+        # 마지막 버킷은 최대 경계 초과분
+        self.counts = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+
+class RouteHistogram:
+    """Rolling-window latency histogram for one route"""
+
+    def __init__(self, slots: int, slot_seconds: float):
+        self.slot_seconds = slot_seconds
+        self._slots = [_Slot() for _ in range(slots)]
+        self.total = 0
+        self.total_errors = 0
+
+    def record(self, latency_ms: float, error: bool, now: float):
+        epoch = int(now / self.slot_seconds)
+        slot = self._slots[epoch % len(self._slots)]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+        slot.counts[bisect.bisect_left(_BUCKET_BOUNDS_MS, latency_ms)] += 1
+        slot.count += 1
+        slot.sum_ms += latency_ms
+        if latency_ms > slot.max_ms:
+            slot.max_ms = latency_ms
+        self.total += 1
+        if error:
+            slot.errors += 1
+            self.total_errors += 1
+
+    def live_slots(self, now: float) -> List[_Slot]:
+        oldest = int(now / self.slot_seconds) - len(self._slots) + 1
+        return [slot for slot in self._slots if slot.epoch >= oldest]
+
+
+def summarize(slots: List[_Slot], window_seconds: float) -> Dict[str, Any]:
+    """Merge slots into count/error rate/avg/percentiles"""
+    counts = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+    count = errors = 0
+    sum_ms = max_ms = 0.0
+    for slot in slots:
+        for index, value in enumerate(slot.counts):
+            if value:
+                counts[index] += value
+        count += slot.count
+        errors += slot.errors
+        sum_ms += slot.sum_ms
+        max_ms = max(max_ms, slot.max_ms)
+
+    return {
+        "request_count": count,
+        "error_count": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "requests_per_second": round(count / window_seconds, 3),
+        "avg_response_time_ms": round(sum_ms / count, 2) if count else None,
+        "p50_response_time_ms": _percentile(counts, count, 50, max_ms),
+        "p95_response_time_ms": _percentile(counts, count, 95, max_ms),
+        "p99_response_time_ms": _percentile(counts, count, 99, max_ms),
+        "max_response_time_ms": round(max_ms, 2) if count else None,
+    }
+
+
+def _percentile(counts: List[int], total: int, p: float, max_ms: float) -> Optional[float]:
+    if not total:
+        return None
+    rank = p / 100 * total
+    seen = 0
+    for index, value in enumerate(counts):
+        if not value:
+            continue
+        if seen + value >= rank:
+            lower = _BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            # 관측 최댓값보다 큰 추정치는 내지 않음 (상위 버킷 폭이 넓어 생기는 과대 추정 방지)
+            upper = min(
+                _BUCKET_BOUNDS_MS[index] if index < len(_BUCKET_BOUNDS_MS) else max_ms,
+                max_ms,
+            )
+            lower = min(lower, upper)
+            # 버킷 안에서는 균등 분포로 가정하고 선형 보간
+            return round(lower + (upper - lower) * (rank - seen) / value, 2)
+        seen += value
+    return round(max_ms, 2)
+
+
+class ProcessSampler:
+    """CPU usage since the previous sample and current RSS of this process"""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._last_wall = time.monotonic()
+        self._last_cpu = time.process_time()
+        self._cpu_percent = 0.0
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def cpu_percent(self) -> float:
+        now = time.monotonic()
+        elapsed = now - self._last_wall
+        # 너무 짧은 구간은 값이 튀므로 직전 값 사용
+        if elapsed >= self.min_interval:
+            cpu = time.process_time()
+            self._cpu_percent = (cpu - self._last_cpu) / elapsed * 100
+            self._last_wall = now
+            self._last_cpu = cpu
+        return round(self._cpu_percent, 2)
+
+    def rss_mb(self) -> float:
+        try:
+            with open("/proc/self/statm") as f:
+                pages = int(f.read().split()[1])
+            return round(pages * self._page_size / (1024 * 1024), 2)
+        except (OSError, ValueError, IndexError):
+            # /proc가 없는 환경에서는 최대 RSS (Linux: KB 단위)
+            return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+
+
+class RequestMetrics:
+    def __init__(self, window_seconds: float = 300.0, slot_seconds: float = 10.0):
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self._slots = max(1, int(window_seconds / slot_seconds))
+        self._routes: Dict[str, RouteHistogram] = {}
+        self.process = ProcessSampler()
+        self.started_at = time.time()
+
+    def record(self, route: str, latency_ms: float, error: bool):
+        histogram = self._routes.get(route)
+        if histogram is None:
+            histogram = self._routes[route] = RouteHistogram(self._slots, self.slot_seconds)
+        histogram.record(latency_ms, error, time.monotonic())
+
+    def route_summary(self, route: str) -> Optional[Dict[str, Any]]:
+        histogram = self._routes.get(route)
+        if histogram is None:
+            return None
+        return summarize(histogram.live_slots(time.monotonic()), self.window_seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """All routes merged, plus per-route breakdown and process stats"""
+        now = time.monotonic()
+        slots: List[_Slot] = []
+        routes = {}
+        for route, histogram in self._routes.items():
+            live = histogram.live_slots(now)
+            slots.extend(live)
+            routes[route] = summarize(live, self.window_seconds)
+
+        return {
+            **summarize(slots, self.window_seconds),
+            "cpu_usage": self.process.cpu_percent(),
+            "memory_usage_mb": self.process.rss_mb(),
+            "window_seconds": self.window_seconds,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "routes": routes,
+        }
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware overhead, works with streaming)"""
+
+    def __init__(self, app, metrics: "RequestMetrics"):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우팅 후 scope에 매칭된 라우트가 들어옴 → 경로 템플릿 기준으로 집계 (카디널리티 제한)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            name = f"{scope['method']} {path}" if route is not None else path
+            elapsed = time.perf_counter() - started
+            self.metrics.record(name, elapsed * 1000, status_code >= 500)
+            prometheus_metrics.observe_request(scope["method"], path, status_code, elapsed)
+
+
+request_metrics = RequestMetrics(
+    window_seconds=float(os.getenv("REQUEST_METRICS_WINDOW_SECONDS", "300")),
+    slot_seconds=float(os.getenv("REQUEST_METRICS_SLOT_SECONDS", "10")),
+)
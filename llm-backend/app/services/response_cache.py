@@ -0,0 +1,122 @@
+"""
+질문 답변 캐시 - 정규화된 질문 기준 TTL + LRU 캐시
+같은 질문(공백/구두점/대소문자 차이 무시)은 Bedrock 호출 없이 바로 응답
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Fold case, punctuation and whitespace so equivalent questions share a key"""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def prompt_hash(text: str) -> str:
+    """Short stable hash of a system prompt"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """Size-bounded LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # set() 할 때마다 증가 - 스냅샷 저장 여부 판단용
+        self.version = 0
+
+    @staticmethod
+    def make_key(question: str, model_id: str, system_prompt_hash: str) -> str:
+        raw = f"{model_id}\x00{system_prompt_hash}\x00{normalize_question(question)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        self.version += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def export(self) -> List[Tuple[str, float, str]]:
+        """Live entries as (key, wall-clock expiry, value), least recently used first"""
+        now = time.monotonic()
+        offset = time.time() - now
+        return [
+            (key, expires_at + offset, value)
+            for key, (expires_at, value) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def restore(self, entries: Iterable[Tuple[str, float, str]]) -> int:
+        """
+        Merge exported entries back in (warm start)
+
+        이미 있는 키는 덮어쓰지 않고, 복원 항목은 LRU상 가장 오래된 쪽에 둡니다.
+        """
+        now = time.monotonic()
+        offset = time.time() - now
+        restored = []
+        for key, expires_wall, value in entries:
+            expires_at = expires_wall - offset
+            if key in self._entries or expires_at <= now:
+                continue
+            restored.append((key, (expires_at, value)))
+
+        # 가장 최근 항목이 앞쪽에 오도록 역순으로 앞에 붙임
+        room = max(0, self.max_entries - len(self._entries))
+        restored = restored[-room:] if room else []
+        for key, entry in reversed(restored):
+            self._entries[key] = entry
+            self._entries.move_to_end(key, last=False)
+        return len(restored)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
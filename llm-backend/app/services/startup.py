@@ -0,0 +1,123 @@
+"""
+시작 / 준비 상태 추적
+- import, 서비스 생성, warm-up 단계별 소요 시간 기록
+- /ready 는 서비스 생성과 warm-up이 끝난 뒤에만 200 (/health 는 프로세스 생존 여부만)
+warm-up 실패는 기록만 하고 준비 상태를 막지 않습니다 (첫 요청에서 다시 초기화됨).
+종료 단계도 하나가 실패해도 나머지를 모두 실행합니다.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StartupState:
+    def __init__(self):
+        self.started_at = time.time()
+        self.ready = False
+        self.ready_at: Optional[float] = None
+        self.import_ms: Dict[str, float] = {}
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.warmup: Dict[str, Dict[str, Any]] = {}
+        self._warmup_task: Optional["asyncio.Task[None]"] = None
+        self.shutdown: Dict[str, Dict[str, Any]] = {}
+
+    def record_import(self, name: str, seconds: float):
+        self.import_ms[name] = round(seconds * 1000, 1)
+
+    async def build(self, name: str, factory: Callable[[], T], in_thread: bool = False) -> T:
+        """Construct a service, timing it; blocking constructors run off the event loop"""
+        started = time.perf_counter()
+        try:
+            if in_thread:
+                service = await asyncio.get_running_loop().run_in_executor(None, factory)
+            else:
+                service = factory()
+        except Exception as e:
+            self.components[name] = {"status": "error", "error": str(e)}
+            raise
+        self.components[name] = {
+            "status": "ok",
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return service
+
+    def start_warmup(self, steps: Dict[str, Callable[[], Awaitable[Any]]], timeout: float):
+        """Run warm-up steps concurrently in the background, then mark the worker ready"""
+        self._warmup_task = asyncio.ensure_future(self._run_warmup(steps, timeout))
+
+    async def _run_warmup(self, steps: Dict[str, Callable[[], Awaitable[Any]]], timeout: float):
+        async def run(name: str, step: Callable[[], Awaitable[Any]]):
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(step(), timeout)
+                outcome: Dict[str, Any] = {"status": "ok"}
+            except asyncio.TimeoutError:
+                outcome = {"status": "timeout"}
+            except Exception as e:
+                outcome = {"status": "error", "error": str(e)}
+            outcome["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if outcome["status"] != "ok":
+                logger.warning("Warm-up step %s failed: %s", name, outcome)
+            self.warmup[name] = outcome
+
+        await asyncio.gather(*(run(name, step) for name, step in steps.items()))
+        self.mark_ready()
+
+    def mark_ready(self):
+        self.ready = True
+        self.ready_at = time.time()
+        logger.info(
+            "Worker %s ready in %.2fs (imports=%s, services=%s, warmup=%s)",
+            os.getpid(),
+            self.ready_at - self.started_at,
+            self.import_ms,
+            self.components,
+            self.warmup,
+        )
+
+    async def stop(self):
+        # 종료 중에는 트래픽을 받지 않도록 준비 상태 해제
+        self.ready = False
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_shutdown(self, steps: Dict[str, Callable[[], Any]]):
+        """Run shutdown steps in order; a failing step is logged and the rest still run"""
+        for name, step in steps.items():
+            started = time.perf_counter()
+            try:
+                result = step()
+                if inspect.isawaitable(result):
+                    await result
+                outcome: Dict[str, Any] = {"status": "ok"}
+            except Exception as e:
+                logger.error("Shutdown step %s failed: %s", name, e, exc_info=True)
+                outcome = {"status": "error", "error": str(e)}
+            outcome["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.shutdown[name] = outcome
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "pid": os.getpid(),
+            "startup_seconds": round(self.ready_at - self.started_at, 3)
+            if self.ready_at
+            else None,
+            "import_ms": self.import_ms,
+            "services": self.components,
+            "warmup": self.warmup,
+        }
+
+
+startup_state = StartupState()
@@ -0,0 +1,157 @@
+"""
+Stale-while-revalidate 캐시
+- TTL 이내: 캐시 값을 바로 반환
+- TTL 경과 후 stale_ttl 이내: 캐시 값을 바로 반환하고 백그라운드에서 갱신
+- 그 이후 / 없음: 로드 완료까지 대기 (같은 키 동시 요청은 하나의 로드를 공유)
+- 업스트림 실패(예외 또는 is_failure가 True인 결과)는 negative_ttl 동안만 캐시
+  (갱신 실패 시 아직 유효한 이전 정상 값이 있으면 그 값을 유지)
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Set, TypeVar
+
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("value", "error", "negative", "fresh_until", "stale_until")
+
+    def __init__(
+        self,
+        value: Optional[T],
+        error: Optional[BaseException],
+        negative: bool,
+        fresh_until: float,
+        stale_until: float,
+    ):
+        self.value = value
+        self.error = error
+        self.negative = negative
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class StaleWhileRevalidateCache(Generic[T]):
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        negative_ttl: float = 5.0,
+        max_entries: int = 1024,
+        is_failure: Optional[Callable[[T], bool]] = None,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.is_failure = is_failure
+
+        self._entries: "OrderedDict[str, _Entry[T]]" = OrderedDict()
+        self._loads = SingleFlight()
+        self._refreshing: Set[str] = set()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[T]]) -> T:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now >= entry.fresh_until:
+                # 오래된 값은 바로 돌려주고 갱신은 백그라운드에서
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader)
+            elif entry.negative:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return self._unwrap(entry)
+
+        self.misses += 1
+        entry = await self._loads.do(key, lambda: self._load(key, loader))
+        return self._unwrap(entry)
+
+    def _unwrap(self, entry: "_Entry[T]") -> T:
+        if entry.error is not None:
+            raise entry.error
+        return entry.value  # type: ignore[return-value]
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[T]]) -> "_Entry[T]":
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            expires = time.monotonic() + self.negative_ttl
+            entry: _Entry[T] = _Entry(None, e, True, expires, expires)
+        else:
+            now = time.monotonic()
+            if self.is_failure is not None and self.is_failure(value):
+                # 실패 응답도 짧게 캐시 - negative TTL이 지나면 다시 조회
+                entry = _Entry(value, None, True, now + self.negative_ttl, now + self.negative_ttl)
+            else:
+                entry = _Entry(value, None, False, now + self.ttl, now + self.ttl + self.stale_ttl)
+
+        previous = self._entries.get(key)
+        if entry.negative and previous is not None and not previous.negative:
+            now = time.monotonic()
+            if now < previous.stale_until:
+                # 갱신 실패 시 기존 정상 값을 계속 사용 (negative TTL 뒤 다시 갱신 시도)
+                previous.fresh_until = min(previous.stale_until, now + self.negative_ttl)
+                return entry
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[T]]):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self.refreshes += 1
+
+        async def refresh():
+            try:
+                entry = await self._loads.do(key, lambda: self._load(key, loader))
+                if entry.negative:
+                    self.refresh_failures += 1
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.warning("Background refresh failed for %s: %s", key, e)
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
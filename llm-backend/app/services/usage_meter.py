@@ -0,0 +1,293 @@
+"""
+Bedrock 토큰 사용량 / 비용 계량
+- Bedrock 응답의 usage 블록을 호출마다 기록
+- 최근 window_seconds 구간을 시간 슬롯 링으로 집계 (conversationId / 라우트 / 모델별)
+- 요청 단위 합계는 미들웨어가 응답 헤더(X-LLM-*)로 전달
+
+요청 귀속은 contextvars로 전달됩니다. 미들웨어가 요청마다 합계 객체를,
+핸들러가 bind_conversation()으로 conversationId를 지정하면 그 이후 생성되는
+태스크/executor 스레드에서 기록된 사용량이 해당 요청으로 집계됩니다.
+(single-flight로 합쳐진 요청은 실제 호출을 시작한 요청에만 집계)
+"""
+import contextvars
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Anthropic prompt caching 단가 비율 (기본 입력 토큰 대비)
+CACHE_READ_PRICE_RATIO = 0.1
+CACHE_WRITE_PRICE_RATIO = 1.25
+
+USAGE_HEADERS = {
+    "input_tokens": b"x-llm-input-tokens",
+    "output_tokens": b"x-llm-output-tokens",
+    "cost_usd": b"x-llm-cost-usd",
+}
+
+# 슬롯당 conversationId 수 상한 (초과분은 OTHER로 합산)
+OTHER = "(other)"
+UNATTRIBUTED = "(none)"
+
+
+_FIELDS = (
+    "calls",
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+    "truncated",
+    "cost_usd",
+)
+
+
+class Usage:
+    """Token counters for one key"""
+
+    __slots__ = _FIELDS
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self.truncated = 0
+        self.cost_usd = 0.0
+
+    def add(self, other: "Usage"):
+        for field in _FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "avg_output_tokens": round(self.output_tokens / self.calls, 1)
+            if self.calls
+            else 0.0,
+            # max_tokens에 걸려 잘린 응답 수 (max_tokens 조정 지표)
+            "truncated": self.truncated,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+class RequestUsage(Usage):
+    """Per-request totals; also remembers the ASGI scope to resolve the route template"""
+
+    __slots__ = ("asgi_scope",)
+
+    def __init__(self, asgi_scope: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.asgi_scope = asgi_scope
+
+    @property
+    def route(self) -> str:
+        if self.asgi_scope is None:
+            return UNATTRIBUTED
+        route = self.asgi_scope.get("route")
+        path = route.path if route is not None else self.asgi_scope.get("path", "")
+        return f"{self.asgi_scope.get('method', '')} {path}"
+
+
+_request_usage: "contextvars.ContextVar[Optional[RequestUsage]]" = contextvars.ContextVar(
+    "llm_request_usage", default=None
+)
+_conversation_id: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "llm_conversation_id", default=None
+)
+
+
+def bind_conversation(conversation_id: Optional[str]):
+    """Attribute usage recorded from here on (in this task and its children) to a conversation"""
+    _conversation_id.set(conversation_id)
+
+
+def current_usage() -> Optional[RequestUsage]:
+    return _request_usage.get()
+
+
+class _Slot:
+    __slots__ = ("epoch", "by_conversation", "by_route", "by_model")
+
+    def __init__(self):
+        self.epoch = -1
+        self.by_conversation: Dict[str, Usage] = {}
+        self.by_route: Dict[str, Usage] = {}
+        self.by_model: Dict[str, Usage] = {}
+
+    def reset(self, epoch: int):
+        self.epoch = epoch
+        self.by_conversation = {}
+        self.by_route = {}
+        self.by_model = {}
+
+
+class UsageMeter:
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        slot_seconds: float = 60.0,
+        max_conversations_per_slot: int = 2000,
+        input_price_per_mtok: float = 0.25,
+        output_price_per_mtok: float = 1.25,
+    ):
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self.max_conversations_per_slot = max_conversations_per_slot
+        self.input_price_per_mtok = input_price_per_mtok
+        self.output_price_per_mtok = output_price_per_mtok
+        self._slots = [_Slot() for _ in range(max(1, int(window_seconds / slot_seconds)))]
+        self.total = Usage()
+
+    def cost(self, usage: Dict[str, Any]) -> float:
+        """Estimated USD for one usage block"""
+        input_units = (
+            int(usage.get("input_tokens") or 0)
+            + int(usage.get("cache_read_input_tokens") or 0) * CACHE_READ_PRICE_RATIO
+            + int(usage.get("cache_creation_input_tokens") or 0) * CACHE_WRITE_PRICE_RATIO
+        )
+        output_units = int(usage.get("output_tokens") or 0)
+        return (
+            input_units * self.input_price_per_mtok
+            + output_units * self.output_price_per_mtok
+        ) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        usage: Dict[str, Any],
+        call: bool = True,
+        truncated: bool = False,
+    ):
+        """
+        Record one usage block
+
+        call=False는 같은 호출의 추가 usage (스트리밍의 message_delta 출력 토큰)
+        """
+        delta = Usage()
+        delta.calls = 1 if call else 0
+        delta.input_tokens = int(usage.get("input_tokens") or 0)
+        delta.output_tokens = int(usage.get("output_tokens") or 0)
+        delta.cache_read_input_tokens = int(usage.get("cache_read_input_tokens") or 0)
+        delta.cache_creation_input_tokens = int(
+            usage.get("cache_creation_input_tokens") or 0
+        )
+        delta.truncated = 1 if truncated else 0
+        delta.cost_usd = self.cost(usage)
+
+        request = _request_usage.get()
+        if request is not None:
+            request.add(delta)
+        route = request.route if request is not None else UNATTRIBUTED
+        conversation_id = _conversation_id.get() or UNATTRIBUTED
+
+        self.total.add(delta)
+        slot = self._slot(time.monotonic())
+        if (
+            conversation_id not in slot.by_conversation
+            and len(slot.by_conversation) >= self.max_conversations_per_slot
+        ):
+            conversation_id = OTHER
+        for table, key in (
+            (slot.by_conversation, conversation_id),
+            (slot.by_route, route),
+            (slot.by_model, model),
+        ):
+            entry = table.get(key)
+            if entry is None:
+                entry = table[key] = Usage()
+            entry.add(delta)
+
+    def _slot(self, now: float) -> _Slot:
+        epoch = int(now / self.slot_seconds)
+        slot = self._slots[epoch % len(self._slots)]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+        return slot
+
+    def _live_slots(self) -> List[_Slot]:
+        oldest = int(time.monotonic() / self.slot_seconds) - len(self._slots) + 1
+        return [slot for slot in self._slots if slot.epoch >= oldest]
+
+    def report(self, top: int = 20, sort_by: str = "cost_usd") -> Dict[str, Any]:
+        """Window totals and the top conversations / routes / models"""
+        merged: Dict[str, Dict[str, Usage]] = {
+            "conversations": {},
+            "routes": {},
+            "models": {},
+        }
+        window = Usage()
+        for slot in self._live_slots():
+            for name, table in (
+                ("conversations", slot.by_conversation),
+                ("routes", slot.by_route),
+                ("models", slot.by_model),
+            ):
+                target = merged[name]
+                for key, usage in table.items():
+                    entry = target.get(key)
+                    if entry is None:
+                        entry = target[key] = Usage()
+                    entry.add(usage)
+            for usage in slot.by_model.values():
+                window.add(usage)
+
+        def ranked(table: Dict[str, Usage]) -> List[Dict[str, Any]]:
+            rows = [{"key": key, **usage.to_dict()} for key, usage in table.items()]
+            rows.sort(key=lambda row: row.get(sort_by, 0), reverse=True)
+            return rows[:top]
+
+        return {
+            "window_seconds": self.window_seconds,
+            "pricing": {
+                "input_usd_per_mtok": self.input_price_per_mtok,
+                "output_usd_per_mtok": self.output_price_per_mtok,
+            },
+            "window": window.to_dict(),
+            "since_start": self.total.to_dict(),
+            "top_conversations": ranked(merged["conversations"]),
+            "routes": ranked(merged["routes"]),
+            "models": ranked(merged["models"]),
+        }
+
+
+class UsageHeadersMiddleware:
+    """Open a per-request usage scope and attach its totals as X-LLM-* response headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = RequestUsage(scope)
+        token = _request_usage.set(usage)
+
+        async def send_wrapper(message):
+            # 스트리밍 응답은 헤더가 먼저 나가므로 사용량은 SSE done 이벤트로 전달
+            if message["type"] == "http.response.start" and usage.calls:
+                headers = list(message.get("headers", []))
+                headers.append((USAGE_HEADERS["input_tokens"], str(usage.input_tokens).encode()))
+                headers.append((USAGE_HEADERS["output_tokens"], str(usage.output_tokens).encode()))
+                headers.append((USAGE_HEADERS["cost_usd"], f"{usage.cost_usd:.6f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_usage.reset(token)
+
+
+usage_meter = UsageMeter(
+    window_seconds=float(os.getenv("USAGE_WINDOW_SECONDS", "3600")),
+    slot_seconds=float(os.getenv("USAGE_SLOT_SECONDS", "60")),
+    max_conversations_per_slot=int(os.getenv("USAGE_MAX_CONVERSATIONS_PER_SLOT", "2000")),
+    input_price_per_mtok=float(os.getenv("BEDROCK_INPUT_PRICE_PER_MTOK", "0.25")),
+    output_price_per_mtok=float(os.getenv("BEDROCK_OUTPUT_PRICE_PER_MTOK", "1.25")),
+)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# app 패키지를 import할 수 있도록 llm-backend 디렉터리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트에서 생성하는 BedrockService가 실제 AWS / 디스크 스냅샷을 쓰지 않도록
+os.environ.setdefault("BEDROCK_BACKEND", "local")
+os.environ.setdefault("ANSWER_CACHE_SNAPSHOT_DIR", "")
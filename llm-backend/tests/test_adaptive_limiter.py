@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.services.adaptive_limiter import (
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_THROTTLED,
+    AdaptiveLimiter,
+    LimiterRejected,
+)
+
+
+def test_throttling_halves_limit_once_per_cooldown():
+    limiter = AdaptiveLimiter(max_limit=8, decrease_cooldown=60)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire()
+        for _ in range(3):
+            limiter.release(OUTCOME_THROTTLED)
+
+    asyncio.run(scenario())
+    # 같은 버스트의 throttling은 한 번만 반영
+    assert limiter.limit == 4
+    assert limiter.throttled == 3
+    assert limiter.decreases == 1
+    assert limiter.in_flight == 0
+
+
+def test_success_grows_limit_up_to_max():
+    limiter = AdaptiveLimiter(max_limit=3, initial_limit=2)
+
+    async def scenario():
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.release(OUTCOME_SUCCESS)
+
+    asyncio.run(scenario())
+    assert limiter.limit == 3
+
+
+def test_errors_do_not_change_limit():
+    limiter = AdaptiveLimiter(max_limit=4)
+
+    async def scenario():
+        await limiter.acquire()
+        limiter.release(OUTCOME_ERROR)
+
+    asyncio.run(scenario())
+    assert limiter.limit == 4
+
+
+def test_acquire_times_out_when_no_slot_frees_up():
+    limiter = AdaptiveLimiter(max_limit=1)
+
+    async def scenario():
+        await limiter.acquire()
+        with pytest.raises(LimiterRejected):
+            await limiter.acquire(timeout=0.02)
+
+    asyncio.run(scenario())
+    assert limiter.rejected == 1
+    assert limiter.stats()["waiting"] == 0
+    assert limiter.in_flight == 1
+
+
+def test_release_wakes_waiters_in_order():
+    limiter = AdaptiveLimiter(max_limit=1)
+    order = []
+
+    async def worker(name):
+        await limiter.acquire()
+        order.append(name)
+        await asyncio.sleep(0)
+        limiter.release()
+
+    async def scenario():
+        await asyncio.gather(*(worker(i) for i in range(4)))
+
+    asyncio.run(scenario())
+    assert order == [0, 1, 2, 3]
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveLimiter(max_limit=1)
+
+    async def scenario():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        # 슬롯이 넘어간 직후(아직 재개 전) 취소
+        limiter.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), 0.1)
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 1
+    assert limiter.stats()["waiting"] == 0
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services import analytics_service as analytics_module
+from app.services.analytics_service import AnalyticsService
+
+
+def metrics_upstream(behaviour, timeouts):
+    """MockTransport handler: metric name -> 'ok' | 'error' | seconds to hang"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        metric = request.url.path.rsplit("/", 1)[-1]
+        timeouts[metric] = request.extensions["timeout"]["read"]
+        outcome = behaviour[metric]
+        if outcome == "error":
+            raise httpx.ConnectError("metrics storage down", request=request)
+        if outcome != "ok":
+            await asyncio.sleep(outcome)
+        return httpx.Response(200, json={"metric": metric})
+
+    return handler
+
+
+def calculate(behaviour):
+    timeouts = {}
+
+    async def scenario():
+        transport = httpx.MockTransport(metrics_upstream(behaviour, timeouts))
+        client = httpx.AsyncClient(transport=transport)
+        service = AnalyticsService(metrics_client=client)
+        try:
+            started = time.perf_counter()
+            metrics = await service._calculate_metrics("llm-backend")
+            return metrics, time.perf_counter() - started
+        finally:
+            await client.aclose()
+
+    metrics, elapsed = asyncio.run(scenario())
+    return metrics, elapsed, timeouts
+
+
+def test_lookups_run_concurrently_and_succeed(monkeypatch):
+    monkeypatch.setattr(analytics_module, "METRICS_DEADLINE_SECONDS", 0.5)
+    metrics, elapsed, timeouts = calculate({"requests": 0.1, "errors": 0.1, "resources": 0.1})
+
+    assert metrics["partial"] is False
+    assert {name: step["status"] for name, step in metrics["lookups"].items()} == {
+        "internal": "ok",
+        "requests": "ok",
+        "errors": "ok",
+        "resources": "ok",
+    }
+    # 세 조회(각 100ms)가 순차가 아니라 동시에 실행
+    assert elapsed < 0.25
+    # 조회별 timeout은 상한(0.4초)과 남은 예산 중 작은 값
+    cap = analytics_module.METRICS_LOOKUP_TIMEOUT
+    assert all(0 < timeout <= cap for timeout in timeouts.values())
+
+
+def test_failed_and_slow_lookups_give_a_partial_result_within_the_deadline(monkeypatch):
+    monkeypatch.setattr(analytics_module, "METRICS_DEADLINE_SECONDS", 0.5)
+    metrics, elapsed, _ = calculate({"requests": "ok", "errors": "error", "resources": 5})
+
+    lookups = metrics["lookups"]
+    assert {name: step["status"] for name, step in lookups.items()} == {
+        "internal": "ok",
+        "requests": "ok",
+        "errors": "error",
+        "resources": "timeout",
+    }
+    assert metrics["partial"] is True
+    # 느린 조회는 전체 예산(0.5초)에서 끊기고 나머지 결과로 응답
+    assert 0.45 <= elapsed < 0.8
+    assert lookups["resources"]["duration_ms"] >= 450
+    assert lookups["requests"]["duration_ms"] < 100
+    # 요청 지표 요약은 부분 결과에도 포함
+    assert metrics["service_name"] == "llm-backend"
+    assert "error_rate" in metrics
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+from app.services.answer_store import MemoryAnswerStore, SQLiteAnswerStore
+
+
+def test_memory_store_put_get_pop():
+    store = MemoryAnswerStore()
+
+    async def scenario():
+        await store.put("c1", "answer")
+        assert await store.get("c1") == "answer"
+        assert await store.pop("c1") == "answer"
+        assert await store.get("c1") is None
+
+    asyncio.run(scenario())
+    assert (store.hits, store.misses) == (2, 1)
+    assert store.stats()["size"] == 0
+    assert store.stats()["bytes"] == 0
+
+
+def test_memory_store_expires_entries():
+    store = MemoryAnswerStore(ttl_seconds=0.01)
+
+    async def scenario():
+        await store.put("c1", "answer")
+        await store.put("c2", "answer")
+        time.sleep(0.02)
+        assert await store.get("c1") is None
+        assert await store.sweep() == 1
+
+    asyncio.run(scenario())
+    assert store.expirations == 2
+    assert store.stats()["size"] == 0
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryAnswerStore(max_entries=2)
+
+    async def scenario():
+        await store.put("c1", "one")
+        await store.put("c2", "two")
+        # c1을 조회해 최근 사용으로 만들면 c2가 먼저 밀려남
+        await store.get("c1")
+        await store.put("c3", "three")
+        return await store.get("c1"), await store.get("c2"), await store.get("c3")
+
+    assert asyncio.run(scenario()) == ("one", None, "three")
+    assert store.evictions == 1
+
+
+def test_memory_store_enforces_byte_limit():
+    store = MemoryAnswerStore(max_bytes=20)
+
+    async def scenario():
+        # 한도를 넘는 단일 항목은 저장하지 않음
+        await store.put("c1", "x" * 100)
+        assert await store.get("c1") is None
+        # 항목당 11바이트 → 두 번째 저장 시 첫 항목이 밀려남
+        await store.put("c2", "x" * 9)
+        await store.put("c3", "x" * 9)
+
+    asyncio.run(scenario())
+    assert store.stats()["size"] == 1
+    assert store.stats()["bytes"] == 11
+    assert store.evictions == 1
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "answers.db")
+    # 같은 파일을 여는 두 인스턴스 = 두 uvicorn worker
+    writer, reader = SQLiteAnswerStore(path), SQLiteAnswerStore(path)
+
+    async def scenario():
+        try:
+            await writer.put("c1", "answer")
+            assert await reader.pop("c1") == "answer"
+            assert await writer.pop("c1") is None
+        finally:
+            await writer.close()
+            await reader.close()
+
+    asyncio.run(scenario())
+    assert reader.hits == 1
+    assert writer.misses == 1
+
+
+def test_sqlite_store_enforces_limits_on_write(tmp_path):
+    store = SQLiteAnswerStore(str(tmp_path / "answers.db"), max_entries=2, max_bytes=25)
+
+    async def scenario():
+        try:
+            await store.put("c0", "answer")
+            await store.put("c1", "answer")
+            assert await store.get("c0") == "answer"
+            # sweep 없이도 쓰기 시점에 가장 오래 조회되지 않은 c1이 제거됨
+            await store.put("c2", "answer")
+            assert store.stats()["size"] == 2
+            assert await store.get("c1") is None
+            # 바이트 한도 (항목당 8바이트 + 큰 답변 20바이트)
+            await store.put("c3", "x" * 18)
+            assert await store.get("c3") == "x" * 18
+        finally:
+            await store.close()
+
+    asyncio.run(scenario())
+    assert store.evictions == 3
+    assert (store.stats()["size"], store.stats()["bytes"]) == (1, 20)
+
+
+def test_sqlite_store_sweep_removes_expired_entries(tmp_path):
+    store = SQLiteAnswerStore(str(tmp_path / "answers.db"), ttl_seconds=0)
+
+    async def scenario():
+        try:
+            for index in range(3):
+                await store.put(f"c{index}", "answer")
+            assert await store.sweep() == 3
+            assert await store.get("c0") is None
+        finally:
+            await store.close()
+
+    asyncio.run(scenario())
+    assert store.expirations == 3
+    assert store.stats()["size"] == 0
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services.bedrock_backends import LocalBedrockBackend
+
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+
+def make_backend(**kwargs) -> LocalBedrockBackend:
+    options = dict(
+        first_token_ms=1,
+        tokens_per_second=100000,
+        min_output_tokens=8,
+        max_output_tokens=8,
+        seed=7,
+    )
+    options.update(kwargs)
+    return LocalBedrockBackend(**options)
+
+
+def request_body(system, question="로그 수집은 어떻게 하나요?", max_tokens=100) -> str:
+    return json.dumps(
+        {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": question}],
+        }
+    )
+
+
+CACHED_SYSTEM = [
+    {"type": "text", "text": "시스템 프롬프트" * 10, "cache_control": {"type": "ephemeral"}}
+]
+
+
+def test_response_has_bedrock_usage_fields():
+    response = make_backend().invoke_model(MODEL_ID, request_body("시스템 프롬프트"))
+
+    assert response["stop_reason"] == "end_turn"
+    assert len(response["content"][0]["text"].split(" ")) == 8
+    usage = response["usage"]
+    assert set(usage) == {
+        "input_tokens",
+        "output_tokens",
+        "cache_creation_input_tokens",
+        "cache_read_input_tokens",
+    }
+    assert usage["output_tokens"] == 8
+    # cache_control이 없으면 system prompt도 일반 입력 토큰
+    assert usage["cache_creation_input_tokens"] == usage["cache_read_input_tokens"] == 0
+    assert usage["input_tokens"] > 0
+
+
+def test_cache_checkpoint_is_written_then_read():
+    backend = make_backend()
+
+    first = backend.invoke_model(MODEL_ID, request_body(CACHED_SYSTEM))["usage"]
+    second = backend.invoke_model(MODEL_ID, request_body(CACHED_SYSTEM))["usage"]
+
+    assert first["cache_creation_input_tokens"] > 0
+    assert first["cache_read_input_tokens"] == 0
+    assert second["cache_read_input_tokens"] == first["cache_creation_input_tokens"]
+    assert second["cache_creation_input_tokens"] == 0
+    # 질문 토큰만 일반 입력으로 남음
+    assert second["input_tokens"] == first["input_tokens"]
+
+
+def test_output_is_capped_by_max_tokens():
+    backend = make_backend(min_output_tokens=50, max_output_tokens=50)
+
+    response = backend.invoke_model(MODEL_ID, request_body("system", max_tokens=3))
+
+    assert response["usage"]["output_tokens"] == 3
+
+
+def test_stream_events_match_the_bedrock_shape():
+    events = list(make_backend().invoke_model_stream(MODEL_ID, request_body(CACHED_SYSTEM)))
+
+    types = [event["type"] for event in events]
+    assert types[:2] == ["message_start", "content_block_start"]
+    assert types[-3:] == ["content_block_stop", "message_delta", "message_stop"]
+    text = "".join(
+        event["delta"]["text"] for event in events if event["type"] == "content_block_delta"
+    )
+    assert len(text.split(" ")) == 8
+    assert events[0]["message"]["usage"]["cache_creation_input_tokens"] > 0
+    assert events[-2]["usage"] == {"output_tokens": 8}
+
+
+def test_throttle_rate_raises_throttling_exception():
+    backend = make_backend(throttle_rate=1.0)
+
+    with pytest.raises(ClientError) as exc_info:
+        backend.invoke_model(MODEL_ID, request_body("system"))
+    assert exc_info.value.response["Error"]["Code"] == "ThrottlingException"
+
+    # 스트림은 첫 이벤트를 읽을 때 throttling
+    with pytest.raises(ClientError):
+        next(backend.invoke_model_stream(MODEL_ID, request_body("system")))
+
+
+def test_calls_over_max_concurrency_are_throttled():
+    backend = make_backend(max_concurrency=1)
+    stream = backend.invoke_model_stream(MODEL_ID, request_body("system"))
+    next(stream)
+
+    with pytest.raises(ClientError) as exc_info:
+        backend.invoke_model(MODEL_ID, request_body("system"))
+    assert exc_info.value.response["Error"]["Code"] == "ThrottlingException"
+
+    # 진행 중인 호출이 끝나면 다시 허용
+    stream.close()
+    backend.invoke_model(MODEL_ID, request_body("system"))
+
+
+def test_invalid_model_id_is_a_validation_error():
+    with pytest.raises(ClientError) as exc_info:
+        make_backend().invoke_model("invalid-model", request_body("system"))
+    assert exc_info.value.response["Error"]["Code"] == "ValidationException"
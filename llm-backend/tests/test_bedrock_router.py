@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.services.adaptive_limiter import AdaptiveLimiter
+from app.services.bedrock_backends import BedrockBackend
+from app.services.bedrock_router import BedrockEndpoint, BedrockRouter, StreamInterrupted
+from app.services.deadline import DeadlineExceeded
+
+
+def make_endpoint(region: str) -> BedrockEndpoint:
+    return BedrockEndpoint(region, "anthropic.test", BedrockBackend(), AdaptiveLimiter(4))
+
+
+def make_call(behaviour):
+    """behaviour: region -> (delay seconds, exception or None)"""
+    started = []
+
+    async def call(endpoint: BedrockEndpoint):
+        started.append(endpoint.region)
+        delay, error = behaviour[endpoint.region]
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return endpoint.region
+
+    return call, started
+
+
+def test_slow_primary_is_hedged_and_fastest_result_wins():
+    primary, secondary = make_endpoint("us-east-1"), make_endpoint("us-west-2")
+    router = BedrockRouter([primary, secondary], hedge_after=0.02)
+    call, started = make_call({"us-east-1": (0.5, None), "us-west-2": (0.01, None)})
+
+    assert asyncio.run(router.invoke(call)) == "us-west-2"
+    assert started == ["us-east-1", "us-west-2"]
+    assert router.hedges == 1
+    assert router.hedge_wins == 1
+
+
+def test_fast_primary_is_not_hedged():
+    router = BedrockRouter(
+        [make_endpoint("us-east-1"), make_endpoint("us-west-2")], hedge_after=0.2
+    )
+    call, started = make_call({"us-east-1": (0.01, None), "us-west-2": (0.01, None)})
+
+    assert asyncio.run(router.invoke(call)) == "us-east-1"
+    assert started == ["us-east-1"]
+    assert router.hedges == 0
+
+
+def test_error_fails_over_and_marks_endpoint_unhealthy():
+    primary, secondary = make_endpoint("us-east-1"), make_endpoint("us-west-2")
+    router = BedrockRouter([primary, secondary], max_failures=1, failure_cooldown=60)
+    call, started = make_call(
+        {"us-east-1": (0.0, RuntimeError("boom")), "us-west-2": (0.0, None)}
+    )
+
+    assert asyncio.run(router.invoke(call)) == "us-west-2"
+    assert router.failovers == 1
+    assert not primary.healthy
+    # 실패한 엔드포인트는 쿨다운 동안 뒤로 밀림
+    assert router.primary is secondary
+
+
+def test_deadline_exceeded_is_not_failed_over():
+    router = BedrockRouter([make_endpoint("us-east-1"), make_endpoint("us-west-2")])
+    call, started = make_call(
+        {"us-east-1": (0.0, DeadlineExceeded("budget")), "us-west-2": (0.0, None)}
+    )
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(router.invoke(call))
+    assert started == ["us-east-1"]
+    assert router.failovers == 0
+
+
+def test_unhedged_call_waits_for_a_slow_primary():
+    router = BedrockRouter(
+        [make_endpoint("us-east-1"), make_endpoint("us-west-2")], hedge_after=0.01
+    )
+    call, started = make_call({"us-east-1": (0.05, None), "us-west-2": (0.0, None)})
+
+    assert asyncio.run(router.invoke(call, hedge=False)) == "us-east-1"
+    assert started == ["us-east-1"]
+    assert router.hedges == 0
+
+
+def test_interrupted_stream_is_not_failed_over():
+    primary = make_endpoint("us-east-1")
+    router = BedrockRouter([primary, make_endpoint("us-west-2")])
+    call, started = make_call(
+        {"us-east-1": (0.0, StreamInterrupted("reset")), "us-west-2": (0.0, None)}
+    )
+
+    with pytest.raises(StreamInterrupted):
+        asyncio.run(router.invoke(call, hedge=False))
+    assert started == ["us-east-1"]
+    assert primary.failures == 1
+
+
+def test_all_endpoints_failing_raises_last_error():
+    router = BedrockRouter([make_endpoint("us-east-1"), make_endpoint("us-west-2")])
+    call, _ = make_call(
+        {
+            "us-east-1": (0.0, RuntimeError("east down")),
+            "us-west-2": (0.0, RuntimeError("west down")),
+        }
+    )
+
+    with pytest.raises(RuntimeError, match="west down"):
+        asyncio.run(router.invoke(call))
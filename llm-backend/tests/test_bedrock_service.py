@@ -0,0 +1,274 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services.bedrock_backends import BedrockBackend
+from app.services.bedrock_service import BedrockService
+from app.services.deadline import Deadline, DeadlineExceeded
+
+
+class BlockingBackend(BedrockBackend):
+    """Synchronous backend that sleeps like boto3 and tracks concurrent calls"""
+
+    name = "blocking"
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, model_id, body):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return {
+                "content": [{"type": "text", "text": f"answer from {model_id}"}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_service(monkeypatch, backend, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    service = BedrockService()
+    for endpoint in service.router.endpoints:
+        endpoint.backend = backend
+    return service
+
+
+def test_blocking_calls_run_on_bounded_executor(monkeypatch):
+    backend = BlockingBackend(delay=0.05)
+    service = make_service(monkeypatch, backend, BEDROCK_MAX_WORKERS="2")
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        tick_task = asyncio.ensure_future(ticker())
+        answers = await asyncio.gather(
+            *(service.generate_answer(f"question {i}", use_cache=False) for i in range(6))
+        )
+        tick_task.cancel()
+        return answers, ticks
+
+    answers, ticks = asyncio.run(scenario())
+
+    assert len(answers) == 6
+    assert backend.calls == 6
+    assert backend.max_active == 2
+    # 6개 호출(약 150ms) 동안 이벤트 루프가 계속 돌아야 함
+    assert ticks >= 10
+    assert service.get_stats()["in_flight"] == 0
+
+
+def test_deadline_keeps_slot_until_the_thread_finishes(monkeypatch):
+    backend = BlockingBackend(delay=0.2)
+    service = make_service(
+        monkeypatch, backend, BEDROCK_MAX_WORKERS="4", BEDROCK_MAX_CONCURRENCY="1"
+    )
+    endpoint = service.router.primary
+
+    async def scenario():
+        with pytest.raises(DeadlineExceeded):
+            await service._call_bedrock(
+                endpoint,
+                backend.invoke_model,
+                endpoint.model_id,
+                "{}",
+                deadline=Deadline(0.05),
+            )
+        # 요청은 포기했지만 스레드의 호출은 계속 실행 중 → 슬롯 유지
+        assert endpoint.limiter.in_flight == 1
+        assert service.get_stats()["in_flight"] == 1
+
+        # 다음 호출은 앞선 호출이 실제로 끝난 뒤에야 시작
+        await service._call_bedrock(endpoint, backend.invoke_model, endpoint.model_id, "{}")
+        assert endpoint.limiter.in_flight == 0
+
+    asyncio.run(scenario())
+    assert backend.calls == 2
+    assert backend.max_active == 1
+    assert service.get_stats()["in_flight"] == 0
+
+
+def test_queue_wait_is_recorded_on_the_event_loop(monkeypatch):
+    backend = BlockingBackend(delay=0.05)
+    service = make_service(monkeypatch, backend, BEDROCK_MAX_CONCURRENCY="1")
+    record = service._record_queue_wait
+    threads = []
+
+    def recording(endpoint, seconds):
+        threads.append(threading.get_ident())
+        record(endpoint, seconds)
+
+    monkeypatch.setattr(service, "_record_queue_wait", recording)
+
+    async def scenario():
+        await asyncio.gather(
+            *(service.generate_answer(f"question {i}", use_cache=False) for i in range(3))
+        )
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert threads == [loop_thread] * 3
+    stats = service.get_stats()
+    # 슬롯 하나를 순서대로 기다린 두 호출의 대기 시간이 반영됨
+    assert stats["queue_wait_max_ms"] >= 80
+
+
+def test_throttled_call_shrinks_limit_when_the_thread_finishes(monkeypatch):
+    backend = BlockingBackend(delay=0.05)
+    service = make_service(monkeypatch, backend, BEDROCK_MAX_CONCURRENCY="8")
+    endpoint = service.router.primary
+
+    def throttled(model_id, body):
+        raise ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "slow down"}},
+            "InvokeModel",
+        )
+
+    async def scenario():
+        with pytest.raises(ClientError):
+            await service._call_bedrock(endpoint, throttled, endpoint.model_id, "{}")
+
+    asyncio.run(scenario())
+    assert endpoint.limiter.limit == 4
+    assert endpoint.limiter.throttled == 1
+    assert service.get_stats()["errors"] == 1
+
+
+def test_short_leader_deadline_does_not_fail_coalesced_followers(monkeypatch):
+    backend = BlockingBackend(delay=0.2)
+    service = make_service(monkeypatch, backend)
+
+    async def scenario():
+        leader = asyncio.ensure_future(
+            service.generate_answer("same question", deadline=Deadline(0.05))
+        )
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            service.generate_answer("same question", deadline=Deadline(5))
+        )
+        with pytest.raises(DeadlineExceeded):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == f"answer from {service.model_id}"
+    # 두 요청이 하나의 Bedrock 호출을 공유
+    assert backend.calls == 1
+    assert service.get_inflight_stats()["followers"] == 1
+
+
+class StreamBackend(BedrockBackend):
+    """Streams fixed chunks; can fail before the first chunk or after a few"""
+
+    name = "stream"
+
+    def __init__(self, chunks, fail_before=(), fail_after=None, delay=0.0):
+        self.chunks = chunks
+        self.fail_before = set(fail_before)
+        self.fail_after = fail_after
+        self.delay = delay
+        self.calls = []
+
+    def invoke_model_stream(self, model_id, body):
+        self.calls.append(model_id)
+        if model_id in self.fail_before:
+            raise ClientError(
+                {"Error": {"Code": "InternalServerException", "Message": "down"}},
+                "InvokeModelWithResponseStream",
+            )
+        yield {"type": "message_start", "message": {"usage": {"input_tokens": 10}}}
+        for index, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and index == self.fail_after:
+                raise RuntimeError("connection reset")
+            time.sleep(self.delay)
+            yield {"type": "content_block_delta", "delta": {"type": "text_delta", "text": chunk}}
+        yield {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn"},
+            "usage": {"output_tokens": len(self.chunks)},
+        }
+
+
+def collect(service, question, **kwargs):
+    async def scenario():
+        deltas = []
+        try:
+            async for delta in service.generate_answer_stream(question, **kwargs):
+                deltas.append(delta)
+        except Exception as e:
+            return deltas, e
+        return deltas, None
+
+    return asyncio.run(scenario())
+
+
+def test_stream_delivers_deltas_and_fills_the_cache(monkeypatch):
+    backend = StreamBackend(["안녕", "하세", "요"])
+    service = make_service(monkeypatch, backend)
+
+    deltas, error = collect(service, "question")
+
+    assert error is None
+    assert deltas == ["안녕", "하세", "요"]
+    assert service.get_stats()["in_flight"] == 0
+    assert service.router.primary.limiter.in_flight == 0
+    # 끝까지 받은 답변은 캐시에 저장되어 다음 요청은 Bedrock을 호출하지 않음
+    assert collect(service, "question") == (["안녕하세요"], None)
+    assert len(backend.calls) == 1
+
+
+def test_stream_fails_over_before_the_first_delta(monkeypatch):
+    backend = StreamBackend(["answer"], fail_before={"model-a"})
+    service = make_service(
+        monkeypatch, backend, BEDROCK_ENDPOINTS="us-east-1=model-a,us-west-2=model-b"
+    )
+
+    assert collect(service, "question") == (["answer"], None)
+    assert backend.calls == ["model-a", "model-b"]
+    assert service.router.failovers == 1
+
+
+def test_stream_broken_mid_answer_is_not_replayed_or_cached(monkeypatch):
+    backend = StreamBackend(["one", "two", "three"], fail_after=2)
+    service = make_service(
+        monkeypatch, backend, BEDROCK_ENDPOINTS="us-east-1=model-a,us-west-2=model-b"
+    )
+
+    deltas, error = collect(service, "question")
+
+    assert deltas == ["one", "two"]
+    assert error is not None
+    # 이미 보낸 조각이 있으므로 다른 엔드포인트에서 다시 시작하지 않음
+    assert backend.calls == ["model-a"]
+    assert service.get_cache_stats()["size"] == 0
+
+
+def test_stream_stops_at_the_request_deadline(monkeypatch):
+    backend = StreamBackend(["slow"] * 20, delay=0.05)
+    service = make_service(monkeypatch, backend)
+
+    started = time.monotonic()
+    deltas, error = collect(service, "question", deadline=Deadline(0.1))
+
+    assert isinstance(error, DeadlineExceeded)
+    assert time.monotonic() - started < 0.5
+    assert len(deltas) < 20
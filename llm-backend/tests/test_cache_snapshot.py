@@ -0,0 +1,72 @@
+import asyncio
+import os
+
+from app.services.cache_snapshot import CacheSnapshot
+from app.services.response_cache import ResponseCache
+
+
+def make_snapshot(directory, cache=None):
+    cache = cache if cache is not None else ResponseCache()
+    return CacheSnapshot(cache, str(directory), "anthropic.test", "hash")
+
+
+def test_snapshot_round_trip(tmp_path):
+    cache = ResponseCache()
+    cache.set("k1", "answer one")
+    cache.set("k2", "answer two")
+    writer = make_snapshot(tmp_path, cache)
+    restored = ResponseCache()
+    reader = make_snapshot(tmp_path, restored)
+
+    async def scenario():
+        await writer.load()
+        assert await writer.save()
+        return await reader.load()
+
+    assert asyncio.run(scenario()) == 2
+    assert restored.get("k1") == "answer one"
+
+
+def test_truncated_snapshot_is_ignored_and_rewritten(tmp_path):
+    cache = ResponseCache()
+    for index in range(200):
+        cache.set(f"k{index}", f"answer {index} " * 20)
+    snapshot = make_snapshot(tmp_path, cache)
+
+    async def write():
+        await snapshot.load()
+        await snapshot.save()
+
+    asyncio.run(write())
+    # 저장 중 크래시로 잘린 파일
+    with open(snapshot.path, "r+b") as f:
+        f.truncate(os.path.getsize(snapshot.path) // 2)
+
+    restored = ResponseCache()
+    reader = make_snapshot(tmp_path, restored)
+    restored.set("fresh", "new answer")
+
+    async def scenario():
+        loaded = await reader.load()
+        saved = await reader.save()
+        return loaded, saved
+
+    assert asyncio.run(scenario()) == (0, True)
+    assert reader.errors == 1
+
+    # 다시 쓴 스냅샷은 정상적으로 읽힘
+    again = ResponseCache()
+    assert asyncio.run(make_snapshot(tmp_path, again).load()) == 1
+    assert again.get("fresh") == "new answer"
+
+
+def test_incompatible_snapshot_is_ignored(tmp_path):
+    cache = ResponseCache()
+    cache.set("k1", "answer")
+    writer = make_snapshot(tmp_path, cache)
+    asyncio.run(writer.load())
+    asyncio.run(writer.save())
+
+    other = CacheSnapshot(ResponseCache(), str(tmp_path), "anthropic.test", "hash")
+    other.system_prompt_hash = "changed"
+    assert asyncio.run(other.load()) == 0
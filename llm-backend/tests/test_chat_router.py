@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from app.routers import chat
+from app.services.answer_store import MemoryAnswerStore
+from app.services.deadline import Deadline, DeadlineExceeded
+
+
+def lookups(result: str) -> float:
+    return REGISTRY.get_sample_value("llm_answer_store_lookups_total", {"result": result}) or 0.0
+
+
+def test_cleanup_is_not_counted_as_a_lookup(monkeypatch):
+    monkeypatch.setattr(chat, "ai_answer_cache", MemoryAnswerStore())
+    before = {result: lookups(result) for result in ("hit", "miss")}
+
+    async def scenario():
+        await chat.remember_answer("c1", "answer")
+        assert await chat.recall_answer("c1") == "answer"
+        assert await chat.forget_answer("c1")
+        # 이미 지운 답변을 다시 지워도 lookup miss로 집계되지 않음
+        assert not await chat.forget_answer("c1")
+        assert await chat.recall_answer("c1") is None
+
+    asyncio.run(scenario())
+    assert lookups("hit") - before["hit"] == 1
+    assert lookups("miss") - before["miss"] == 1
+
+
+def test_store_outage_is_not_fatal(monkeypatch):
+    class BrokenStore(MemoryAnswerStore):
+        async def get(self, conversation_id):
+            raise ConnectionError("store down")
+
+        async def pop(self, conversation_id):
+            raise ConnectionError("store down")
+
+    monkeypatch.setattr(chat, "ai_answer_cache", BrokenStore())
+    before = lookups("error")
+
+    async def scenario():
+        return await chat.recall_answer("c1"), await chat.forget_answer("c1")
+
+    assert asyncio.run(scenario()) == (None, False)
+    assert lookups("error") - before == 1
+
+
+def test_admin_routes_are_disabled_without_a_configured_password(monkeypatch):
+    monkeypatch.setattr(chat, "ADMIN_PASSWORD", None)
+    for header in (None, "", "panopticon"):
+        with pytest.raises(HTTPException) as exc_info:
+            chat.require_admin(header)
+        assert exc_info.value.status_code == 403
+
+
+def test_admin_password_must_match(monkeypatch):
+    monkeypatch.setattr(chat, "ADMIN_PASSWORD", "s3cret")
+    chat.require_admin("s3cret")
+    for header in (None, "wrong"):
+        with pytest.raises(HTTPException):
+            chat.require_admin(header)
+
+
+def test_stream_failure_is_sent_as_an_error_event(monkeypatch):
+    class FailingStream:
+        async def generate_answer_stream(self, question, use_cache=True, deadline=None):
+            yield "partial"
+            raise Exception("일시적인 오류가 발생했습니다. 다시 질문해주세요")
+
+    monkeypatch.setattr(chat, "bedrock_service", FailingStream())
+    monkeypatch.setattr(chat, "ai_answer_cache", MemoryAnswerStore())
+    request = chat.AskRequest(conversationId="c1", originalQuestion="question")
+
+    async def scenario():
+        response = await chat.ask_stream(request, Deadline(5))
+        events = [event async for event in response.body_iterator]
+        return events, await chat.ai_answer_cache.get("c1")
+
+    events, cached = asyncio.run(scenario())
+    assert [event.split("\n", 1)[0] for event in events] == ["event: delta", "event: error"]
+    assert "다시 질문해주세요" in events[1]
+    # 실패한 스트림의 답변은 대화에 저장되지 않음
+    assert cached is None
+
+
+class RecordingBedrock:
+    """generate_answer stand-in: records calls, fails for chosen questions"""
+
+    def __init__(self, failures=None):
+        self.calls = []
+        self.failures = failures or {}
+
+    async def generate_answer(self, question, is_error=False, use_cache=True, deadline=None):
+        self.calls.append((question, is_error, use_cache))
+        await asyncio.sleep(0)
+        if question in self.failures:
+            raise self.failures[question]
+        return f"answer to {question}"
+
+
+def ask_batch(monkeypatch, bedrock, items):
+    monkeypatch.setattr(chat, "bedrock_service", bedrock)
+    monkeypatch.setattr(chat, "ai_answer_cache", MemoryAnswerStore())
+    request = chat.AskBatchRequest(
+        items=[
+            chat.AskRequest(conversationId=f"c{index}", **item)
+            for index, item in enumerate(items)
+        ]
+    )
+    return asyncio.run(chat.ask_batch(request, Deadline(5)))
+
+
+def test_batch_generates_each_normalized_question_once(monkeypatch):
+    bedrock = RecordingBedrock()
+    response = ask_batch(
+        monkeypatch,
+        bedrock,
+        [
+            {"originalQuestion": "로그 수집은?"},
+            {"originalQuestion": "  로그 수집은 "},
+            # 같은 질문이라도 캐시 우회 / 에러 시연 여부가 다르면 따로 생성
+            {"originalQuestion": "로그 수집은?", "bypassCache": True},
+            {"originalQuestion": "로그 수집은?", "isError": True},
+        ],
+    )
+
+    assert sorted(bedrock.calls) == sorted(
+        [
+            ("로그 수집은?", False, True),
+            ("로그 수집은?", False, False),
+            ("로그 수집은?", True, True),
+        ]
+    )
+    assert [result.conversationId for result in response.results] == ["c0", "c1", "c2", "c3"]
+    # 중복 항목도 대표 항목의 답변을 받음
+    assert response.results[1].aiAnswer == "answer to 로그 수집은?"
+    assert (response.succeeded, response.failed) == (4, 0)
+
+
+def test_batch_item_failure_does_not_fail_the_others(monkeypatch):
+    bedrock = RecordingBedrock(
+        failures={"broken": Exception("일시적인 오류"), "slow": DeadlineExceeded("budget")}
+    )
+    response = ask_batch(
+        monkeypatch,
+        bedrock,
+        [
+            {"originalQuestion": "ok"},
+            {"originalQuestion": "broken"},
+            {"originalQuestion": "slow"},
+            {"originalQuestion": "broken!"},
+        ],
+    )
+
+    # "broken"과 "broken!"은 한 번만 생성
+    assert len(bedrock.calls) == 3
+    results = {result.conversationId: result for result in response.results}
+    assert results["c0"].aiAnswer == "answer to ok" and results["c0"].error is None
+    assert results["c1"].error == "일시적인 오류"
+    assert results["c3"].error == "일시적인 오류"
+    assert "시간이 초과" in results["c2"].error
+    assert (response.succeeded, response.failed) == (1, 3)
+
+    async def stored():
+        return [await chat.ai_answer_cache.get(f"c{index}") for index in range(4)]
+
+    # 성공한 항목만 conversationId별로 저장
+    assert asyncio.run(stored()) == ["answer to ok", None, None, None]
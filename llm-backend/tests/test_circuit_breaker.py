@@ -0,0 +1,176 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.api_backend_service import APIBackendService
+from app.services.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    RetryBudget,
+)
+from app.services.deadline import Deadline, DeadlineExceeded
+
+
+def test_breaker_opens_on_error_rate_and_rejects():
+    breaker = CircuitBreaker("test", min_calls=4, error_rate_threshold=0.5, open_seconds=60)
+    for success in (True, False, True, False):
+        breaker.allow()
+        breaker.record(success, 0.01)
+
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = CircuitBreaker("test", min_calls=2, slow_call_seconds=1.0, slow_rate_threshold=0.5)
+    breaker.record(True, 0.01)
+    breaker.record(True, 2.0)
+    assert breaker.state == STATE_OPEN
+
+
+def test_half_open_trials_close_or_reopen():
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.02, half_open_calls=2)
+    breaker.record(False, 0.01)
+    assert breaker.state == STATE_OPEN
+    time.sleep(0.03)
+
+    breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    breaker.allow()
+    # 시험 호출 수를 넘는 요청은 거절
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+    breaker.record(True, 0.01)
+    breaker.record(True, 0.01)
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record(False, 0.01)
+    time.sleep(0.03)
+    breaker.allow()
+    breaker.record(False, 0.01)
+    assert breaker.state == STATE_OPEN
+    assert breaker.opens == 3
+
+
+def test_retry_budget_limits_retries_to_a_ratio_of_requests():
+    budget = RetryBudget(ratio=0.1, min_retries=2)
+    for _ in range(30):
+        budget.record_request()
+    assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert budget.exhausted == 1
+
+
+def make_api_backend(monkeypatch, handler, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return APIBackendService(client=client)
+
+
+def test_create_post_retries_throttled_responses(monkeypatch):
+    statuses = [503, 503, 201]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"id": "p1", "postId": 1, "message": "ok"})
+
+    service = make_api_backend(monkeypatch, handler, API_BACKEND_RETRY_BASE_DELAY="0.001")
+
+    post = asyncio.run(service.create_post("question"))
+    assert post == {"id": "p1", "postId": 1, "message": "ok"}
+    assert service.retries == 2
+
+
+def test_open_breaker_fails_fast_without_calling_upstream(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    service = make_api_backend(
+        monkeypatch,
+        handler,
+        API_BACKEND_BREAKER_MIN_CALLS="3",
+        API_BACKEND_BREAKER_OPEN_SECONDS="60",
+    )
+
+    async def scenario():
+        return [await service.create_post("question") for _ in range(5)]
+
+    assert asyncio.run(scenario()) == [None] * 5
+    assert len(calls) == 3
+    assert service.breakers["create_post"].state == STATE_OPEN
+    assert service.breakers["create_post"].rejected == 2
+
+
+def test_release_returns_a_half_open_trial_slot():
+    breaker = CircuitBreaker("test", min_calls=1, open_seconds=0.02, half_open_calls=1)
+    breaker.record(False, 0.01)
+    time.sleep(0.03)
+    breaker.allow()
+    breaker.release()
+    # 결과를 남기지 않은 시험 호출 대신 다른 시험 호출 허용
+    breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def timing_out_handler(calls):
+    def handler(request):
+        calls.append(request.extensions["timeout"]["read"])
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    return handler
+
+
+def test_deadline_shortened_timeout_does_not_count_against_the_breaker(monkeypatch):
+    calls = []
+    service = make_api_backend(
+        monkeypatch, timing_out_handler(calls), API_BACKEND_BREAKER_MIN_CALLS="1"
+    )
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(DeadlineExceeded):
+                await service.create_post("question", deadline=Deadline(0.5))
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+    assert all(timeout <= 0.5 for timeout in calls)
+    breaker = service.breakers["create_post"]
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()["calls_in_window"] == 0
+
+
+def test_full_timeout_counts_as_a_breaker_failure(monkeypatch):
+    calls = []
+    service = make_api_backend(
+        monkeypatch,
+        timing_out_handler(calls),
+        API_BACKEND_TIMEOUT="0.5",
+        API_BACKEND_BREAKER_MIN_CALLS="1",
+    )
+
+    assert asyncio.run(service.create_post("question", deadline=Deadline(10))) is None
+    assert calls == [0.5]
+    assert service.breakers["create_post"].state == STATE_OPEN
+
+
+def test_comments_are_not_sent_without_admin_password(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(201, json={"id": "c1"})
+
+    monkeypatch.delenv("ADMIN_PASSWORD", raising=False)
+    service = make_api_backend(monkeypatch, handler)
+
+    assert asyncio.run(service.create_comment("p1", "answer")) is False
+    assert calls == []
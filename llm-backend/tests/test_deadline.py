@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import deadline as deadline_module
+from app.services.api_backend_service import APIBackendService
+from app.services.bedrock_service import BedrockService
+from app.services.deadline import Deadline, DeadlineExceeded
+
+
+def test_from_header_defaults_when_missing_or_invalid():
+    assert Deadline.from_header(None).budget == deadline_module.DEFAULT_DEADLINE_SECONDS
+    assert Deadline.from_header("soon").budget == deadline_module.DEFAULT_DEADLINE_SECONDS
+
+
+def test_from_header_clamps_to_min_and_max():
+    assert Deadline.from_header("5000").budget == 5.0
+    # 1ms 같은 예산은 최소값으로 올림
+    assert Deadline.from_header("1").budget == deadline_module.MIN_DEADLINE_SECONDS
+    assert Deadline.from_header("-100").budget == deadline_module.MIN_DEADLINE_SECONDS
+    assert (
+        Deadline.from_header("999999999").budget == deadline_module.MAX_DEADLINE_SECONDS
+    )
+
+
+def test_timeout_is_capped_by_remaining_budget():
+    deadline = Deadline(10)
+    assert deadline.timeout(cap=2) == 2
+    assert 9 < deadline.timeout() <= 10
+
+
+def test_expired_deadline_raises_with_stage():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded, match="before Bedrock call"):
+        deadline.timeout(cap=5, stage="Bedrock call")
+
+
+def make_api_backend(monkeypatch, handler, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return APIBackendService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def test_budget_spent_inside_create_post_is_a_deadline_not_an_upstream_error(monkeypatch):
+    async def handler(request):
+        await asyncio.sleep(0.1)
+        raise httpx.RemoteProtocolError("connection closed", request=request)
+
+    service = make_api_backend(monkeypatch, handler)
+
+    with pytest.raises(DeadlineExceeded, match="during create_post"):
+        asyncio.run(service.create_post("question", deadline=Deadline(0.05)))
+
+
+def test_batched_comment_wait_past_the_deadline_raises(monkeypatch):
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(201, json={"results": [{"index": 0, "id": "c1"}]})
+
+    service = make_api_backend(monkeypatch, handler, ADMIN_PASSWORD="s3cret")
+
+    async def scenario():
+        try:
+            await service.create_comment("p1", "answer", deadline=Deadline(0.05))
+        finally:
+            await service.close()
+
+    with pytest.raises(DeadlineExceeded, match="during create_comment"):
+        asyncio.run(scenario())
+
+
+def test_upstream_error_with_budget_left_is_not_a_deadline(monkeypatch):
+    def handler(request):
+        raise httpx.RemoteProtocolError("connection closed", request=request)
+
+    service = make_api_backend(monkeypatch, handler)
+    assert asyncio.run(service.create_post("question", deadline=Deadline(5))) is None
+
+
+def test_shared_generation_budget_defaults_to_the_request_budget(monkeypatch):
+    monkeypatch.delenv("BEDROCK_REQUEST_DEADLINE", raising=False)
+    assert BedrockService().request_deadline == deadline_module.DEFAULT_DEADLINE_SECONDS
@@ -0,0 +1,140 @@
+import asyncio
+
+from app.services.event_ingestor import EventIngestor
+
+
+class Sink:
+    """send() target that records batches and can fail on demand"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+        self.failing = False
+
+    async def __call__(self, batch):
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("analytics api down")
+        self.batches.append([event["n"] for event in batch])
+
+
+def test_full_queue_rejects_without_waiting():
+    ingestor = EventIngestor(Sink(), max_queue=2)
+
+    async def scenario():
+        return [ingestor.offer({"n": n}) for n in range(3)]
+
+    assert asyncio.run(scenario()) == [True, True, False]
+    assert (ingestor.accepted, ingestor.dropped) == (2, 1)
+
+
+def test_batch_is_flushed_when_full():
+    sink = Sink()
+    ingestor = EventIngestor(sink, batch_size=3, flush_interval=10)
+
+    async def scenario():
+        ingestor.start()
+        try:
+            for n in range(3):
+                ingestor.offer({"n": n})
+            # flush_interval(10초)을 기다리지 않고 크기 조건으로 전송
+            await asyncio.sleep(0.05)
+            return list(sink.batches)
+        finally:
+            await ingestor.stop()
+
+    assert asyncio.run(scenario()) == [[0, 1, 2]]
+    assert ingestor.stats()["sent"] == 3
+
+
+def test_partial_batch_is_flushed_after_interval():
+    sink = Sink()
+    ingestor = EventIngestor(sink, batch_size=100, flush_interval=0.02)
+
+    async def scenario():
+        ingestor.start()
+        try:
+            ingestor.offer({"n": 0})
+            ingestor.offer({"n": 1})
+            await asyncio.sleep(0.1)
+            return list(sink.batches)
+        finally:
+            await ingestor.stop()
+
+    assert asyncio.run(scenario()) == [[0, 1]]
+
+
+def test_send_failure_is_counted_and_flusher_keeps_running():
+    sink = Sink()
+    sink.failing = True
+    ingestor = EventIngestor(sink, batch_size=2, flush_interval=10)
+
+    async def scenario():
+        ingestor.start()
+        try:
+            ingestor.offer({"n": 0})
+            ingestor.offer({"n": 1})
+            await asyncio.sleep(0.02)
+            sink.failing = False
+            ingestor.offer({"n": 2})
+            ingestor.offer({"n": 3})
+            await asyncio.sleep(0.02)
+        finally:
+            await ingestor.stop()
+
+    asyncio.run(scenario())
+    assert sink.batches == [[2, 3]]
+    assert (ingestor.failed_batches, ingestor.failed_events) == (1, 2)
+    assert ingestor.batches == 1
+
+
+def test_stop_sends_queued_and_in_progress_events():
+    sink = Sink()
+    ingestor = EventIngestor(sink, batch_size=3, flush_interval=10)
+
+    async def scenario():
+        ingestor.start()
+        for n in range(5):
+            ingestor.offer({"n": n})
+        # flusher가 두 번째 배치를 모으는 중에 종료
+        await asyncio.sleep(0.02)
+        await ingestor.stop()
+
+    asyncio.run(scenario())
+    assert sink.batches == [[0, 1, 2], [3, 4]]
+    assert ingestor.stats()["queue_depth"] == 0
+
+
+def test_stop_waits_for_the_batch_being_sent():
+    sink = Sink(delay=0.05)
+    ingestor = EventIngestor(sink, batch_size=2, flush_interval=10)
+
+    async def scenario():
+        ingestor.start()
+        for n in range(3):
+            ingestor.offer({"n": n})
+        # 첫 배치 전송 중에 종료 - 그 배치도 유실되지 않아야 함
+        await asyncio.sleep(0.01)
+        await ingestor.stop()
+
+    asyncio.run(scenario())
+    assert sink.batches == [[0, 1], [2]]
+    assert (ingestor.sent, ingestor.discarded) == (3, 0)
+
+
+def test_stop_timeout_counts_unsent_events_as_discarded():
+    sink = Sink(delay=10)
+    ingestor = EventIngestor(sink, batch_size=2, flush_interval=10, stop_timeout=0.05)
+
+    async def scenario():
+        ingestor.start()
+        for n in range(5):
+            ingestor.offer({"n": n})
+        await asyncio.sleep(0.01)
+        await ingestor.stop()
+
+    asyncio.run(scenario())
+    assert sink.batches == []
+    # 전송 중이던 2개 + 큐에 남은 3개
+    assert ingestor.stats()["discarded"] == 5
+    assert ingestor.stats()["queue_depth"] == 0
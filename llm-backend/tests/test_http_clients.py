@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_clients import HTTPClientRegistry
+
+
+class HTTPServer:
+    """Minimal keep-alive HTTP/1.1 server that answers every request after a delay"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "3")
+    monkeypatch.setenv("HTTP_CLIENT_HTTP2", "false")
+    return HTTPClientRegistry()
+
+
+def test_clients_are_reused_per_upstream_until_closed(registry):
+    async def scenario():
+        first = registry.get("api_backend", "http://api")
+        assert registry.get("api_backend", "http://api") is first
+        assert registry.get("analytics", "http://analytics") is not first
+        assert set(registry.stats()["clients"]) == {"api_backend", "analytics"}
+
+        await registry.aclose()
+        assert first.is_closed
+        assert registry.stats()["clients"] == {}
+        # 닫힌 뒤에는 새 클라이언트를 만듦
+        second = registry.get("api_backend", "http://api")
+        assert second is not first and not second.is_closed
+        await registry.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_sequential_requests_share_one_keep_alive_connection(registry):
+    server = HTTPServer()
+
+    async def scenario():
+        client = registry.get("upstream", await server.start())
+        try:
+            for _ in range(5):
+                assert (await client.get("/")).text == "ok"
+            return registry.stats()["clients"]["upstream"]
+        finally:
+            await registry.aclose()
+            await server.stop()
+
+    stats = asyncio.run(scenario())
+    assert server.connections == 1
+    assert (stats["requests"], stats["errors"], stats["in_flight"]) == (5, 0, 0)
+    assert (stats["connections"], stats["idle_connections"]) == (1, 1)
+    assert stats["utilization"] == 0.0
+
+
+def test_concurrent_requests_are_capped_by_the_pool(registry):
+    server = HTTPServer(delay=0.05)
+
+    async def scenario():
+        client = registry.get("upstream", await server.start())
+        try:
+            # 일부 요청이 풀을 기다리는 동안의 통계
+            requests = [asyncio.ensure_future(client.get("/")) for _ in range(5)]
+            await asyncio.sleep(0.02)
+            during = registry.stats()["clients"]["upstream"]
+            await asyncio.gather(*requests)
+            return during, registry.stats()["clients"]["upstream"]
+        finally:
+            await registry.aclose()
+            await server.stop()
+
+    during, after = asyncio.run(scenario())
+    assert server.connections == 3
+    assert during["in_flight"] == 5
+    assert (during["connections"], during["max_connections"]) == (3, 3)
+    assert during["utilization"] == 1.0
+    assert (after["requests"], after["in_flight"], after["max_in_flight"]) == (5, 0, 5)
+
+
+def test_failed_requests_are_counted(registry):
+    async def scenario():
+        client = registry.get("down", "http://127.0.0.1:1")
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/")
+            return registry.stats()["clients"]["down"]
+        finally:
+            await registry.aclose()
+
+    stats = asyncio.run(scenario())
+    assert (stats["requests"], stats["errors"], stats["in_flight"]) == (1, 1, 0)
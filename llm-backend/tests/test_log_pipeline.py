@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from app.services.log_pipeline import LogPipeline, RateLimitFilter, truncate
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted messages; optionally blocks until released"""
+
+    def __init__(self, blocked: bool = False):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        if not blocked:
+            self.gate.set()
+
+    def emit(self, record):
+        self.entered.set()
+        self.gate.wait()
+        self.threads.add(threading.get_ident())
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def target_logger(request):
+    target = logging.getLogger(f"test.log_pipeline.{request.node.name}")
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    handler = ListHandler()
+    target.addHandler(handler)
+    yield target, handler
+    for existing in list(target.handlers):
+        target.removeHandler(existing)
+
+
+def test_records_are_handled_on_the_listener_thread(target_logger):
+    target, handler = target_logger
+    original = list(target.handlers)
+    pipeline = LogPipeline(logger_names=[target.name], info_rate=0)
+    pipeline.start()
+    try:
+        target.info("hello %s", "world")
+    finally:
+        pipeline.stop()
+
+    assert handler.messages == ["hello world"]
+    assert threading.get_ident() not in handler.threads
+    # 종료 후 원래 핸들러가 다시 붙음
+    assert target.handlers == original
+
+
+def test_rate_limit_suppresses_info_and_reports_the_count(target_logger):
+    target, handler = target_logger
+    target.addFilter(RateLimitFilter(rate=0.001, burst=2))
+    for index in range(5):
+        target.info("step %d", index)
+    target.warning("still logged")
+
+    assert handler.messages == ["step 0", "step 1", "still logged"]
+    for existing in list(target.filters):
+        target.removeFilter(existing)
+
+
+def test_suppressed_count_is_attached_to_the_next_passing_record():
+    limiter = RateLimitFilter(rate=1000, burst=1)
+
+    def record(msg):
+        return logging.LogRecord("x", logging.INFO, __file__, 1, msg, (), None)
+
+    assert limiter.filter(record("first"))
+    assert not limiter.filter(record("second"))
+    passing = record("third")
+    # 토큰이 다시 찰 때까지 대기
+    threading.Event().wait(0.01)
+    assert limiter.filter(passing)
+    assert passing.getMessage() == "third (+1 similar records suppressed)"
+
+
+def test_full_queue_drops_without_blocking_and_stop_still_drains(target_logger):
+    target, handler = target_logger
+    for existing in list(target.handlers):
+        target.removeHandler(existing)
+    slow = ListHandler(blocked=True)
+    target.addHandler(slow)
+
+    pipeline = LogPipeline(logger_names=[target.name], queue_size=3, info_rate=0)
+    pipeline.start()
+    target.info("first")
+    assert slow.entered.wait(1)
+    # listener가 첫 레코드에서 멈춘 동안 큐를 가득 채움
+    for index in range(10):
+        target.info("record %d", index)
+    assert pipeline.dropped == 7
+
+    # 큐가 가득 찬 상태에서 종료해도 queue.Full 없이 남은 레코드를 처리
+    threading.Timer(0.05, slow.gate.set).start()
+    pipeline.stop()
+
+    assert slow.messages == ["first", "record 0", "record 1", "record 2"]
+    assert pipeline.stats()["running"] is False
+    assert pipeline.queue.qsize() == 0
+
+
+def test_stop_gives_up_when_the_listener_is_stuck(target_logger):
+    target, handler = target_logger
+    for existing in list(target.handlers):
+        target.removeHandler(existing)
+    stuck = ListHandler(blocked=True)
+    target.addHandler(stuck)
+
+    pipeline = LogPipeline(
+        logger_names=[target.name], queue_size=2, info_rate=0, stop_timeout=0.05
+    )
+    pipeline.start()
+    target.info("first")
+    assert stuck.entered.wait(1)
+    for index in range(5):
+        target.info("record %d", index)
+
+    started = time.monotonic()
+    pipeline.stop()
+    assert time.monotonic() - started < 1
+    assert pipeline.stats()["running"] is False
+    assert target.handlers == [stuck]
+    stuck.gate.set()
+
+
+def test_truncate():
+    assert truncate("short", 10) == "short"
+    assert truncate("x" * 15, 10) == "x" * 10 + "... (5 more chars)"
+    assert truncate({"a": 1}, 100) == "{'a': 1}"
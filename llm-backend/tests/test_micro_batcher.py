@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.services.micro_batcher import MicroBatcher
+
+
+def test_items_within_window_are_flushed_together():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(flush, max_size=10, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert asyncio.run(scenario()) == [0, 10, 20]
+    assert batches == [[0, 1, 2]]
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_window():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(flush, max_size=2, window=10)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(4))), 1
+        )
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3]
+    assert batches == [[0, 1], [2, 3]]
+
+
+def test_flush_error_is_delivered_to_every_item():
+    async def flush(items):
+        raise RuntimeError("bulk endpoint down")
+
+    batcher = MicroBatcher(flush, max_size=10, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.errors == 1
+
+
+def test_wrong_result_count_fails_the_batch():
+    async def flush(items):
+        return items[:-1]
+
+    batcher = MicroBatcher(flush, max_size=10, window=0.01)
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="2 results for 3 items"):
+            await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_items_are_left_out_of_the_batch():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(flush, max_size=10, window=0.01)
+
+    async def scenario():
+        keep = batcher.submit("keep")
+        batcher.submit("gone").cancel()
+        return await keep
+
+    assert asyncio.run(scenario()) == "keep"
+    assert batches == [["keep"]]
+
+
+def test_close_flushes_pending_items():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(flush, max_size=10, window=10)
+
+    async def scenario():
+        future = batcher.submit("pending")
+        await batcher.close()
+        return future.result()
+
+    assert asyncio.run(scenario()) == "pending"
+    assert batches == [["pending"]]
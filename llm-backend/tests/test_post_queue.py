@@ -0,0 +1,162 @@
+import asyncio
+import sqlite3
+import time
+
+from app.services.post_queue import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_POSTED,
+    PostJobQueue,
+)
+
+
+class FakeAPIBackend:
+    """create_post / create_comment that fail a configurable number of times"""
+
+    def __init__(self, post_failures: int = 0, comment_failures: int = 0):
+        self.post_failures = post_failures
+        self.comment_failures = comment_failures
+        self.posts = []
+        self.comments = []
+
+    async def create_post(self, content, email=None, deadline=None):
+        if self.post_failures:
+            self.post_failures -= 1
+            return None
+        self.posts.append(content)
+        number = len(self.posts)
+        return {"id": f"post-{number}", "postId": number, "message": "ok"}
+
+    async def create_comment(self, post_id, content, is_ai_generated=True, deadline=None):
+        if self.comment_failures:
+            self.comment_failures -= 1
+            return False
+        self.comments.append((post_id, content))
+        return True
+
+
+def make_queue(tmp_path, api_backend, **kwargs):
+    kwargs.setdefault("retry_base_delay", 0.01)
+    kwargs.setdefault("retry_max_delay", 0.02)
+    # 유휴 확인 간격을 길게 두어 enqueue 신호로만 깨어나는지 확인
+    kwargs.setdefault("idle_poll_interval", 30.0)
+    return PostJobQueue(api_backend, path=str(tmp_path / "queue.db"), **kwargs)
+
+
+async def wait_for_status(queue, job_id, statuses, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_enqueue_wakes_idle_workers(tmp_path):
+    api = FakeAPIBackend()
+    queue = make_queue(tmp_path, api)
+
+    async def scenario():
+        queue.start()
+        try:
+            # worker들이 첫 조회를 마치고 대기 상태에 들어갈 때까지
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            job = await queue.enqueue("c1", "question", "answer")
+            job = await wait_for_status(queue, job["jobId"], (STATUS_COMPLETED,))
+            return job, time.monotonic() - started
+        finally:
+            await queue.stop()
+
+    job, elapsed = asyncio.run(scenario())
+    assert elapsed < 1.0
+    assert job["postCreated"]["id"] == "post-1"
+    assert job["commentCreated"]
+    assert api.comments == [("post-1", "answer")]
+
+
+def test_comment_retry_does_not_repost(tmp_path):
+    api = FakeAPIBackend(comment_failures=2)
+    queue = make_queue(tmp_path, api)
+
+    async def scenario():
+        queue.start()
+        try:
+            job = await queue.enqueue("c1", "question", "answer")
+            return await wait_for_status(queue, job["jobId"], (STATUS_COMPLETED,))
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(scenario())
+    assert job["attempts"] == 3
+    assert api.posts == ["question"]
+    assert queue.retries == 2
+
+
+def test_post_is_recorded_even_if_the_first_update_fails(tmp_path):
+    api = FakeAPIBackend()
+    queue = make_queue(tmp_path, api)
+    original_update = queue._update
+    failed = []
+
+    async def flaky_update(job_id, **fields):
+        if fields.get("status") == STATUS_POSTED and not failed:
+            failed.append(job_id)
+            raise sqlite3.OperationalError("database is locked")
+        await original_update(job_id, **fields)
+
+    queue._update = flaky_update
+
+    async def scenario():
+        queue.start()
+        try:
+            job = await queue.enqueue("c1", "question", "answer")
+            return await wait_for_status(queue, job["jobId"], (STATUS_COMPLETED,))
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(scenario())
+    assert failed
+    assert api.posts == ["question"]
+    assert job["postCreated"]["id"] == "post-1"
+
+
+def test_job_fails_after_max_attempts(tmp_path):
+    api = FakeAPIBackend(post_failures=10)
+    queue = make_queue(tmp_path, api, max_attempts=3)
+
+    async def scenario():
+        queue.start()
+        try:
+            job = await queue.enqueue("c1", "question", "answer")
+            return await wait_for_status(queue, job["jobId"], (STATUS_FAILED,))
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(scenario())
+    assert job["lastError"] == "create_post failed"
+    assert queue.failed == 1
+    assert api.posts == []
+
+
+def test_jobs_left_from_a_previous_run_are_processed_on_start(tmp_path):
+    api = FakeAPIBackend()
+    first = make_queue(tmp_path, api)
+
+    async def enqueue_only():
+        job = await first.enqueue("c1", "question", "answer")
+        await first.stop()
+        return job
+
+    job = asyncio.run(enqueue_only())
+    second = make_queue(tmp_path, api)
+
+    async def scenario():
+        second.start()
+        try:
+            return await wait_for_status(second, job["jobId"], (STATUS_COMPLETED,))
+        finally:
+            await second.stop()
+
+    assert asyncio.run(scenario())["commentCreated"]
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.bedrock_backends import LocalBedrockBackend
+from app.services.bedrock_service import BedrockService
+
+
+def make_service(monkeypatch, **env) -> BedrockService:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    service = BedrockService()
+    backend = LocalBedrockBackend(
+        first_token_ms=1, tokens_per_second=100000, min_output_tokens=5, max_output_tokens=5
+    )
+    for endpoint in service.router.endpoints:
+        endpoint.backend = backend
+    return service
+
+
+def test_system_prompt_is_marked_as_a_cache_checkpoint(monkeypatch):
+    service = make_service(monkeypatch, BEDROCK_PROMPT_CACHING="true")
+
+    body = json.loads(service._build_request_body("질문", max_tokens=10))
+
+    assert body["system"] == [
+        {
+            "type": "text",
+            "text": service.system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert body["messages"] == [{"role": "user", "content": "질문"}]
+    assert body["max_tokens"] == 10
+
+
+def test_system_prompt_is_plain_text_without_caching(monkeypatch):
+    service = make_service(monkeypatch, BEDROCK_PROMPT_CACHING="false")
+
+    body = json.loads(service._build_request_body("질문"))
+
+    assert body["system"] == service.system_prompt
+    assert body["max_tokens"] == service.max_tokens
+
+
+def test_prompt_cache_stats_accounting(monkeypatch):
+    service = make_service(monkeypatch)
+    service._record_usage("model-a", {"input_tokens": 100, "cache_creation_input_tokens": 1000})
+    service._record_usage("model-a", {"input_tokens": 100, "cache_read_input_tokens": 1000})
+    # 사용량 블록이 없는 응답은 집계하지 않음
+    service._record_usage("model-a", None)
+
+    stats = service.get_prompt_cache_stats()
+
+    assert stats["requests"] == 2
+    assert stats["input_tokens"] == 200
+    assert stats["cache_creation_input_tokens"] == 1000
+    assert stats["cache_read_input_tokens"] == 1000
+    assert stats["cache_read_ratio"] == pytest.approx(1000 / 2200, abs=1e-4)
+    # 읽기 1000 * (1 - 0.1) - 쓰기 1000 * (1.25 - 1)
+    assert stats["saved_input_token_equivalents"] == 650.0
+    assert stats["saved_input_ratio"] == pytest.approx(650 / 2200, abs=1e-4)
+
+
+def test_repeated_calls_read_the_cached_system_prompt(monkeypatch):
+    service = make_service(monkeypatch, BEDROCK_PROMPT_CACHING="true")
+
+    async def scenario():
+        for index in range(2):
+            await service.generate_answer(f"question {index}", use_cache=False)
+
+    asyncio.run(scenario())
+    stats = service.get_prompt_cache_stats()
+    # 첫 호출이 캐시를 만들고 두 번째 호출은 같은 양을 캐시에서 읽음
+    assert stats["cache_creation_input_tokens"] > 0
+    assert stats["cache_read_input_tokens"] == stats["cache_creation_input_tokens"]
+    assert stats["enabled"] is True
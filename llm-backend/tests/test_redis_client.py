@@ -0,0 +1,240 @@
+import asyncio
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from app.services.answer_store import RedisAnswerStore
+from app.services.redis_client import RedisClient, RedisError, RedisReplyError
+
+
+class RespServer:
+    """Tiny in-process RESP2 server (GET/SET/GETDEL/DEL/AUTH/PING, MULTI/EXEC) with per-key reply delays"""
+
+    def __init__(self):
+        self.data: Dict[bytes, bytes] = {}
+        self.delays: Dict[bytes, float] = {}
+        # 지원하지 않는 것으로 응답할 명령 (예: Redis 6.2 이전의 GETDEL)
+        self.unsupported: Set[bytes] = set()
+        self.connections = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        queued: Optional[List[list]] = None
+        aborted = False
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command = args[0].upper()
+                if command == b"MULTI":
+                    queued, aborted, reply = [], False, b"+OK\r\n"
+                elif command == b"EXEC" and aborted:
+                    queued, reply = None, b"-EXECABORT Transaction discarded\r\n"
+                elif command == b"EXEC":
+                    replies = [await self._reply(queued_args) for queued_args in queued or []]
+                    queued, reply = None, b"*%d\r\n" % len(replies) + b"".join(replies)
+                elif queued is not None and command in self.unsupported:
+                    # 실제 Redis처럼 알 수 없는 명령은 큐잉 단계에서 거부하고 EXEC도 실패
+                    aborted = True
+                    reply = await self._reply(args)
+                elif queued is not None:
+                    queued.append(args)
+                    reply = b"+QUEUED\r\n"
+                else:
+                    reply = await self._reply(args)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, args) -> bytes:
+        command = args[0].upper()
+        if command in self.unsupported:
+            return b"-ERR unknown command '%s'\r\n" % command.lower()
+        if command == b"PING":
+            return b"+PONG\r\n"
+        key = args[1]
+        await asyncio.sleep(self.delays.get(key, 0))
+        if command == b"AUTH":
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % (self.data.pop(key, None) is not None)
+        if command == b"SET":
+            self.data[key] = args[2]
+            return b"+OK\r\n"
+        if command in (b"GET", b"GETDEL"):
+            value = self.data.get(key)
+            if command == b"GETDEL":
+                self.data.pop(key, None)
+            if value is None:
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        return b"-ERR unknown command\r\n"
+
+
+def test_cancelled_command_does_not_leak_its_reply():
+    server = RespServer()
+    server.data = {b"a": b"ANSWER-A", b"b": b"ANSWER-B"}
+    server.delays = {b"a": 0.05}
+
+    async def scenario():
+        client = RedisClient(await server.start())
+        try:
+            pending = asyncio.ensure_future(client.execute("GET", "a"))
+            await asyncio.sleep(0.01)
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+            # 취소된 GET a의 응답이 연결에 남아 있으면 여기서 ANSWER-A를 받게 됨
+            return await client.execute("GET", "b")
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(scenario()) == b"ANSWER-B"
+    assert server.connections == 2
+
+
+def test_timeout_drops_connection_and_reconnects():
+    server = RespServer()
+    server.data = {b"a": b"ANSWER-A", b"b": b"ANSWER-B"}
+    server.delays = {b"a": 0.2}
+
+    async def scenario():
+        client = RedisClient(await server.start(), timeout=0.05)
+        try:
+            with pytest.raises(RedisError):
+                await client.execute("GET", "a")
+            return await client.execute("GET", "b")
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(scenario()) == b"ANSWER-B"
+    assert server.connections == 2
+
+
+def test_error_reply_keeps_connection():
+    server = RespServer()
+
+    async def scenario():
+        client = RedisClient(await server.start())
+        try:
+            with pytest.raises(RedisReplyError):
+                await client.execute("HGET", "h", "f")
+            return await client.execute("PING")
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(scenario()) == "PONG"
+    assert server.connections == 1
+
+
+def test_unreachable_server_raises_redis_error():
+    async def scenario():
+        client = RedisClient("redis://127.0.0.1:1/0", timeout=0.2)
+        with pytest.raises(RedisError):
+            await client.execute("PING")
+
+    asyncio.run(scenario())
+
+
+def test_redis_answer_store_pop_is_one_shot():
+    server = RespServer()
+
+    async def scenario():
+        store = RedisAnswerStore(await server.start())
+        try:
+            await store.put("c1", "answer")
+            assert await store.get("c1") == "answer"
+            assert await store.pop("c1") == "answer"
+            assert await store.pop("c1") is None
+        finally:
+            await store.close()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_pop_falls_back_to_get_and_del_without_getdel():
+    server = RespServer()
+    server.unsupported = {b"GETDEL"}
+
+    async def scenario():
+        store = RedisAnswerStore(await server.start())
+        try:
+            await store.put("c1", "answer")
+            assert await store.pop("c1") == "answer"
+            assert await store.pop("c1") is None
+        finally:
+            await store.close()
+            await server.stop()
+        return store
+
+    store = asyncio.run(scenario())
+    assert server.data == {}
+    assert (store.hits, store.misses, store.errors) == (1, 1, 0)
+
+
+def test_transaction_error_keeps_the_connection_in_sync():
+    server = RespServer()
+    server.data = {b"a": b"ANSWER-A"}
+    server.unsupported = {b"GETDEL"}
+
+    async def scenario():
+        client = RedisClient(await server.start())
+        try:
+            assert await client.transaction(("GET", "a"), ("DEL", "a")) == [b"ANSWER-A", 1]
+            with pytest.raises(RedisReplyError, match="unknown command"):
+                await client.transaction(("GETDEL", "a"), ("SET", "a", "x"))
+            # 실행 단계 에러는 해당 요소에만 담기고 나머지 결과는 그대로
+            replies = await client.transaction(("HGET", "h", "f"), ("SET", "b", "y"))
+            assert isinstance(replies[0], RedisReplyError) and replies[1] == "OK"
+            return await client.execute("PING")
+        finally:
+            await client.close()
+            await server.stop()
+
+    assert asyncio.run(scenario()) == "PONG"
+    assert server.connections == 1
+
+
+def test_connect_handshake_is_bounded_by_the_command_timeout():
+    server = RespServer()
+    server.delays = {b"s3cret": 0.5}
+
+    async def scenario():
+        url = (await server.start()).replace("redis://", "redis://:s3cret@")
+        client = RedisClient(url, timeout=0.05)
+        try:
+            started = asyncio.get_running_loop().time()
+            with pytest.raises(RedisError):
+                await client.execute("PING")
+            elapsed = asyncio.get_running_loop().time() - started
+            # 다음 호출은 새 연결로 다시 인증
+            server.delays = {}
+            return elapsed, await client.execute("PING")
+        finally:
+            await client.close()
+            await server.stop()
+
+    elapsed, reply = asyncio.run(scenario())
+    assert elapsed < 0.3
+    assert reply == "PONG"
+    assert server.connections == 2
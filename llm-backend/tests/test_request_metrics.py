@@ -0,0 +1,99 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services import request_metrics as request_metrics_module
+from app.services.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(request_metrics_module.time, "monotonic", clock)
+    return clock
+
+
+def test_percentiles_are_close_to_exact_values(clock):
+    metrics = RequestMetrics(window_seconds=60, slot_seconds=10)
+    for latency in range(1, 1001):
+        metrics.record("GET /x", float(latency), error=latency % 100 == 0)
+
+    summary = metrics.route_summary("GET /x")
+    assert summary["request_count"] == 1000
+    assert summary["error_rate"] == 0.01
+    assert summary["avg_response_time_ms"] == 500.5
+    assert summary["max_response_time_ms"] == 1000
+    # 버킷 간격 20% → 보간 후 상대 오차는 그보다 작음
+    for p, exact in ((50, 500), (95, 950), (99, 990)):
+        assert summary[f"p{p}_response_time_ms"] == pytest.approx(exact, rel=0.1)
+    # 추정치는 관측 최댓값을 넘지 않음
+    assert summary["p99_response_time_ms"] <= 1000
+
+
+def test_empty_histogram_has_no_percentiles(clock):
+    metrics = RequestMetrics()
+    assert metrics.route_summary("GET /x") is None
+    summary = metrics.summary()
+    assert summary["request_count"] == 0
+    assert summary["p95_response_time_ms"] is None
+    assert summary["error_rate"] == 0.0
+
+
+def test_old_slots_fall_out_of_the_window(clock):
+    metrics = RequestMetrics(window_seconds=30, slot_seconds=10)
+    metrics.record("GET /x", 5000.0, error=True)
+    clock.now += 10
+    metrics.record("GET /x", 10.0, error=False)
+    assert metrics.route_summary("GET /x")["request_count"] == 2
+
+    # 첫 요청이 기록된 슬롯이 창 밖으로 밀려남
+    clock.now += 25
+    summary = metrics.route_summary("GET /x")
+    assert summary["request_count"] == 1
+    assert summary["error_count"] == 0
+    assert summary["max_response_time_ms"] == 10.0
+
+    # 같은 링 위치를 재사용해도 이전 값이 섞이지 않음
+    clock.now += 30
+    metrics.record("GET /x", 20.0, error=False)
+    assert metrics.route_summary("GET /x")["request_count"] == 1
+
+
+def make_client(metrics: RequestMetrics) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_middleware_groups_by_route_template_and_counts_errors():
+    metrics = RequestMetrics()
+    client = make_client(metrics)
+
+    for item_id in ("a", "b", "c"):
+        assert client.get(f"/items/{item_id}").status_code == 200
+    assert client.get("/boom").status_code == 500
+    assert client.get("/missing").status_code == 404
+
+    routes = metrics.summary()["routes"]
+    # 경로 파라미터 값별로 라우트가 늘어나지 않음
+    assert set(routes) == {"GET /items/{item_id}", "GET /boom", "unmatched"}
+    assert routes["GET /items/{item_id}"]["request_count"] == 3
+    assert routes["GET /boom"]["error_count"] == 1
+    assert routes["unmatched"]["error_count"] == 0
@@ -0,0 +1,103 @@
+import pytest
+
+from app.services import response_cache as response_cache_module
+from app.services.response_cache import ResponseCache, normalize_question
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache_module.time, "monotonic", fake)
+    return fake
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "로그 수집은 어떻게 하나요?",
+        "  로그   수집은 어떻게 하나요 ",
+        "로그 수집은, 어떻게 하나요?!",
+        "로그\t수집은\n어떻게 하나요？",
+    ],
+)
+def test_equivalent_korean_questions_share_a_key(question):
+    assert normalize_question(question) == "로그 수집은 어떻게 하나요"
+
+
+def test_nfkc_and_casefold():
+    # 전각 문자 / 합자 / 대소문자 (ß는 casefold로 ss)
+    assert normalize_question("ＡＰＩ Ｋｅｙ") == "api key"
+    assert normalize_question("ﬁle") == "file"
+    assert normalize_question("STRASSE") == normalize_question("straße")
+
+
+def test_punctuation_becomes_a_word_break():
+    assert normalize_question("log-level") == "log level"
+    assert normalize_question("What's up?") == "what s up"
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("로그 수집", "로그수집"),
+        ("log level", "loglevel"),
+        ("에러 로그 보기", "에러 로그 삭제"),
+        ("v1", "v2"),
+    ],
+)
+def test_different_questions_keep_different_keys(first, second):
+    assert normalize_question(first) != normalize_question(second)
+    assert ResponseCache.make_key(first, "m", "p") != ResponseCache.make_key(second, "m", "p")
+
+
+def test_key_includes_model_and_system_prompt():
+    key = ResponseCache.make_key("question", "model-a", "prompt-1")
+    assert key == ResponseCache.make_key(" QUESTION? ", "model-a", "prompt-1")
+    assert key != ResponseCache.make_key("question", "model-b", "prompt-1")
+    assert key != ResponseCache.make_key("question", "model-a", "prompt-2")
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=10)
+    cache.set("k", "answer")
+
+    clock.now += 9.9
+    assert cache.get("k") == "answer"
+    clock.now += 0.1
+    assert cache.get("k") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_set_refreshes_the_ttl(clock):
+    cache = ResponseCache(ttl_seconds=10)
+    cache.set("k", "old")
+    clock.now += 8
+    cache.set("k", "new")
+    clock.now += 8
+    assert cache.get("k") == "new"
+
+
+def test_least_recently_used_entry_is_evicted_first(clock):
+    cache = ResponseCache(max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    # 조회한 항목은 가장 최근으로 이동
+    assert cache.get("a") == "a"
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    cache.set("e", "e")
+    assert cache.get("c") is None
+
+    assert [key for key, _, _ in cache.export()] == ["a", "d", "e"]
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("q", work) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["answer"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 4, "abandoned": 0}
+
+
+def test_error_is_delivered_to_every_waiter():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("bedrock failed")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(flight.do("q", work) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    # 실패한 키는 다음 호출에서 다시 실행됨
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_cancelling_one_waiter_keeps_the_shared_call():
+    flight = SingleFlight()
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def work():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        leader = asyncio.ensure_future(flight.do("q", work))
+        follower = asyncio.ensure_future(flight.do("q", work))
+        await started.wait()
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "answer"
+    assert flight.abandoned == 0
+
+
+def test_cancelling_all_waiters_cancels_the_call():
+    flight = SingleFlight()
+    finished = False
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def work():
+            nonlocal finished
+            started.set()
+            await asyncio.sleep(1)
+            finished = True
+
+        waiters = [asyncio.ensure_future(flight.do("q", work)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert not finished
+    assert flight.abandoned == 1
+    assert flight.stats()["in_flight"] == 0
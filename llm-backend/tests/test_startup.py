@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.startup import StartupState
+
+
+def test_build_records_timing_and_runs_blocking_factories_off_the_loop():
+    state = StartupState()
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        factory_threads = []
+
+        def factory():
+            factory_threads.append(threading.get_ident())
+            return "service"
+
+        service = await state.build("bedrock", factory, in_thread=True)
+        return service, loop_thread, factory_threads
+
+    service, loop_thread, factory_threads = asyncio.run(scenario())
+    assert service == "service"
+    assert factory_threads and factory_threads[0] != loop_thread
+    assert state.components["bedrock"]["status"] == "ok"
+
+
+def test_build_failure_is_recorded_and_raised():
+    state = StartupState()
+
+    def broken():
+        raise RuntimeError("no credentials")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(state.build("bedrock", broken))
+    assert state.components["bedrock"] == {"status": "error", "error": "no credentials"}
+
+
+def test_warmup_failures_do_not_block_readiness():
+    state = StartupState()
+
+    async def ok():
+        pass
+
+    async def broken():
+        raise RuntimeError("endpoint down")
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        state.start_warmup({"ok": ok, "broken": broken, "slow": slow}, timeout=0.02)
+        assert not state.ready
+        await state._warmup_task
+
+    asyncio.run(scenario())
+    assert state.ready
+    assert {name: step["status"] for name, step in state.warmup.items()} == {
+        "ok": "ok",
+        "broken": "error",
+        "slow": "timeout",
+    }
+    assert state.report()["startup_seconds"] is not None
+
+
+def test_stop_cancels_warmup_and_clears_readiness():
+    state = StartupState()
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        state.mark_ready()
+        state.start_warmup({"slow": slow}, timeout=10)
+        await asyncio.sleep(0.01)
+        await state.stop()
+        return state._warmup_task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert not state.ready
+    assert not state.report()["ready"]
+
+
+def test_failing_shutdown_step_does_not_block_the_rest():
+    state = StartupState()
+    ran = []
+
+    async def close_store():
+        ran.append("store")
+
+    def broken():
+        ran.append("ingestor")
+        raise RuntimeError("flush failed")
+
+    async def broken_async():
+        ran.append("post_queue")
+        raise ConnectionError("db locked")
+
+    asyncio.run(
+        state.run_shutdown(
+            {
+                "ingestor": broken,
+                "post_queue": broken_async,
+                "store": close_store,
+                "metrics": lambda: ran.append("metrics"),
+            }
+        )
+    )
+
+    assert ran == ["ingestor", "post_queue", "store", "metrics"]
+    assert {name: step["status"] for name, step in state.shutdown.items()} == {
+        "ingestor": "error",
+        "post_queue": "error",
+        "store": "ok",
+        "metrics": "ok",
+    }
+    assert state.shutdown["post_queue"]["error"] == "db locked"
@@ -0,0 +1,162 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.analytics_service import AnalyticsService
+from app.services.swr_cache import StaleWhileRevalidateCache
+
+
+class Loader:
+    """Returns value-1, value-2, ... or raises while failing is set"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.failing = False
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("upstream down")
+        return f"value-{self.calls}"
+
+
+def test_fresh_hit_does_not_reload():
+    cache = StaleWhileRevalidateCache(ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        return await cache.get("k", loader), await cache.get("k", loader)
+
+    assert asyncio.run(scenario()) == ("value-1", "value-1")
+    assert loader.calls == 1
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_concurrent_misses_share_one_load():
+    cache = StaleWhileRevalidateCache(ttl=10)
+    loader = Loader(delay=0.02)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("k", loader) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["value-1"] * 5
+    assert loader.calls == 1
+
+
+def test_stale_value_is_served_while_refreshing_in_background():
+    cache = StaleWhileRevalidateCache(ttl=0.1, stale_ttl=10)
+    loader = Loader(delay=0.02)
+
+    async def scenario():
+        await cache.get("k", loader)
+        await asyncio.sleep(0.12)
+        # 오래된 값을 기다리지 않고 바로 반환
+        stale = await cache.get("k", loader)
+        await asyncio.sleep(0.05)
+        return stale, await cache.get("k", loader)
+
+    assert asyncio.run(scenario()) == ("value-1", "value-2")
+    assert cache.stale_hits == 1
+    assert cache.refreshes == 1
+    assert cache.refresh_failures == 0
+
+
+def test_errors_are_cached_for_negative_ttl_only():
+    cache = StaleWhileRevalidateCache(ttl=10, negative_ttl=0.02)
+    loader = Loader()
+    loader.failing = True
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.get("k", loader)
+        assert loader.calls == 1
+        loader.failing = False
+        await asyncio.sleep(0.03)
+        return await cache.get("k", loader)
+
+    assert asyncio.run(scenario()) == "value-2"
+    assert cache.negative_hits == 1
+
+
+def test_failed_refresh_keeps_the_previous_good_value():
+    cache = StaleWhileRevalidateCache(ttl=0.02, stale_ttl=10, negative_ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        await cache.get("k", loader)
+        await asyncio.sleep(0.03)
+        loader.failing = True
+        stale = await cache.get("k", loader)
+        await asyncio.sleep(0.01)
+        # 갱신 실패 후에도 이전 정상 값을 계속 반환하고, negative TTL 동안 재시도하지 않음
+        return stale, await cache.get("k", loader)
+
+    assert asyncio.run(scenario()) == ("value-1", "value-1")
+    assert loader.calls == 2
+    assert cache.refresh_failures == 1
+
+
+def failing_client() -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("name resolution failed", request=request)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def make_analytics(monkeypatch, **env) -> AnalyticsService:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return AnalyticsService(
+        analytics_client=failing_client(),
+        recommendation_client=failing_client(),
+        metrics_client=failing_client(),
+    )
+
+
+def test_dummy_upstream_failures_use_the_normal_swr_path(monkeypatch):
+    async def scenario():
+        service = make_analytics(
+            monkeypatch,
+            ANALYTICS_RECOMMENDATIONS_TTL="0.2",
+            ANALYTICS_METRICS_TTL="0.2",
+            ANALYTICS_CACHE_NEGATIVE_TTL="0.001",
+        )
+        for _ in range(2):
+            await service.get_recommendations("u1")
+            metrics = await service.calculate_metrics("svc")
+        await asyncio.sleep(0.25)
+        await service.get_recommendations("u1")
+        await service.calculate_metrics("svc")
+        await asyncio.sleep(0.1)
+        return service.get_cache_stats(), metrics
+
+    stats, metrics = asyncio.run(scenario())
+    # 더미 업스트림 실패는 예상된 동작 → negative가 아닌 일반 캐시 항목
+    assert metrics["partial"]
+    for name in ("recommendations", "metrics"):
+        assert stats[name]["misses"] == 1
+        assert stats[name]["hits"] == 1
+        assert stats[name]["negative_hits"] == 0
+        assert stats[name]["stale_hits"] == 1
+        assert stats[name]["refreshes"] == 1
+        assert stats[name]["refresh_failures"] == 0
+
+
+def test_upstream_failures_can_be_cached_as_negative(monkeypatch):
+    async def scenario():
+        service = make_analytics(
+            monkeypatch,
+            ANALYTICS_CACHE_UPSTREAM_FAILURE_NEGATIVE="true",
+            ANALYTICS_CACHE_NEGATIVE_TTL="10",
+        )
+        await service.get_recommendations("u1")
+        await service.get_recommendations("u1")
+        return service.get_cache_stats()["recommendations"]
+
+    stats = asyncio.run(scenario())
+    assert stats["negative_hits"] == 1
+    assert stats["hits"] == 0
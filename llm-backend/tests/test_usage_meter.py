@@ -0,0 +1,117 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from app.services import bedrock_service as bedrock_service_module
+from app.services import usage_meter as usage_meter_module
+from app.services.bedrock_backends import BedrockBackend
+from app.services.bedrock_service import BedrockService
+from app.services.usage_meter import (
+    OTHER,
+    UNATTRIBUTED,
+    RequestUsage,
+    UsageMeter,
+    bind_conversation,
+)
+
+
+def run_in_request(fn, scope=None) -> RequestUsage:
+    """Run fn inside a fresh request usage scope (what UsageHeadersMiddleware sets up)"""
+    request = RequestUsage(scope)
+
+    def scoped():
+        usage_meter_module._request_usage.set(request)
+        fn()
+
+    contextvars.copy_context().run(scoped)
+    return request
+
+
+def test_cost_prices_cache_tokens_relative_to_input():
+    meter = UsageMeter(input_price_per_mtok=1.0, output_price_per_mtok=5.0)
+    usage = {
+        "input_tokens": 1_000_000,
+        "output_tokens": 1_000_000,
+        "cache_read_input_tokens": 1_000_000,
+        "cache_creation_input_tokens": 1_000_000,
+    }
+    assert meter.cost(usage) == pytest.approx(1.0 + 5.0 + 0.1 + 1.25)
+
+
+def test_usage_is_attributed_to_request_conversation_and_model():
+    meter = UsageMeter()
+    scope = {"method": "POST", "path": "/llm/chat/ask"}
+
+    def handler():
+        bind_conversation("c1")
+        meter.record("model-a", {"input_tokens": 100, "output_tokens": 10})
+        # 스트리밍의 추가 출력 토큰은 호출 수를 늘리지 않음
+        meter.record("model-a", {"output_tokens": 5}, call=False, truncated=True)
+
+    request = run_in_request(handler, scope)
+    assert (request.calls, request.input_tokens, request.output_tokens) == (1, 100, 15)
+
+    report = meter.report()
+    assert report["top_conversations"][0]["key"] == "c1"
+    assert report["routes"][0]["key"] == "POST /llm/chat/ask"
+    assert report["models"][0]["key"] == "model-a"
+    assert report["window"]["truncated"] == 1
+    assert report["window"]["avg_output_tokens"] == 15.0
+
+
+def test_usage_outside_a_request_is_unattributed():
+    meter = UsageMeter()
+    contextvars.copy_context().run(meter.record, "model-a", {"input_tokens": 1})
+    report = meter.report()
+    assert report["top_conversations"][0]["key"] == UNATTRIBUTED
+    assert report["routes"][0]["key"] == UNATTRIBUTED
+
+
+def test_conversations_beyond_the_cap_are_merged():
+    meter = UsageMeter(max_conversations_per_slot=2)
+
+    for conversation_id in ("c1", "c2", "c3", "c4"):
+
+        def handler(conversation_id=conversation_id):
+            bind_conversation(conversation_id)
+            meter.record("model-a", {"input_tokens": 1})
+
+        run_in_request(handler)
+
+    keys = {row["key"]: row["calls"] for row in meter.report()["top_conversations"]}
+    assert keys == {"c1": 1, "c2": 1, OTHER: 2}
+    assert meter.total.calls == 4
+
+
+class RegionBackend(BedrockBackend):
+    """Fails for one model id, answers for the rest"""
+
+    name = "region"
+
+    def __init__(self, failing_model: str):
+        self.failing_model = failing_model
+
+    def invoke_model(self, model_id, body):
+        if model_id == self.failing_model:
+            raise RuntimeError("region down")
+        return {
+            "content": [{"type": "text", "text": f"answer from {model_id}"}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 10, "output_tokens": 5},
+        }
+
+
+def test_failover_usage_is_recorded_under_the_serving_model(monkeypatch):
+    meter = UsageMeter()
+    monkeypatch.setattr(bedrock_service_module, "usage_meter", meter)
+    monkeypatch.setenv("BEDROCK_ENDPOINTS", "us-east-1=model-a,us-west-2=model-b")
+    service = BedrockService()
+    backend = RegionBackend(failing_model="model-a")
+    for endpoint in service.router.endpoints:
+        endpoint.backend = backend
+
+    answer = asyncio.run(service.generate_answer("question", use_cache=False))
+
+    assert answer == "answer from model-b"
+    assert [row["key"] for row in meter.report()["models"]] == ["model-b"]